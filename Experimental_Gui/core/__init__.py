@@ -0,0 +1,36 @@
+"""Core download engine components shared by all downloaders"""
+
+import importlib
+
+# Submodules are imported on first access, so e.g. core.ledger doesn't pull in aiohttp
+_LAZY = {
+    'SessionManager': '.http_session',
+    'RateLimiter': '.rate_limiter', 'TokenBucket': '.rate_limiter',
+    'Blacklist': '.blacklist',
+    'CompactIdSet': '.idset',
+    'Ledger': '.ledger', 'SiteLedger': '.ledger', 'QuerySync': '.ledger',
+    'TaskJournal': '.journal',
+    'TaskControl': '.control',
+    'ProgressEvent': '.progress', 'ProgressStream': '.progress', 'ProgressTracker': '.progress',
+    'RetryPolicy': '.retry', 'RetryStats': '.retry', 'RetryableError': '.retry', 'RetryableHTTPError': '.retry',
+    'QueryIdentity': '.query', 'Subscription': '.scheduler', 'SubscriptionScheduler': '.scheduler', 'load_subscriptions': '.scheduler',
+    'BatchJob': '.batch', 'JobResult': '.batch', 'load_manifest': '.batch', 'run_batch': '.batch', 'summarize': '.batch',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    'SessionManager',
+    'RateLimiter', 'TokenBucket',
+    'Blacklist',
+    'CompactIdSet', 'Ledger', 'SiteLedger', 'QuerySync', 'TaskJournal', 'TaskControl',
+    'ProgressEvent', 'ProgressStream', 'ProgressTracker',
+    'RetryPolicy', 'RetryStats', 'RetryableError', 'RetryableHTTPError',
+    'QueryIdentity', 'Subscription', 'SubscriptionScheduler', 'load_subscriptions',
+    'BatchJob', 'JobResult', 'load_manifest', 'run_batch', 'summarize'
+]
@@ -0,0 +1,134 @@
+"""One-shot batches of download jobs for headless runs"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from .progress import ProgressEvent
+from .query import QueryIdentity, parse_max_pages
+
+
+@dataclass
+class BatchJob(QueryIdentity):
+    """A tag query or URL to download once"""
+    site: str
+    tags: Optional[str] = None
+    url: Optional[str] = None
+    max_pages: Optional[int] = None
+    incremental: bool = False
+    output_dir: Optional[str] = None  # overrides the batch output directory
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BatchJob":
+        return cls(
+            site=str(data["site"]).lower(),
+            tags=data.get("tags"),
+            url=data.get("url"),
+            max_pages=parse_max_pages(data.get("max_pages")),
+            incremental=bool(data.get("incremental", False)),
+            output_dir=data.get("output_dir")
+        )
+
+
+@dataclass
+class JobResult:
+    """Outcome of one batch job, as reported in the summary"""
+    job: BatchJob
+    success: bool = False
+    error: Optional[str] = None
+    duration: float = 0.0
+    # Latest progress snapshot of the job, if it reported any
+    stats: Optional[ProgressEvent] = field(default=None, repr=False)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        stats = self.stats
+        return {
+            "site": self.job.site,
+            "tags": self.job.tags,
+            "url": self.job.url,
+            "success": self.success,
+            "error": self.error,
+            "duration": round(self.duration, 2),
+            "files_done": stats.files_done if stats else 0,
+            "files_failed": stats.files_failed if stats else 0,
+            "bytes": stats.bytes_done if stats else 0
+        }
+
+
+def load_manifest(path: Union[str, Path]) -> List[BatchJob]:
+    """
+    Read jobs from a JSON file of the form
+    {"jobs": [{"site": "e621", "tags": "fox", "max_pages": 5}, {"site": "yiffer", "url": "..."}]}
+    or a bare list of jobs. Duplicate jobs are dropped, keeping the first.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    
+    entries = data.get("jobs", []) if isinstance(data, dict) else data
+    jobs: Dict[str, BatchJob] = {}
+    for entry in entries:
+        try:
+            job = BatchJob.from_dict(entry)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Skipping invalid job {entry!r}: {e}")
+            continue
+        jobs.setdefault(job.key, job)
+    return list(jobs.values())
+
+
+async def run_batch(
+    jobs: List[BatchJob],
+    run_job: Callable[[BatchJob, Callable[[ProgressEvent], None]], Awaitable[bool]],
+    max_concurrent: int = 3,
+    max_per_site: int = 1,
+    progress_callback: Optional[Callable] = None
+) -> List[JobResult]:
+    """
+    Run every job once, at most max_concurrent at a time and max_per_site
+    per site, and return their results in job order. run_job gets the job
+    and an event callback for its ProgressEvents; exceptions count as failures.
+    """
+    slots = asyncio.Semaphore(max(1, max_concurrent))
+    site_slots: Dict[str, asyncio.Semaphore] = {}
+    results = [JobResult(job) for job in jobs]
+    
+    async def run_one(result: JobResult) -> None:
+        job = result.job
+        site_slot = site_slots.setdefault(job.site, asyncio.Semaphore(max(1, max_per_site)))
+        # Per-site slot first, so a site's waiting jobs don't hold global slots
+        async with site_slot, slots:
+            if progress_callback:
+                progress_callback(f"Starting {job}")
+            started = time.monotonic()
+            
+            def on_event(event: ProgressEvent) -> None:
+                result.stats = event
+            
+            try:
+                result.success = bool(await run_job(job, on_event))
+            except Exception as e:
+                result.error = str(e)
+            result.duration = time.monotonic() - started
+            
+            if progress_callback:
+                state = "done" if result.success else f"failed{': ' + result.error if result.error else ''}"
+                progress_callback(f"Finished {job} ({state})")
+    
+    await asyncio.gather(*(run_one(result) for result in results))
+    return results
+
+
+def summarize(results: List[JobResult], duration: float) -> Dict[str, Any]:
+    """Machine readable summary of a finished batch"""
+    succeeded = sum(1 for result in results if result.success)
+    return {
+        "ok": succeeded == len(results),
+        "jobs": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "duration": round(duration, 2),
+        "results": [result.to_dict() for result in results]
+    }
@@ -0,0 +1,160 @@
+"""Compiled tag blacklist with e621 style rules"""
+
+import operator
+from collections import defaultdict
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+# Metatag comparison operators, longest prefix first
+SCORE_OPERATORS = (
+    ("<=", operator.le),
+    (">=", operator.ge),
+    ("<", operator.lt),
+    (">", operator.gt),
+    ("=", operator.eq),
+)
+
+# Rating names as used by the boorus, reduced to e621's single letters
+RATING_ALIASES = {
+    "s": "s", "safe": "s", "g": "s", "general": "s", "sensitive": "q",
+    "q": "q", "questionable": "q", "suggestive": "q",
+    "e": "e", "explicit": "e",
+}
+
+# Matches a post by its rating and score
+MetaCheck = Callable[[Optional[str], Optional[int]], bool]
+
+
+def normalize_rating(rating: Optional[str]) -> Optional[str]:
+    """Reduce a site specific rating to s, q or e"""
+    if not rating:
+        return None
+    return RATING_ALIASES.get(str(rating).lower())
+
+
+def _parse_score(value: str) -> Optional[MetaCheck]:
+    """Compile score:<N, score:>=N, score:N, score:N..M"""
+    try:
+        if ".." in value:
+            low, high = value.split("..", 1)
+            low = int(low) if low else None
+            high = int(high) if high else None
+            return lambda rating, score: score is not None and (low is None or score >= low) and (high is None or score <= high)
+        for prefix, compare in SCORE_OPERATORS:
+            if value.startswith(prefix):
+                limit = int(value[len(prefix):])
+                return lambda rating, score: score is not None and compare(score, limit)
+        limit = int(value)
+    except ValueError:
+        return None
+    return lambda rating, score: score == limit
+
+
+def _parse_metatag(token: str) -> Optional[MetaCheck]:
+    """Compile a rating: or score: metatag, None if the token is a plain tag"""
+    name, _, value = token.partition(":")
+    if name == "rating" and value:
+        wanted = frozenset(normalize_rating(part) for part in value.split(",")) - {None}
+        if wanted:
+            return lambda rating, score: normalize_rating(rating) in wanted
+    elif name == "score" and value:
+        return _parse_score(value)
+    return None
+
+
+class BlacklistRule:
+    """One blacklist line: every tag, at least one ~tag, no -tag and every metatag must match"""
+    
+    __slots__ = ("required", "any_of", "excluded", "metas", "excluded_metas", "source")
+    
+    def __init__(self, line: str):
+        required, any_of, excluded = set(), set(), set()
+        metas: List[MetaCheck] = []
+        excluded_metas: List[MetaCheck] = []
+        
+        for token in line.lower().split():
+            negated = token.startswith("-") and len(token) > 1
+            optional = token.startswith("~") and len(token) > 1
+            tag = token[1:] if negated or optional else token
+            meta = _parse_metatag(tag)
+            if meta is not None:
+                (excluded_metas if negated else metas).append(meta)
+            elif negated:
+                excluded.add(tag)
+            elif optional:
+                any_of.add(tag)
+            else:
+                required.add(tag)
+        
+        self.required: FrozenSet[str] = frozenset(required)
+        self.any_of: FrozenSet[str] = frozenset(any_of)
+        self.excluded: FrozenSet[str] = frozenset(excluded)
+        self.metas: Tuple[MetaCheck, ...] = tuple(metas)
+        self.excluded_metas: Tuple[MetaCheck, ...] = tuple(excluded_metas)
+        self.source = line
+    
+    @property
+    def is_empty(self) -> bool:
+        return not (self.required or self.any_of or self.excluded or self.metas or self.excluded_metas)
+    
+    @property
+    def is_single_tag(self) -> bool:
+        return len(self.required) == 1 and not (self.any_of or self.excluded or self.metas or self.excluded_metas)
+    
+    def matches(self, tags: FrozenSet[str], rating: Optional[str], score: Optional[int]) -> bool:
+        return (
+            self.required <= tags
+            and (not self.any_of or not self.any_of.isdisjoint(tags))
+            and self.excluded.isdisjoint(tags)
+            and all(meta(rating, score) for meta in self.metas)
+            and not any(meta(rating, score) for meta in self.excluded_metas)
+        )
+
+
+class Blacklist:
+    """
+    Blacklist compiled once per job from the blacklisted_tags config entries.
+    Each entry is a line in e621's blacklist syntax: space separated tags
+    that must all be present, -tag exceptions, ~tag alternatives and
+    rating:/score: metatags. Plain single tag lines, the common case, are
+    checked with one set intersection; other lines are only evaluated when
+    the post carries the tag they are indexed under.
+    """
+    
+    def __init__(self, lines: Optional[Iterable[str]] = None):
+        single: set = set()
+        self._indexed: Dict[str, List[BlacklistRule]] = defaultdict(list)
+        self._unindexed: List[BlacklistRule] = []
+        self.rules: List[BlacklistRule] = []
+        
+        for line in lines or []:
+            rule = BlacklistRule(line)
+            if rule.is_empty:
+                continue
+            self.rules.append(rule)
+            if rule.is_single_tag:
+                single |= rule.required
+            elif rule.required:
+                # Any required tag will do as index; take the longest, it is usually the rarest
+                self._indexed[max(rule.required, key=len)].append(rule)
+            else:
+                self._unindexed.append(rule)
+        
+        self._single: FrozenSet[str] = frozenset(single)
+        self._index_keys: FrozenSet[str] = frozenset(self._indexed)
+    
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+    
+    def blocks(self, tags: Iterable[str], rating: Optional[str] = None, score: Optional[int] = None) -> bool:
+        """Check whether a post with these tags, rating and score is blacklisted"""
+        if not self.rules:
+            return False
+        tags = tags if isinstance(tags, frozenset) else frozenset(tags)
+        
+        if not self._single.isdisjoint(tags):
+            return True
+        for key in self._index_keys & tags:
+            if any(rule.matches(tags, rating, score) for rule in self._indexed[key]):
+                return True
+        return any(rule.matches(tags, rating, score) for rule in self._unindexed)
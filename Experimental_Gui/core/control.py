@@ -0,0 +1,23 @@
+"""Pause switch for a running download task"""
+
+import threading
+
+
+class TaskControl:
+    """
+    Lets another thread ask a running download to pause.
+    A paused download stops taking new files and listing pages, lets the
+    files already in flight finish and then returns; its last checkpoint
+    is where a later run resumes. Cancelling is done by cancelling the
+    task itself, which leaves .part files in place for the next attempt.
+    """
+    
+    def __init__(self):
+        self._paused = threading.Event()
+    
+    def pause(self) -> None:
+        self._paused.set()
+    
+    @property
+    def paused(self) -> bool:
+        return self._paused.is_set()
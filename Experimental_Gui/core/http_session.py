@@ -0,0 +1,86 @@
+"""Shared, long-lived HTTP session used by every downloader on an event loop"""
+
+import ssl
+from typing import Optional, Dict, Any
+
+import aiohttp
+
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy
+
+
+USER_AGENT = "nn-downloader/1.6 (by Official Husko on GitHub)"
+
+
+class SessionManager:
+    """
+    Owns one aiohttp session and connector for the whole process.
+    Downloaders borrow its session instead of opening their own, so keep-alive
+    connections, TLS sessions and DNS results survive from one task to the next.
+    """
+    
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 8,
+        keepalive_timeout: float = 60,
+        dns_cache_ttl: int = 300,
+        request_timeout: float = 30,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.request_timeout = request_timeout
+        # One SSL context for every connection so TLS sessions can be resumed
+        self.ssl_context = ssl.create_default_context()
+        # Per-host pacing shared by every task borrowing this manager
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Which failures are retried and how long to back off between attempts
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "SessionManager":
+        """Create a manager from the connection_pool, site_settings and retry sections of config.json"""
+        pool = config.get("connection_pool", {})
+        return cls(
+            limit=pool.get("limit", 100),
+            limit_per_host=pool.get("limit_per_host", 8),
+            keepalive_timeout=pool.get("keepalive_timeout", 60),
+            dns_cache_ttl=pool.get("dns_cache_ttl", 300),
+            rate_limiter=RateLimiter.from_config(config),
+            retry_policy=RetryPolicy.from_config(config)
+        )
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use (must be called on the owning loop)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                ssl=self.ssl_context
+            )
+            self._session = aiohttp.ClientSession(
+                headers={"User-Agent": USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                connector=connector
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the session and every pooled connection"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
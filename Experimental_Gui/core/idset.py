@@ -0,0 +1,105 @@
+"""Compact membership set for integer post ids"""
+
+from array import array
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Set, Union
+
+
+# Buffered ids are merged into the sorted array once this many pile up
+MERGE_THRESHOLD = 4096
+
+
+class CompactIdSet:
+    """
+    Set of integer ids stored as a sorted array('q') (8 bytes per id) plus a
+    small append buffer. Lookups bisect the array, new ids go to the buffer
+    and are merged in batches so adding stays cheap. Snapshots are raw
+    array dumps and load without any parsing.
+    """
+    
+    def __init__(self, ids: Optional[Iterable[int]] = None, presorted: bool = False):
+        if ids is None:
+            self._ids = array('q')
+        elif presorted:
+            self._ids = array('q', ids)
+        else:
+            self._ids = array('q', sorted(set(ids)))
+        self._buffer: Set[int] = set()
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], expected_count: Optional[int] = None, expected_max: Optional[int] = None) -> Optional["CompactIdSet"]:
+        """
+        Load a snapshot written by save(); None if it is missing, damaged or
+        stale. A snapshot is stale when its size or highest id (the last one,
+        as ids are stored sorted) differs from what the caller expects.
+        """
+        path = Path(path)
+        try:
+            size = path.stat().st_size
+            if size % 8:
+                return None
+            count = size // 8
+            if expected_count is not None and count != expected_count:
+                return None
+            ids = array('q')
+            with open(path, "rb") as f:
+                ids.fromfile(f, count)
+        except (OSError, EOFError):
+            return None
+        if expected_max is not None and (not ids or ids[-1] != expected_max):
+            return None
+        id_set = cls()
+        id_set._ids = ids
+        return id_set
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """Write a snapshot atomically next to path"""
+        self.merge()
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            self._ids.tofile(f)
+        tmp_path.replace(path)
+    
+    def __contains__(self, item_id: Union[int, str]) -> bool:
+        item_id = int(item_id)
+        if item_id in self._buffer:
+            return True
+        index = bisect_left(self._ids, item_id)
+        return index < len(self._ids) and self._ids[index] == item_id
+    
+    def add(self, item_id: Union[int, str]) -> None:
+        item_id = int(item_id)
+        if item_id in self:
+            return
+        ids = self._ids
+        if not ids or item_id > ids[-1]:
+            # Newer posts have higher ids, so most adds are plain appends
+            ids.append(item_id)
+            return
+        self._buffer.add(item_id)
+        if len(self._buffer) >= MERGE_THRESHOLD:
+            self.merge()
+    
+    def merge(self) -> None:
+        """Fold the append buffer into the sorted array"""
+        if not self._buffer:
+            return
+        if len(self._buffer) < 64:
+            for item_id in self._buffer:
+                insort(self._ids, item_id)
+        else:
+            self._ids = array('q', sorted(self._ids.tolist() + list(self._buffer)))
+        self._buffer.clear()
+    
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._buffer)
+    
+    def __iter__(self) -> Iterator[int]:
+        self.merge()
+        return iter(self._ids)
+    
+    def nbytes(self) -> int:
+        """Approximate memory used by the stored ids"""
+        return self._ids.itemsize * len(self._ids) + 72 * len(self._buffer)
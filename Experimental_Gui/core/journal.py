@@ -0,0 +1,115 @@
+"""Crash-safe journal of queued and running download tasks"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+
+DEFAULT_JOURNAL_PATH = Path("db") / "queue.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL,
+    cursor TEXT,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class TaskJournal:
+    """
+    SQLite (WAL mode) record of every task that is queued or running.
+    A task is written when it is queued, its status when it starts, and its
+    listing cursor each time a page is fully downloaded; it is deleted once
+    it finishes. Which posts already finished is kept by the Ledger, so after
+    a crash a task only has to re-list from its last cursor.
+    One instance may be shared between the GUI and the download loop thread.
+    """
+    
+    def __init__(self, path: Union[str, Path] = DEFAULT_JOURNAL_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        row = self._conn.execute("SELECT MAX(position) FROM tasks").fetchone()
+        self._next_position = (row[0] or 0) + 1
+    
+    def add(self, tasks: List[Dict[str, Any]]) -> None:
+        """Record newly queued tasks in one transaction; each dict needs task_id and is what rebuilds the task"""
+        with self._lock:
+            now = time.time()
+            rows = []
+            for data in tasks:
+                rows.append((data["task_id"], self._next_position, json.dumps(data), now))
+                self._next_position += 1
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tasks (task_id, position, status, data, cursor, updated_at) VALUES (?, ?, 'pending', ?, NULL, ?)",
+                rows
+            )
+            self._conn.commit()
+    
+    def set_status(self, task_id: str, status: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE tasks SET status = ?, updated_at = ? WHERE task_id = ?", (status, time.time(), task_id))
+            self._conn.commit()
+    
+    def set_cursor(self, task_id: str, cursor: Dict[str, Any]) -> None:
+        """Remember where a running task's listing can be picked up again"""
+        with self._lock:
+            self._conn.execute("UPDATE tasks SET cursor = ?, updated_at = ? WHERE task_id = ?", (json.dumps(cursor), time.time(), task_id))
+            self._conn.commit()
+    
+    def remove(self, task_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+            self._conn.commit()
+    
+    def remove_pending(self) -> None:
+        """Drop every task that has not started yet"""
+        with self._lock:
+            self._conn.execute("DELETE FROM tasks WHERE status = 'pending'")
+            self._conn.commit()
+    
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Tasks left over from the last run in queue order, as
+        {"task_id", "status", "data", "cursor"} dicts. Tasks that were
+        running come first so they pick up where they stopped.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT task_id, status, data, cursor FROM tasks ORDER BY status != 'downloading', position"
+            ).fetchall()
+        
+        tasks = []
+        for task_id, status, data, cursor in rows:
+            try:
+                tasks.append({
+                    "task_id": task_id,
+                    "status": status,
+                    "data": json.loads(data),
+                    "cursor": json.loads(cursor) if cursor else None
+                })
+            except ValueError as e:
+                print(f"Skipping damaged queue entry {task_id}: {e}")
+        return tasks
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
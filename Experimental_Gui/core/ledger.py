@@ -0,0 +1,305 @@
+"""Indexed record of already downloaded posts, shared by the CLI and the GUI"""
+
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from .idset import CompactIdSet
+
+
+DEFAULT_LEDGER_PATH = Path("db") / "ledger.sqlite3"
+# Pending ids are written out once this many pile up, even mid-page
+DEFAULT_BATCH_SIZE = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    site TEXT NOT NULL,
+    item_id INTEGER NOT NULL,
+    PRIMARY KEY (site, item_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS legacy_imports (
+    name TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS high_water_marks (
+    site TEXT NOT NULL,
+    query TEXT NOT NULL,
+    item_id INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (site, query)
+);
+"""
+
+
+class Ledger:
+    """
+    SQLite (WAL mode) store of downloaded post ids per site.
+    Lookups are answered from a compact in-memory id set per site (loaded
+    from a db/<site>.idx snapshot when it is current), new ids are buffered
+    and written in one transaction per batch, and the old newline separated
+    db/<site>.db files are imported the first time they are seen.
+    One instance may be shared between threads; separate processes
+    (CLI and GUI at the same time) are serialized by SQLite itself.
+    """
+    
+    def __init__(self, path: Union[str, Path] = DEFAULT_LEDGER_PATH, legacy_dir: Optional[Union[str, Path]] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Set[int]] = defaultdict(set)
+        # Loaded id sets and the sites whose snapshot is out of date
+        self._id_sets: Dict[str, CompactIdSet] = {}
+        self._dirty_sites: Set[str] = set()
+        
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        
+        self.import_legacy(self.path.parent if legacy_dir is None else Path(legacy_dir))
+    
+    def import_legacy(self, legacy_dir: Path) -> int:
+        """
+        Import ids from old db/<site>.db text files.
+        The byte offset reached is remembered per file, so each line is read
+        only once even if an older version keeps appending to the file.
+        """
+        imported = 0
+        if not legacy_dir.is_dir():
+            return imported
+        
+        with self._lock:
+            for legacy_file in sorted(legacy_dir.glob("*.db")):
+                row = self._conn.execute("SELECT offset FROM legacy_imports WHERE name = ?", (legacy_file.name,)).fetchone()
+                offset = row[0] if row else 0
+                try:
+                    if legacy_file.stat().st_size <= offset:
+                        continue
+                    with open(legacy_file, "rb") as f:
+                        f.seek(offset)
+                        data = f.read()
+                except OSError as e:
+                    print(f"Could not import {legacy_file}: {e}")
+                    continue
+                
+                # Leave a partially written last line for the next import
+                complete = data[:data.rfind(b"\n") + 1]
+                ids = [(legacy_file.stem, int(line)) for line in complete.split() if line.isdigit()]
+                with self._conn:
+                    self._conn.executemany("INSERT OR IGNORE INTO downloads (site, item_id) VALUES (?, ?)", ids)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO legacy_imports (name, offset) VALUES (?, ?)",
+                        (legacy_file.name, offset + len(complete))
+                    )
+                imported += len(ids)
+            
+            if imported:
+                self._id_sets.clear()
+        
+        if imported:
+            print(f"Imported {imported} ids from old database files into {self.path}")
+        return imported
+    
+    def _snapshot_path(self, site: str) -> Path:
+        return self.path.parent / f"{site}.idx"
+    
+    def _id_set(self, site: str) -> CompactIdSet:
+        """Get the id set of a site, loading it on first use (caller holds the lock)"""
+        id_set = self._id_sets.get(site)
+        if id_set is not None:
+            return id_set
+        
+        # Both come straight from the primary key; the max id catches a snapshot
+        # with the right size but missing the newest downloads
+        count, max_id = self._conn.execute("SELECT COUNT(*), MAX(item_id) FROM downloads WHERE site = ?", (site,)).fetchone()
+        id_set = CompactIdSet.load(self._snapshot_path(site), expected_count=count, expected_max=max_id)
+        if id_set is None:
+            # Missing or stale snapshot - rebuild from the primary key, which is already sorted
+            rows = self._conn.execute("SELECT item_id FROM downloads WHERE site = ? ORDER BY item_id", (site,))
+            id_set = CompactIdSet((row[0] for row in rows), presorted=True)
+            self._dirty_sites.add(site)
+        for item_id in self._pending.get(site, ()):
+            id_set.add(item_id)
+        self._id_sets[site] = id_set
+        return id_set
+    
+    def contains(self, site: str, item_id: Union[int, str]) -> bool:
+        """Check whether a post was already downloaded"""
+        with self._lock:
+            return int(item_id) in self._id_set(site)
+    
+    def known(self, site: str, item_ids: Iterable[Union[int, str]]) -> Set[int]:
+        """Return the subset of item_ids that were already downloaded"""
+        with self._lock:
+            id_set = self._id_set(site)
+            return {int(item_id) for item_id in item_ids if int(item_id) in id_set}
+    
+    def add(self, site: str, item_id: Union[int, str]) -> None:
+        """Record a finished download; written out with the next batch"""
+        item_id = int(item_id)
+        with self._lock:
+            pending = self._pending[site]
+            pending.add(item_id)
+            if site in self._id_sets:
+                self._id_sets[site].add(item_id)
+            self._dirty_sites.add(site)
+            if len(pending) < self.batch_size:
+                return
+        self.flush()
+    
+    def flush(self) -> None:
+        """Write every pending id in a single transaction"""
+        with self._lock:
+            rows: List[tuple] = [(site, item_id) for site, ids in self._pending.items() for item_id in ids]
+            if not rows:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany("INSERT OR IGNORE INTO downloads (site, item_id) VALUES (?, ?)", rows)
+            except sqlite3.Error as e:
+                # Keep the ids pending so the next flush can try again
+                print(f"Error updating database: {e}")
+                return
+            self._pending.clear()
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Tag order and case do not change a query's results"""
+        return " ".join(sorted(query.lower().split()))
+    
+    def get_high_water(self, site: str, query: str) -> Optional[int]:
+        """Highest post id fully handled by earlier runs of a query, None if it never ran"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT item_id FROM high_water_marks WHERE site = ? AND query = ?",
+                (site, self.normalize_query(query))
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set_high_water(self, site: str, query: str, item_id: int) -> None:
+        """Store a query's high-water mark; it never moves backwards"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO high_water_marks (site, query, item_id, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (site, query) DO UPDATE SET item_id = MAX(item_id, excluded.item_id), updated_at = excluded.updated_at",
+                (site, self.normalize_query(query), int(item_id), time.time())
+            )
+    
+    def sync(self, site: str, query: str) -> "QuerySync":
+        """Start tracking one incremental run of a query"""
+        return QuerySync(self, site, query)
+    
+    def count(self, site: str) -> int:
+        """Number of recorded downloads for a site"""
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM downloads WHERE site = ?", (site,)).fetchone()[0]
+    
+    def site(self, site: str) -> "SiteLedger":
+        """Get a view of the ledger bound to one site"""
+        return SiteLedger(self, site)
+    
+    def save_snapshots(self) -> None:
+        """Write the id set snapshot of every loaded site that changed"""
+        with self._lock:
+            for site in list(self._dirty_sites):
+                id_set = self._id_sets.get(site)
+                if id_set is None:
+                    continue
+                try:
+                    id_set.save(self._snapshot_path(site))
+                except OSError as e:
+                    print(f"Could not save id snapshot for {site}: {e}")
+                    continue
+                self._dirty_sites.discard(site)
+    
+    def close(self) -> None:
+        """Flush pending ids, save id snapshots and close the database"""
+        self.flush()
+        self.save_snapshots()
+        with self._lock:
+            self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SiteLedger:
+    """Ledger view for a single site, usable with `in` like the old id lists"""
+    
+    def __init__(self, ledger: Ledger, site: str):
+        self.ledger = ledger
+        self.site = site
+    
+    def __contains__(self, item_id: Union[int, str]) -> bool:
+        return self.ledger.contains(self.site, item_id)
+    
+    def known(self, item_ids: Iterable[Union[int, str]]) -> Set[int]:
+        return self.ledger.known(self.site, item_ids)
+    
+    def add(self, item_id: Union[int, str]) -> None:
+        self.ledger.add(self.site, item_id)
+    
+    def flush(self) -> None:
+        self.ledger.flush()
+
+
+class QuerySync:
+    """
+    Tracks one incremental run of a (site, query) pair.
+    Follow-up runs list posts above the mark oldest first, so whatever was
+    seen forms an unbroken range. Seen posts move the mark up, but a queued
+    download that did not finish holds it just below its id so the next run
+    tries again.
+    """
+    
+    def __init__(self, ledger: Ledger, site: str, query: str):
+        self.ledger = ledger
+        self.site = site
+        self.query = query
+        # Only posts above this id are requested
+        self.since_id = ledger.get_high_water(site, query)
+        self._highest_seen: Optional[int] = None
+        self._unfinished: Set[int] = set()
+        self._interrupted = False
+    
+    def saw(self, item_id: Union[int, str]) -> None:
+        """A post was listed (downloaded, skipped or blacklisted)"""
+        item_id = int(item_id)
+        if self._highest_seen is None or item_id > self._highest_seen:
+            self._highest_seen = item_id
+    
+    def queued(self, item_id: Union[int, str]) -> None:
+        self._unfinished.add(int(item_id))
+    
+    def finished(self, item_id: Union[int, str]) -> None:
+        self._unfinished.discard(int(item_id))
+    
+    def interrupted(self) -> None:
+        """The listing stopped before reaching its end"""
+        self._interrupted = True
+    
+    def commit(self) -> Optional[int]:
+        """Advance the stored mark as far as every download allows; returns the new mark"""
+        if self._highest_seen is None:
+            return self.since_id
+        if self._interrupted and self.since_id is None:
+            # A first run lists newest posts first, so a cut-off listing would leave a gap below the mark
+            return None
+        mark = self._highest_seen
+        if self._unfinished:
+            mark = min(mark, min(self._unfinished) - 1)
+        if self.since_id is not None and mark <= self.since_id:
+            return self.since_id
+        self.ledger.set_high_water(self.site, self.query, mark)
+        self.since_id = mark
+        return mark
+
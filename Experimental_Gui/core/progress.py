@@ -0,0 +1,212 @@
+"""Typed progress events for download tasks"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional, Tuple
+
+
+# File progress is reported at most this often per task (finished files always are)
+EVENT_INTERVAL = 0.25
+# Transfer rate is averaged over this many seconds
+RATE_WINDOW = 5.0
+
+# Event kinds
+FILE_STARTED = "file_started"
+FILE_PROGRESS = "file_progress"
+FILE_DONE = "file_done"
+FILE_FAILED = "file_failed"
+TASK_DONE = "task_done"
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Snapshot of a task's progress when something happened to one of its files"""
+    kind: str
+    task: str
+    file: Optional[str] = None
+    # Current file
+    file_bytes: int = 0
+    file_total: Optional[int] = None
+    # Whole task
+    bytes_done: int = 0
+    files_done: int = 0
+    files_failed: int = 0
+    files_total: Optional[int] = None
+    rate: float = 0.0  # bytes per second over the last RATE_WINDOW seconds
+    eta: Optional[float] = None  # seconds, from the recent file completion rate
+    
+    @property
+    def fraction(self) -> Optional[float]:
+        """Share of the task's files that are finished, None while the total is unknown"""
+        if not self.files_total:
+            return None
+        return min(1.0, (self.files_done + self.files_failed) / self.files_total)
+    
+    def describe(self) -> str:
+        """Short human readable summary, e.g. '12/320 files, 3.2 MB/s, ETA 1:20'"""
+        files = f"{self.files_done}/{self.files_total}" if self.files_total else str(self.files_done)
+        parts = [f"{files} files", f"{format_bytes(self.rate)}/s"]
+        if self.eta is not None:
+            minutes, seconds = divmod(int(self.eta), 60)
+            parts.append(f"ETA {minutes}:{seconds:02d}")
+        return ", ".join(parts)
+
+
+def format_bytes(size: float) -> str:
+    """Human readable byte count"""
+    if size < 1024:
+        return f"{size:.0f} B"
+    for unit in ("KB", "MB"):
+        size /= 1024
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+    return f"{size / 1024:.1f} GB"
+
+
+class ProgressStream:
+    """Async iterator over a tracker's events; ends when the task is done"""
+    
+    def __init__(self, tracker: "ProgressTracker", maxsize: int = 1000):
+        self._tracker = tracker
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    
+    def _push(self, event: Optional[ProgressEvent]) -> None:
+        if self._queue.full():
+            # A slow consumer loses the oldest snapshots, never the newest
+            self._queue.get_nowait()
+        self._queue.put_nowait(event)
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> ProgressEvent:
+        event = await self._queue.get()
+        if event is None:
+            self._tracker.unsubscribe(self)
+            raise StopAsyncIteration
+        return event
+
+
+class ProgressTracker:
+    """
+    Counts files and bytes for one download task and turns them into
+    ProgressEvents for a callback and any number of async iterators.
+    Byte level updates are rate limited to one event per EVENT_INTERVAL.
+    """
+    
+    def __init__(self, task: str = "", callback: Optional[Callable[[ProgressEvent], None]] = None):
+        self.task = task
+        self.callback = callback
+        self.bytes_done = 0
+        self.files_done = 0
+        self.files_failed = 0
+        self.files_total: Optional[int] = None
+        self._last_event = 0.0
+        # (time, bytes_done) and file completion times inside the rate window
+        self._byte_samples: Deque[Tuple[float, int]] = deque()
+        self._file_times: Deque[float] = deque()
+        self._streams: List[ProgressStream] = []
+    
+    def subscribe(self) -> ProgressStream:
+        """Get an async iterator of events from now on; must be called on the task's loop"""
+        stream = ProgressStream(self)
+        self._streams.append(stream)
+        return stream
+    
+    def unsubscribe(self, stream: ProgressStream) -> None:
+        if stream in self._streams:
+            self._streams.remove(stream)
+    
+    def add_total(self, count: int) -> None:
+        """Announce more files (listing pages keep adding to the total)"""
+        self.files_total = (self.files_total or 0) + count
+    
+    def file_started(self, file: str) -> None:
+        self._emit(FILE_STARTED, file)
+    
+    def file_bytes(self, file: str, received: int, file_bytes: int, file_total: Optional[int]) -> None:
+        """Count `received` new bytes of a file that now has `file_bytes` of `file_total`"""
+        self.bytes_done += received
+        now = time.monotonic()
+        self._byte_samples.append((now, self.bytes_done))
+        self._trim(now)
+        if now - self._last_event >= EVENT_INTERVAL:
+            self._emit(FILE_PROGRESS, file, file_bytes, file_total)
+    
+    def file_finished(self, file: str, success: bool) -> None:
+        if success:
+            self.files_done += 1
+            now = time.monotonic()
+            self._file_times.append(now)
+            self._trim(now)
+        else:
+            self.files_failed += 1
+        self._emit(FILE_DONE if success else FILE_FAILED, file)
+    
+    def finish(self) -> None:
+        """Send the final event and end every iterator"""
+        self._emit(TASK_DONE)
+        for stream in list(self._streams):
+            stream._push(None)
+    
+    def rate(self) -> float:
+        """Bytes per second over the last RATE_WINDOW seconds"""
+        now = time.monotonic()
+        self._trim(now)
+        samples = self._byte_samples
+        if len(samples) < 2:
+            return 0.0
+        span = max(now - samples[0][0], 1.0)
+        return (self.bytes_done - samples[0][1]) / span
+    
+    def eta(self) -> Optional[float]:
+        """Seconds left at the recent file completion rate"""
+        if not self.files_total:
+            return None
+        remaining = self.files_total - self.files_done - self.files_failed
+        if remaining <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._trim(now)
+        if not self._file_times:
+            return None
+        span = max(now - self._file_times[0], 1.0)
+        return remaining * span / len(self._file_times)
+    
+    def _trim(self, now: float) -> None:
+        """Forget samples that fell out of their averaging window"""
+        while self._byte_samples and now - self._byte_samples[0][0] > RATE_WINDOW:
+            self._byte_samples.popleft()
+        # Completions are rarer than chunks, so they are averaged over a longer window
+        while self._file_times and now - self._file_times[0] > RATE_WINDOW * 6:
+            self._file_times.popleft()
+    
+    def snapshot(self, kind: str = FILE_PROGRESS, file: Optional[str] = None, file_bytes: int = 0, file_total: Optional[int] = None) -> ProgressEvent:
+        return ProgressEvent(
+            kind=kind,
+            task=self.task,
+            file=file,
+            file_bytes=file_bytes,
+            file_total=file_total,
+            bytes_done=self.bytes_done,
+            files_done=self.files_done,
+            files_failed=self.files_failed,
+            files_total=self.files_total,
+            rate=self.rate(),
+            eta=self.eta()
+        )
+    
+    def _emit(self, kind: str, file: Optional[str] = None, file_bytes: int = 0, file_total: Optional[int] = None) -> None:
+        if not self.callback and not self._streams:
+            return
+        self._last_event = time.monotonic()
+        event = self.snapshot(kind, file, file_bytes, file_total)
+        if self.callback:
+            try:
+                self.callback(event)
+            except Exception as e:
+                print(f"Error in progress callback: {e}")
+        for stream in self._streams:
+            stream._push(event)
@@ -0,0 +1,25 @@
+"""Identity of a site query, shared by batch jobs and subscriptions"""
+
+from typing import Any, Optional
+
+
+class QueryIdentity:
+    """
+    Key and label of a site query, so batch jobs and subscriptions identify
+    the same tags or URL the same way. Needs site, tags and url.
+    """
+    
+    @property
+    def key(self) -> str:
+        """Identity used to keep the same query from running twice"""
+        if self.url:
+            return f"{self.site}|url|{self.url.lower().rstrip('/')}"
+        return f"{self.site}|tags|{' '.join(sorted((self.tags or '').lower().split()))}"
+    
+    def __str__(self):
+        return f"{self.site}: {self.url or self.tags or 'all'}"
+
+
+def parse_max_pages(value: Any) -> Optional[int]:
+    """max_pages from a hand-edited JSON file, where it may be given as a string"""
+    return int(value) if value is not None else None
@@ -0,0 +1,117 @@
+"""Per-host token-bucket rate limiting shared by every download task"""
+
+import asyncio
+import time
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# Domain each site's hosts live under (API and media CDNs alike)
+SITE_DOMAINS = {
+    "e621": "e621.net",
+    "e6ai": "e6ai.net",
+    "e926": "e926.net",
+    "furbooru": "furbooru.org",
+    "rule34": "rule34.xxx",
+    "luscious": "luscious.net",
+    "multporn": "multporn.net",
+    "yiffer": "yiffer.xyz"
+}
+
+# Default (api requests/s, file requests/s) per site when config.json has none
+DEFAULT_SITE_RATES = {
+    "e621": (2.0, 15.0),
+    "e6ai": (2.0, 15.0),
+    "e926": (2.0, 15.0),
+    "furbooru": (2.0, 10.0),
+    "rule34": (3.0, 10.0),
+    "luscious": (2.0, 4.0),
+    "multporn": (2.0, 2.0),
+    "yiffer": (2.0, 4.0)
+}
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `burst`"""
+    
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it (waiters are served in order)"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """
+    Hands out one token bucket per host and kind of request. Each host's rates
+    come from the site it belongs to, split into API/listing requests and file
+    downloads, which are limited separately.
+    Hosts that belong to no known site are not limited.
+    """
+    
+    def __init__(self, site_rates: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.site_rates = dict(DEFAULT_SITE_RATES)
+        self.site_rates.update(site_rates or {})
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RateLimiter":
+        """Build a limiter from site_settings.<site>.requests_per_second / files_per_second"""
+        site_rates = {}
+        for site, (api_rate, file_rate) in DEFAULT_SITE_RATES.items():
+            settings = config.get("site_settings", {}).get(site, {})
+            site_rates[site] = (
+                float(settings.get("requests_per_second", api_rate)),
+                float(settings.get("files_per_second", file_rate))
+            )
+        return cls(site_rates)
+    
+    @staticmethod
+    def site_for_host(host: str) -> Optional[str]:
+        """Find which site a host belongs to"""
+        for site, domain in SITE_DOMAINS.items():
+            if host == domain or host.endswith("." + domain):
+                return site
+        return None
+    
+    def _bucket_for(self, url: str, kind: str) -> Optional[TokenBucket]:
+        """Get (or create) the bucket for the URL's host and kind of request"""
+        host = (urlsplit(url).hostname or "").lower()
+        kind = "file" if kind == "file" else "api"
+        bucket = self._buckets.get((host, kind))
+        if bucket is not None:
+            return bucket
+        
+        site = self.site_for_host(host)
+        if site is None or site not in self.site_rates:
+            return None
+        
+        api_rate, file_rate = self.site_rates[site]
+        rate = file_rate if kind == "file" else api_rate
+        if rate <= 0:
+            return None
+        
+        bucket = TokenBucket(rate, burst=rate)
+        self._buckets[(host, kind)] = bucket
+        return bucket
+    
+    async def acquire(self, url: str, kind: str = "api") -> None:
+        """Wait for permission to send one request to the URL's host"""
+        bucket = self._bucket_for(url, kind)
+        if bucket is not None:
+            await bucket.acquire()
@@ -0,0 +1,141 @@
+"""Retry policy with exponential backoff, jitter and Retry-After support"""
+
+import asyncio
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Callable, Awaitable, TypeVar
+
+import aiohttp
+
+
+T = TypeVar("T")
+
+# Statuses worth another attempt: timeouts, rate limiting and server-side errors
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504, 520, 521, 522, 523, 524}
+
+
+class RetryableError(Exception):
+    """A failed attempt that may succeed if tried again"""
+    
+    def __init__(self, reason: str, retry_after: Optional[float] = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RetryableHTTPError(RetryableError):
+    """Response with a retryable HTTP status"""
+    
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}", retry_after)
+        self.status = status
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryStats:
+    """Counters for every attempt made under a retry policy"""
+    attempts: int = 0
+    retries: int = 0
+    gave_up: int = 0
+    reasons: Counter = field(default_factory=Counter)
+    
+    def summary(self) -> str:
+        """Short human readable summary"""
+        reasons = ", ".join(f"{reason} x{count}" for reason, count in self.reasons.most_common())
+        return f"{self.attempts} requests, {self.retries} retries, {self.gave_up} given up" + (f" ({reasons})" if reasons else "")
+
+
+@dataclass
+class RetryPolicy:
+    """Decides which failures are retried and how long to wait between attempts"""
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    # Longest Retry-After we are willing to honor
+    max_retry_after: float = 300.0
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RetryPolicy":
+        """Create a policy from the retry section of config.json"""
+        retry = config.get("retry", {})
+        return cls(
+            max_attempts=int(retry.get("max_attempts", 5)),
+            base_delay=float(retry.get("base_delay", 1.0)),
+            max_delay=float(retry.get("max_delay", 60.0)),
+            max_retry_after=float(retry.get("max_retry_after", 300.0))
+        )
+    
+    def check_response(self, response: aiohttp.ClientResponse) -> None:
+        """Raise RetryableHTTPError if the response status is worth retrying"""
+        if response.status in RETRYABLE_STATUSES:
+            raise RetryableHTTPError(response.status, parse_retry_after(response.headers.get("Retry-After")))
+    
+    def classify(self, error: BaseException) -> Optional[str]:
+        """Return a reason string if the error is retryable, None if it is fatal"""
+        if isinstance(error, RetryableError):
+            return error.reason
+        if isinstance(error, asyncio.TimeoutError):
+            return "timeout"
+        if isinstance(error, aiohttp.ClientPayloadError):
+            return "truncated body"
+        if isinstance(error, (aiohttp.ClientConnectionError, ConnectionResetError)):
+            return "connection error"
+        return None
+    
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before the next attempt: full-jitter exponential, never shorter than Retry-After"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after))
+        return delay
+    
+    async def call(
+        self,
+        attempt_fn: Callable[[], Awaitable[T]],
+        stats: Optional[RetryStats] = None,
+        on_retry: Optional[Callable[[str, int, float], None]] = None
+    ) -> T:
+        """
+        Run attempt_fn until it succeeds, fails fatally or runs out of attempts.
+        Retryable failures are counted in stats and reported to on_retry with
+        the reason, the number of the next attempt and the delay before it.
+        """
+        stats = stats if stats is not None else RetryStats()
+        attempt = 0
+        while True:
+            attempt += 1
+            stats.attempts += 1
+            try:
+                return await attempt_fn()
+            except Exception as e:
+                reason = self.classify(e)
+                if reason is None:
+                    raise
+                stats.reasons[reason] += 1
+                if attempt >= self.max_attempts:
+                    stats.gave_up += 1
+                    raise
+                delay = self.backoff(attempt, getattr(e, "retry_after", None))
+                stats.retries += 1
+                if on_retry:
+                    on_retry(reason, attempt + 1, delay)
+                await asyncio.sleep(delay)
@@ -0,0 +1,136 @@
+"""Scheduler that keeps saved queries (subscriptions) refreshed"""
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from .query import QueryIdentity, parse_max_pages
+
+
+DEFAULT_SUBSCRIPTIONS_PATH = Path("subscriptions.json")
+DEFAULT_INTERVAL_MINUTES = 60
+
+
+@dataclass
+class Subscription(QueryIdentity):
+    """A saved tag query or URL that is refreshed every interval seconds"""
+    site: str
+    tags: Optional[str] = None
+    url: Optional[str] = None
+    interval: float = DEFAULT_INTERVAL_MINUTES * 60
+    max_pages: Optional[int] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Subscription":
+        return cls(
+            site=str(data["site"]).lower(),
+            tags=data.get("tags"),
+            url=data.get("url"),
+            interval=float(data.get("interval_minutes", DEFAULT_INTERVAL_MINUTES)) * 60,
+            max_pages=parse_max_pages(data.get("max_pages"))
+        )
+
+
+def load_subscriptions(path: Union[str, Path] = DEFAULT_SUBSCRIPTIONS_PATH) -> List[Subscription]:
+    """
+    Read subscriptions from a JSON file of the form
+    {"subscriptions": [{"site": "e621", "tags": "fox", "interval_minutes": 60}, ...]}.
+    Entries for the same query are merged, keeping the shortest interval.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    
+    entries = data.get("subscriptions", []) if isinstance(data, dict) else data
+    subscriptions: Dict[str, Subscription] = {}
+    for entry in entries:
+        try:
+            subscription = Subscription.from_dict(entry)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Skipping invalid subscription {entry!r}: {e}")
+            continue
+        existing = subscriptions.get(subscription.key)
+        if existing is None or subscription.interval < existing.interval:
+            subscriptions[subscription.key] = subscription
+    return list(subscriptions.values())
+
+
+class SubscriptionScheduler:
+    """
+    Runs every subscription on its own jittered timer.
+    Each subscription is driven by a single loop, so it can never overlap
+    with itself, while a shared slot limit interleaves many small refreshes
+    over one connection pool and rate limiter.
+    """
+    
+    def __init__(
+        self,
+        subscriptions: List[Subscription],
+        run_job: Callable[[Subscription], Awaitable[bool]],
+        max_concurrent: int = 4,
+        jitter: float = 0.1,
+        startup_spread: float = 60,
+        progress_callback: Optional[Callable] = None
+    ):
+        self.subscriptions = subscriptions
+        self.run_job = run_job
+        self.max_concurrent = max(1, max_concurrent)
+        self.jitter = max(0.0, jitter)
+        # First runs are spread over this many seconds instead of all starting at once
+        self.startup_spread = startup_spread
+        self.progress_callback = progress_callback
+        self.running: Dict[str, float] = {}
+        self.last_result: Dict[str, bool] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+    
+    def _log(self, message: str) -> None:
+        print(message)
+        if self.progress_callback:
+            self.progress_callback(message)
+    
+    def next_delay(self, subscription: Subscription) -> float:
+        """Interval with +/- jitter so refreshes do not line up on the same second"""
+        return max(1.0, subscription.interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+    
+    async def run_once(self, subscription: Subscription) -> bool:
+        """Refresh one subscription inside a free slot"""
+        async with self._slots:
+            self.running[subscription.key] = time.monotonic()
+            self._log(f"Refreshing {subscription}")
+            try:
+                result = await self.run_job(subscription)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._log(f"Refresh of {subscription} failed: {e}")
+                result = False
+            finally:
+                started = self.running.pop(subscription.key, time.monotonic())
+            self.last_result[subscription.key] = result
+            self._log(f"Refreshed {subscription} in {time.monotonic() - started:.0f}s ({'ok' if result else 'failed'})")
+            return result
+    
+    async def _loop(self, subscription: Subscription) -> None:
+        await asyncio.sleep(random.uniform(0, min(self.startup_spread, subscription.interval)))
+        while True:
+            await self.run_once(subscription)
+            await asyncio.sleep(self.next_delay(subscription))
+    
+    async def run(self) -> None:
+        """Run until cancelled"""
+        if not self.subscriptions:
+            self._log("No subscriptions to run")
+            return
+        
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._log(f"Scheduling {len(self.subscriptions)} subscriptions ({self.max_concurrent} at a time)")
+        loops = [asyncio.create_task(self._loop(subscription)) for subscription in self.subscriptions]
+        try:
+            await asyncio.gather(*loops)
+        finally:
+            for task in loops:
+                task.cancel()
+            await asyncio.gather(*loops, return_exceptions=True)
@@ -1,11 +1,26 @@
 """Async downloaders for NN-Downloader v2.0"""
 
-from .multporn_async import MultpornDownloader, download_multporn_comic
-from .rule34_async import Rule34Downloader, download_rule34_tags
-from .luscious_async import LusciousDownloader, download_luscious_album
-from .yiffer_async import YifferDownloader, download_yiffer_comic
-from .e621_async import E621Downloader, download_e621_tags
-from .furbooru_async import FurbooruDownloader, download_furbooru_tags
+import importlib
+
+from .registry import Site, SITES, TAG_SITES, URL_SITES, get_site
+
+# Site downloaders are imported on first access, so using one site doesn't load them all
+_LAZY = {
+    'MultpornDownloader': '.multporn_async', 'download_multporn_comic': '.multporn_async',
+    'Rule34Downloader': '.rule34_async', 'download_rule34_tags': '.rule34_async',
+    'LusciousDownloader': '.luscious_async', 'download_luscious_album': '.luscious_async',
+    'YifferDownloader': '.yiffer_async', 'download_yiffer_comic': '.yiffer_async',
+    'E621Downloader': '.e621_async', 'download_e621_tags': '.e621_async',
+    'FurbooruDownloader': '.furbooru_async', 'download_furbooru_tags': '.furbooru_async',
+    'run_download': '.runner',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'MultpornDownloader', 'download_multporn_comic',
@@ -13,5 +28,7 @@ __all__ = [
     'LusciousDownloader', 'download_luscious_album',
     'YifferDownloader', 'download_yiffer_comic',
     'E621Downloader', 'download_e621_tags',
-    'FurbooruDownloader', 'download_furbooru_tags'
-]
\ No newline at end of file
+    'FurbooruDownloader', 'download_furbooru_tags',
+    'run_download',
+    'Site', 'SITES', 'TAG_SITES', 'URL_SITES', 'get_site'
+]
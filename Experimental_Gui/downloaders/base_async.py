@@ -3,22 +3,82 @@
 import aiohttp
 import aiofiles
 import asyncio
+import os
 import random
 from pathlib import Path
-from typing import List, Optional, Callable, Dict, Any
+from typing import List, Optional, Callable, Dict, Any, AsyncIterator
 import re
+from collections import deque
+from dataclasses import dataclass
+
+from core.control import TaskControl
+from core.http_session import SessionManager
+from core.ledger import Ledger, SiteLedger, QuerySync
+from core.progress import ProgressEvent, ProgressStream, ProgressTracker
+from core.retry import RetryPolicy, RetryStats, RetryableError
+
+
+# Suffix for files that are still being downloaded
+PART_SUFFIX = ".part"
+
+# Bytes read from the network and written to disk at a time; each chunk is written
+# before the next is read, so memory use doesn't grow with the file size
+CHUNK_SIZE = 64 * 1024
+
+# Large files must not be cut off by a total timeout, only by stalled connections
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+
+
+@dataclass
+class DownloadJob:
+    """A single file handed to the download pool"""
+    url: str
+    file_path: Path
+    progress_info: str = ""
+    on_success: Optional[Callable[[], None]] = None
+
+
+class JobPage(list):
+    """Download jobs of one listing page plus the cursor that resumes the listing after it"""
+    
+    def __init__(self, jobs=(), cursor: Optional[Dict[str, Any]] = None):
+        super().__init__(jobs)
+        self.cursor = cursor
 
 
 class BaseAsyncDownloader:
     """Base class for async downloaders"""
     
-    def __init__(self, progress_callback: Optional[Callable] = None, proxy_list: Optional[List[str]] = None, use_proxies: bool = False):
+    # How many files a site downloads at once (overridden per site)
+    default_workers = 4
+    # How many listing pages may be fetched ahead of the download pool
+    default_lookahead = 2
+    
+    def __init__(self, progress_callback: Optional[Callable] = None, proxy_list: Optional[List[str]] = None, use_proxies: bool = False, max_workers: Optional[int] = None, lookahead: Optional[int] = None, session_manager: Optional[SessionManager] = None, ledger: Optional[Ledger] = None, checkpoint_callback: Optional[Callable[[Dict[str, Any]], None]] = None, event_callback: Optional[Callable[[ProgressEvent], None]] = None, control: Optional[TaskControl] = None):
         self.progress_callback = progress_callback
+        # Pause switch flipped from outside; checked before each new file or page
+        self.control = control
+        # Typed file/byte progress, for event_callback and events() iterators
+        self.progress = ProgressTracker(type(self).__name__.replace("Downloader", "").lower(), event_callback)
+        # Called with a page's resume cursor once it and every earlier page are done
+        self.checkpoint_callback = checkpoint_callback
+        # Set when a listing request failed for good, so the task doesn't count as a success
+        self.listing_failed = False
         self.session = None
+        # Borrowed shared session manager; a private one is created when missing
+        self.session_manager = session_manager
+        self._owns_session_manager = session_manager is None
+        # Borrowed download ledger; a private one is opened on first use
+        self.ledger = ledger
+        self._owns_ledger = False
         self.proxy_list = proxy_list or []
         self.use_proxies = use_proxies and len(self.proxy_list) > 0
         self.current_proxy_index = 0
-        
+        self.max_workers = max(1, max_workers or self.default_workers)
+        self.lookahead = max(1, lookahead or self.default_lookahead)
+        # Attempt, retry and give-up counters for every request of this task
+        self.retry_stats = RetryStats()
+    
     def _get_proxy(self) -> Optional[str]:
         """Get next proxy from list if using proxies"""
         if not self.use_proxies or not self.proxy_list:
@@ -30,21 +90,70 @@ class BaseAsyncDownloader:
         return proxy
     
     async def __aenter__(self):
-        connector = None
-        if self.use_proxies:
-            # Create connector with proxy support
-            connector = aiohttp.TCPConnector(limit=10)
-        
-        self.session = aiohttp.ClientSession(
-            headers={"User-Agent": "nn-downloader/1.6 (by Official Husko on GitHub)"},
-            timeout=aiohttp.ClientTimeout(total=30),
-            connector=connector
-        )
+        if self.session_manager is None:
+            self.session_manager = SessionManager()
+        self.session = self.session_manager.session
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        self.progress.finish()
+        if self.retry_stats.retries and self.progress_callback:
+            self.progress_callback(f"Network: {self.retry_stats.summary()}")
+        if self.ledger:
+            self.ledger.flush()
+            if self._owns_ledger:
+                self.ledger.close()
+                self.ledger = None
+        # Only close what we created - a borrowed session outlives this task
+        if self._owns_session_manager and self.session_manager:
+            await self.session_manager.close()
+            self.session_manager = None
+    
+    @property
+    def stop_requested(self) -> bool:
+        """True once the task was asked to pause"""
+        return self.control is not None and self.control.paused
+    
+    def events(self) -> ProgressStream:
+        """Async iterator of this task's ProgressEvents, ending when the task does"""
+        return self.progress.subscribe()
+    
+    async def _throttle(self, url: str, kind: str = "api") -> None:
+        """Wait for the shared per-host rate limiter before sending a request"""
+        if self.session_manager:
+            await self.session_manager.rate_limiter.acquire(url, kind)
+    
+    def _get_ledger(self) -> Ledger:
+        """Get the download ledger, opening the default one if none was passed in"""
+        if self.ledger is None:
+            self.ledger = Ledger()
+            self._owns_ledger = True
+        return self.ledger
+    
+    @staticmethod
+    def _mark_done(item_id: Any, site_ledger: Optional[SiteLedger] = None, sync: Optional[QuerySync] = None) -> None:
+        """Record a finished download in the ledger and the incremental sync"""
+        if site_ledger:
+            site_ledger.add(item_id)
+        if sync:
+            sync.finished(item_id)
+    
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """Retry policy of the session manager in use"""
+        if self.session_manager:
+            return self.session_manager.retry_policy
+        return RetryPolicy()
+    
+    async def _with_retries(self, url: str, attempt_fn: Callable[[], Any]) -> Any:
+        """Run one request attempt function under the retry policy, logging every retry"""
+        def on_retry(reason: str, attempt: int, delay: float) -> None:
+            message = f"{reason} from {url}, retrying in {delay:.1f}s (attempt {attempt}/{self.retry_policy.max_attempts})"
+            print(message)
+            if self.progress_callback:
+                self.progress_callback(message)
+        
+        return await self.retry_policy.call(attempt_fn, self.retry_stats, on_retry)
     
     def sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for safe file system usage"""
@@ -63,74 +172,281 @@ class BaseAsyncDownloader:
         # Ensure it's not empty
         if not safe_name:
             safe_name = "unnamed"
-            
+        
         return safe_name
     
     async def download_file(self, url: str, file_path: Path, progress_info: str = "") -> bool:
-        """Download a single file with proxy support"""
-        try:
-            if self.progress_callback:
-                self.progress_callback(f"Downloading: {progress_info}")
-            
+        """
+        Download a single file with proxy support.
+        Data is written to a .part file next to the target, resumed with an HTTP
+        Range request if one already exists, and renamed into place only once
+        its size matches what the server announced. Dropped connections and
+        short bodies are retried from where the .part file left off.
+        """
+        part_path = file_path.with_name(file_path.name + PART_SUFFIX)
+        
+        async def attempt() -> bool:
             # Get proxy if using proxies
             proxy = self._get_proxy()
             
-            async with self.session.get(url, proxy=proxy) as response:
-                if response.status == 200:
-                    # Create directory if it doesn't exist
-                    file_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    async with aiofiles.open(file_path, 'wb') as f:
-                        async for chunk in response.content.iter_chunked(8192):
-                            await f.write(chunk)
-                    
-                    return True
+            offset = part_path.stat().st_size if part_path.exists() else 0
+            # Identity encoding keeps Content-Length comparable to bytes on disk
+            headers = {"Accept-Encoding": "identity"}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            
+            await self._throttle(url, "file")
+            async with self.session.get(url, proxy=proxy, headers=headers, timeout=DOWNLOAD_TIMEOUT) as response:
+                if response.status == 416 and offset:
+                    # Nothing left past our offset - finished if the sizes agree
+                    total = self._parse_content_range_total(response.headers.get("Content-Range"))
+                    if total == offset:
+                        os.replace(part_path, file_path)
+                        return True
+                    part_path.unlink()
+                    raise RetryableError("stale partial download")
+                
+                if response.status == 206 and offset:
+                    mode = 'ab'
+                    total = self._parse_content_range_total(response.headers.get("Content-Range"))
+                    if total is None and response.content_length is not None:
+                        total = offset + response.content_length
+                elif response.status == 200:
+                    # Server ignored the range (or there was nothing to resume)
+                    mode = 'wb'
+                    offset = 0
+                    total = response.content_length
                 else:
+                    self.retry_policy.check_response(response)
                     print(f"Failed to download {url}: HTTP {response.status}")
                     return False
-                    
+                
+                written = offset
+                async with aiofiles.open(part_path, mode) as f:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        await f.write(chunk)
+                        written += len(chunk)
+                        self.progress.file_bytes(file_path.name, len(chunk), written, total)
+            
+            size = part_path.stat().st_size
+            if total is not None and size != total:
+                raise RetryableError("incomplete download")
+            
+            os.replace(part_path, file_path)
+            return True
+        
+        success = False
+        try:
+            if self.progress_callback:
+                self.progress_callback(f"Downloading: {progress_info}")
+            self.progress.file_started(file_path.name)
+            
+            # Create directory if it doesn't exist
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            success = await self._with_retries(url, attempt)
+            return success
+        
         except Exception as e:
             print(f"Error downloading {url}: {e}")
             return False
+        finally:
+            self.progress.file_finished(file_path.name, bool(success))
+    
+    @staticmethod
+    def _parse_content_range_total(content_range: Optional[str]) -> Optional[int]:
+        """Get the full size from a 'bytes start-end/total' Content-Range header"""
+        if not content_range or "/" not in content_range:
+            return None
+        total = content_range.rpartition("/")[2].strip()
+        return int(total) if total.isdigit() else None
+    
+    async def _run_job(self, job: DownloadJob) -> bool:
+        """Download a single pool job and run its completion hook"""
+        success = await self.download_file(job.url, job.file_path, job.progress_info)
+        if success and job.on_success:
+            try:
+                job.on_success()
+            except Exception as e:
+                print(f"Error finishing {job.file_path}: {e}")
+        return success
+    
+    async def download_many(self, jobs: List[DownloadJob], label: str = "images") -> List[bool]:
+        """
+        Download jobs through a pool of max_workers concurrent workers.
+        Returns one result per job, in the same order as the jobs.
+        """
+        results = [False] * len(jobs)
+        if not jobs:
+            return results
+        
+        job_queue: asyncio.Queue = asyncio.Queue()
+        for index, job in enumerate(jobs):
+            job_queue.put_nowait((index, job))
+        self.progress.add_total(len(jobs))
+        
+        total = len(jobs)
+        finished = 0
+        
+        async def worker():
+            nonlocal finished
+            while not self.stop_requested:
+                try:
+                    index, job = job_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                
+                results[index] = await self._run_job(job)
+                
+                finished += 1
+                if self.progress_callback:
+                    progress_percent = int((finished / total) * 100)
+                    self.progress_callback(f"Downloaded {finished}/{total} {label} ({progress_percent}%)")
+        
+        await asyncio.gather(*(worker() for _ in range(min(self.max_workers, total))))
+        return results
+    
+    async def download_stream(self, pages: AsyncIterator[List[DownloadJob]], label: str = "images") -> int:
+        """
+        Download jobs from an async iterator of listing pages.
+        A producer task keeps up to `lookahead` pages fetched ahead while the
+        pool drains them through a bounded queue. Returns the number of files downloaded.
+        Pages given as JobPage have their cursor passed to checkpoint_callback
+        once the page and every page before it have no jobs left in flight.
+        When control is paused no new pages or jobs are started and the call
+        returns as soon as the files in flight are done.
+        """
+        page_queue: asyncio.Queue = asyncio.Queue(maxsize=self.lookahead)
+        job_queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_workers)
+        queued = 0
+        finished = 0
+        downloaded = 0
+        producer_error: Optional[Exception] = None
+        # [jobs left, cursor] of every page not yet checkpointed, oldest first
+        open_pages: deque = deque()
+        
+        def checkpoint() -> None:
+            cursor = None
+            while open_pages and open_pages[0][0] == 0:
+                cursor = open_pages.popleft()[1]
+            if cursor is not None and self.checkpoint_callback:
+                try:
+                    self.checkpoint_callback(cursor)
+                except Exception as e:
+                    print(f"Error saving checkpoint: {e}")
+        
+        async def producer():
+            nonlocal producer_error
+            try:
+                async for page_jobs in pages:
+                    await page_queue.put(page_jobs)
+            except Exception as e:
+                producer_error = e
+            await page_queue.put(None)
+        
+        async def worker():
+            nonlocal finished, downloaded
+            while True:
+                item = await job_queue.get()
+                if item is None:
+                    return
+                
+                page_state, job = item
+                if self.stop_requested:
+                    # Paused: the page stays open, so the resumed run lists it again
+                    continue
+                if await self._run_job(job):
+                    downloaded += 1
+                
+                page_state[0] -= 1
+                if page_state[0] == 0:
+                    checkpoint()
+                
+                finished += 1
+                if self.progress_callback:
+                    self.progress_callback(f"Downloaded {finished}/{queued} {label}")
+        
+        producer_task = asyncio.create_task(producer())
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_workers)]
+        try:
+            while True:
+                page_jobs = await page_queue.get()
+                if page_jobs is None or self.stop_requested:
+                    break
+                
+                page_state = [len(page_jobs), getattr(page_jobs, "cursor", None)]
+                open_pages.append(page_state)
+                if not page_jobs:
+                    checkpoint()
+                
+                queued += len(page_jobs)
+                self.progress.add_total(len(page_jobs))
+                for job in page_jobs:
+                    await job_queue.put((page_state, job))
+            
+            for _ in workers:
+                await job_queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in [producer_task, *workers]:
+                if not task.done():
+                    task.cancel()
+        
+        # Surface listing errors once everything already queued is done
+        if producer_error:
+            raise producer_error
+        return downloaded
     
     async def fetch_page(self, url: str, **kwargs) -> Optional[str]:
         """Fetch a web page with proxy support"""
-        try:
+        async def attempt() -> Optional[str]:
             proxy = self._get_proxy()
+            await self._throttle(url)
             async with self.session.get(url, proxy=proxy, **kwargs) as response:
                 if response.status == 200:
                     return await response.text()
-                else:
-                    print(f"Failed to fetch {url}: HTTP {response.status}")
-                    return None
+                self.retry_policy.check_response(response)
+                print(f"Failed to fetch {url}: HTTP {response.status}")
+                return None
+        
+        try:
+            return await self._with_retries(url, attempt)
         except Exception as e:
             print(f"Error fetching {url}: {e}")
             return None
     
     async def fetch_json(self, url: str, **kwargs) -> Optional[dict]:
         """Fetch JSON data with proxy support"""
-        try:
+        async def attempt() -> Optional[dict]:
             proxy = self._get_proxy()
+            await self._throttle(url)
             async with self.session.get(url, proxy=proxy, **kwargs) as response:
                 if response.status == 200:
                     return await response.json()
-                else:
-                    print(f"Failed to fetch JSON {url}: HTTP {response.status}")
-                    return None
+                self.retry_policy.check_response(response)
+                print(f"Failed to fetch JSON {url}: HTTP {response.status}")
+                return None
+        
+        try:
+            return await self._with_retries(url, attempt)
         except Exception as e:
             print(f"Error fetching JSON {url}: {e}")
             return None
     
     async def post_json(self, url: str, data: Dict[str, Any], **kwargs) -> Optional[dict]:
         """Post JSON data with proxy support"""
-        try:
+        async def attempt() -> Optional[dict]:
             proxy = self._get_proxy()
+            await self._throttle(url)
             async with self.session.post(url, json=data, proxy=proxy, **kwargs) as response:
                 if response.status == 200:
                     return await response.json()
-                else:
-                    print(f"Failed to post to {url}: HTTP {response.status}")
-                    return None
+                self.retry_policy.check_response(response)
+                print(f"Failed to post to {url}: HTTP {response.status}")
+                return None
+        
+        try:
+            return await self._with_retries(url, attempt)
         except Exception as e:
             print(f"Error posting to {url}: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -1,20 +1,26 @@
 """Async E621/E6AI/E926 downloader - replicates original e6systems.py functionality"""
 
-import asyncio
 import json
 import random
+from functools import partial
 from pathlib import Path
-from typing import Optional, Callable, List, Dict, Any
+from typing import Optional, Callable, List, Dict, Any, AsyncIterator
 from datetime import datetime
 import aiohttp
-from .base_async import BaseAsyncDownloader
+from core.blacklist import Blacklist
+from core.control import TaskControl
+from core.http_session import SessionManager
+from core.ledger import Ledger, SiteLedger, QuerySync
+from .base_async import BaseAsyncDownloader, DownloadJob, JobPage
 
 
 class E621Downloader(BaseAsyncDownloader):
     """Async downloader for E621/E6AI/E926 - replicates original e6systems.py"""
     
-    def __init__(self, progress_callback: Optional[Callable] = None):
-        super().__init__(progress_callback)
+    default_workers = 6
+    
+    def __init__(self, progress_callback: Optional[Callable] = None, **kwargs):
+        super().__init__(progress_callback, **kwargs)
         self.approved_list = []
         self.dt_now = datetime.now().strftime("%d-%m-%Y_%H-%M-%S")
     
@@ -28,214 +34,222 @@ class E621Downloader(BaseAsyncDownloader):
         api_key: Optional[str] = None,
         ai_training: bool = False,
         db_file: Optional[str] = None,
-        output_dir: Path = Path("media")
+        output_dir: Path = Path("media"),
+        start_id: Optional[int] = None,
+        incremental: bool = False,
+        resume: Optional[Dict[str, Any]] = None
     ) -> bool:
         """
         Download images by tags from E621/E6AI/E926.
-        Replicates original E6System.fetcher method exactly.
+        Replicates original E6System.fetcher method exactly, but listing pages
+        are prefetched while the download pool works on earlier ones and are
+        walked with an id cursor. Pass start_id to resume a crawl below that id,
+        or resume with a cursor handed to checkpoint_callback by an earlier run.
+        With incremental set only posts newer than the last run are fetched,
+        into a directory that stays the same from run to run.
         """
         try:
             if self.progress_callback:
                 self.progress_callback(f"Starting {site} download for tags: {tags}")
             
-            blacklist = blacklist or []
-            page = 1
+            # Main directory (same pattern as original, stable per query when syncing)
+            directory_name = f"{site} {tags}" if incremental else f"{self.dt_now} {tags}"
+            safe_directory_name = self.sanitize_filename(directory_name)
+            main_dir = Path(resume["dir"]) if resume and resume.get("dir") else output_dir / safe_directory_name
             
-            # Load existing database if specified
-            downloaded_ids = set()
-            if db_file:
-                db_path = Path("db") / f"{site}.db"
-                if db_path.exists():
-                    with open(db_path, "r", encoding="utf-8") as f:
-                        downloaded_ids = {line.strip() for line in f if line.strip()}
+            sync = self._get_ledger().sync(site, tags) if incremental else None
+            pages = self._iter_pages(tags, site, Blacklist(blacklist), max_pages, api_user, api_key, ai_training, db_file, main_dir, start_id, sync, resume)
+            downloaded_count = await self.download_stream(pages)
             
-            while True:
+            if self.stop_requested:
+                # Paused before the listing ended; the checkpoint says where to pick up
+                if sync:
+                    sync.interrupted()
                 if self.progress_callback:
-                    self.progress_callback(f"Fetching page {page}...")
-                
-                # Construct API URL (same as original)
-                api_url = f"https://{site}.net/posts.json?tags={tags}&limit=320&page={page}"
-                
-                # Prepare headers and auth (same as original)
-                auth = None
-                if api_user and api_key:
-                    auth = aiohttp.BasicAuth(api_user, api_key)
-                
-                # Make API request
-                try:
-                    async with self.session.get(api_url, auth=auth) as response:
-                        if response.status != 200:
-                            print(f"API request failed with status {response.status}")
-                            break
-                        
-                        data = await response.json()
-                except Exception as e:
-                    print(f"Error fetching page {page}: {e}")
-                    break
-                
-                # Check for API limit message (same as original)
-                if isinstance(data, dict) and "message" in data:
-                    if "You cannot go beyond page 750" in data["message"]:
-                        print(f"{data['message']} (API limit)")
-                        break
-                
-                # Check if no posts found (same as original)
-                posts = data.get("posts", [])
-                if not posts:
-                    if self.progress_callback:
-                        self.progress_callback("No images found or all downloaded! Try different tags.")
-                    print("No images found or all downloaded! Try different tags.")
-                    break
-                
-                # Check max pages limit (same as original)
-                if max_pages and page >= max_pages:
-                    if self.progress_callback:
-                        self.progress_callback(f"Finished downloading {max_pages} of {max_pages} pages.")
-                    print(f"Finished downloading {max_pages} of {max_pages} pages.")
-                    break
-                
-                # Process posts for this page
-                page_approved = []
-                for item in posts:
-                    image_id = str(item["id"])
-                    file_info = item.get("file", {})
-                    image_address = file_info.get("url")
-                    
-                    if not image_address:
-                        continue
-                    
-                    # Get tags (same logic as original)
-                    meta_tags = item["tags"] if ai_training else {}
-                    item_tags = item.get("tags", {})
-                    
-                    # Collect all tags for blacklist checking (same as original)
-                    post_tags = []
-                    for tag_type in ["general", "species", "character"]:
-                        post_tags.extend(item_tags.get(tag_type, []))
-                    
-                    # Add site-specific tags (same as original)
-                    if site == "e6ai":
-                        post_tags.extend(item_tags.get("director", []))
-                        post_tags.extend(item_tags.get("meta", []))
-                    else:
-                        post_tags.extend(item_tags.get("copyright", []))
-                        post_tags.extend(item_tags.get("artist", []))
-                    
-                    # Check blacklist (same logic as original)
-                    passed = sum(1 for blacklisted_tag in blacklist if blacklisted_tag in post_tags)
-                    
-                    # Skip if blacklisted or already downloaded
-                    if passed > 0:
-                        continue
-                    
-                    if db_file and image_id in downloaded_ids:
-                        continue
-                    
-                    # Add to approved list
-                    image_data = {
-                        "image_address": image_address,
-                        "image_format": file_info.get("ext", "jpg"),
-                        "image_id": image_id,
-                        "meta_tags": meta_tags
-                    }
-                    page_approved.append(image_data)
-                
-                # Download all approved images from this page
-                if page_approved:
-                    await self._download_page_images(page_approved, tags, site, ai_training, db_file, output_dir)
-                
-                if self.progress_callback:
-                    self.progress_callback(f"Page {page} completed")
-                print(f"Page {page} completed")
-                
-                page += 1
-                # Small delay like original (sleep(5))
-                await asyncio.sleep(2)
+                    self.progress_callback(f"Paused after {downloaded_count} images")
+            
+            if sync:
+                mark = sync.commit()
+                if mark is not None and self.progress_callback:
+                    self.progress_callback(f"Synced up to post {mark}")
             
             if self.progress_callback:
+                self.progress_callback(f"Downloaded {downloaded_count} images to {main_dir}")
                 self.progress_callback(f"Download complete for tags: {tags}")
             
+            print(f"Downloaded {downloaded_count} images to {main_dir}")
             print(f"Download complete for tags: {tags}")
-            return True
-            
+            return not self.listing_failed
+        
         except Exception as e:
             print(f"Error downloading from {site}: {e}")
             if self.progress_callback:
                 self.progress_callback(f"Error: {e}")
             return False
     
-    async def _download_page_images(
-        self, 
-        approved_list: List[Dict[str, Any]], 
-        tags: str, 
-        site: str, 
-        ai_training: bool, 
+    async def _iter_pages(
+        self,
+        tags: str,
+        site: str,
+        blacklist: Blacklist,
+        max_pages: Optional[int],
+        api_user: Optional[str],
+        api_key: Optional[str],
+        ai_training: bool,
         db_file: Optional[str],
-        output_dir: Path
-    ) -> None:
-        """Download all images from a page (replicates original download loop)"""
-        
-        # Create main directory (same pattern as original)
-        directory_name = f"{self.dt_now} {tags}"
-        safe_directory_name = self.sanitize_filename(directory_name)
-        main_dir = output_dir / safe_directory_name
-        main_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Create meta directory if needed
+        main_dir: Path,
+        start_id: Optional[int] = None,
+        sync: Optional[QuerySync] = None,
+        resume: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[JobPage]:
+        """Fetch listing pages and yield the approved download jobs of each one"""
+        resume = resume or {}
+        page = resume.get("page", 1)
         meta_dir = main_dir / "meta"
-        if ai_training:
-            meta_dir.mkdir(parents=True, exist_ok=True)
         
-        downloaded_count = 0
-        total_images = len(approved_list)
+        # page=b<id> costs the same at any depth and has no 750 page limit,
+        # but only follows the default id order
+        use_cursor = "order:" not in tags
+        before_id = resume.get("before_id", start_id)
+        # page=a<id> lists the posts just above an id, so a sync walks upwards from its mark
+        after_id = resume.get("after_id", sync.since_id) if sync else None
         
-        if self.progress_callback:
-            self.progress_callback(f"Downloading {total_images} images...")
+        # Ledger of finished downloads if oneTimeDownload is enabled
+        site_ledger = self._get_ledger().site(site) if db_file else None
         
-        for i, data in enumerate(approved_list):
-            image_address = data.get("image_address")
-            image_format = data.get("image_format", "jpg")
-            image_id = data.get("image_id")
-            meta_tags = data.get("meta_tags", {})
+        # Prepare auth (same as original)
+        auth = None
+        if api_user and api_key:
+            auth = aiohttp.BasicAuth(api_user, api_key)
+        
+        while True:
+            if site_ledger:
+                # Write out what finished while the previous page was downloading
+                site_ledger.flush()
+            
+            if self.progress_callback:
+                self.progress_callback(f"Fetching page {page}...")
             
-            if not image_address or not image_id:
-                continue
+            # Construct API URL, continuing past the last id seen
+            if after_id is not None:
+                page_param = f"a{after_id}"
+            elif use_cursor and before_id:
+                page_param = f"b{before_id}"
+            else:
+                page_param = page
+            api_url = f"https://{site}.net/posts.json?tags={tags}&limit=320&page={page_param}"
             
-            # Download image file
-            file_path = main_dir / f"{image_id}.{image_format}"
-            progress_info = f"{tags} - Image {image_id} ({i+1}/{total_images})"
+            # Make API request (transient failures are retried before giving up)
+            data = await self.fetch_json(api_url, auth=auth)
+            if data is None:
+                print(f"Stopped at page {page}: listing request failed")
+                self.listing_failed = True
+                if sync:
+                    sync.interrupted()
+                break
+            
+            # Check for API limit message (same as original)
+            if isinstance(data, dict) and "message" in data:
+                if "You cannot go beyond page 750" in data["message"]:
+                    print(f"{data['message']} (API limit)")
+                    if sync:
+                        sync.interrupted()
+                    break
+            
+            # Check if no posts found (same as original)
+            posts = data.get("posts", [])
+            if not posts:
+                if self.progress_callback:
+                    self.progress_callback("No images found or all downloaded! Try different tags.")
+                print("No images found or all downloaded! Try different tags.")
+                break
+            
+            # Check max pages limit (same as original)
+            if max_pages and page >= max_pages:
+                if self.progress_callback:
+                    self.progress_callback(f"Finished downloading {max_pages} of {max_pages} pages.")
+                print(f"Finished downloading {max_pages} of {max_pages} pages.")
+                break
             
-            if await self.download_file(image_address, file_path, progress_info):
-                downloaded_count += 1
+            # One indexed lookup for the whole page
+            already_downloaded = site_ledger.known(item["id"] for item in posts) if site_ledger else set()
+            
+            # Process posts for this page
+            jobs = []
+            for item in posts:
+                image_id = str(item["id"])
+                if sync:
+                    sync.saw(item["id"])
+                file_info = item.get("file", {})
+                image_address = file_info.get("url")
+                
+                if not image_address:
+                    continue
+                
+                # Get tags (same logic as original)
+                meta_tags = item["tags"] if ai_training else {}
+                item_tags = item.get("tags", {})
                 
-                # Save metadata if ai_training enabled (same as original)
-                if ai_training and meta_tags:
-                    meta_file = meta_dir / f"{image_id}.json"
-                    try:
-                        with open(meta_file, 'w', encoding='utf-8') as handler:
-                            json.dump(meta_tags, handler, indent=6)
-                    except Exception as e:
-                        print(f"Error saving metadata for {image_id}: {e}")
+                # Check blacklist against every tag category, like e621's own blacklist
+                if blacklist:
+                    post_tags = frozenset(tag for group in item_tags.values() for tag in group)
+                    if blacklist.blocks(post_tags, item.get("rating"), item.get("score", {}).get("total")):
+                        continue
+                
+                # Skip if already downloaded
+                if item["id"] in already_downloaded:
+                    continue
                 
-                # Update database file (same as original)
-                if db_file:
-                    db_path = Path("db")
-                    db_path.mkdir(exist_ok=True)
-                    db_file_path = db_path / f"{site}.db"
-                    try:
-                        with open(db_file_path, "a", encoding="utf-8") as db_writer:
-                            db_writer.write(f"{image_id}\n")
-                    except Exception as e:
-                        print(f"Error updating database: {e}")
+                image_format = file_info.get("ext", "jpg")
+                if sync:
+                    sync.queued(image_id)
+                jobs.append(DownloadJob(
+                    url=image_address,
+                    file_path=main_dir / f"{image_id}.{image_format}",
+                    progress_info=f"{tags} - Image {image_id} (page {page})",
+                    on_success=partial(self._record_download, image_id, meta_tags, meta_dir, ai_training, site_ledger, sync)
+                ))
+            
+            if after_id is not None:
+                after_id = max(item["id"] for item in posts)
+            else:
+                before_id = min(item["id"] for item in posts)
             
+            if jobs:
+                main_dir.mkdir(parents=True, exist_ok=True)
+                if ai_training:
+                    meta_dir.mkdir(parents=True, exist_ok=True)
+            # Empty pages are passed on too so the resume cursor keeps moving
+            yield JobPage(jobs, {"dir": str(main_dir), "page": page + 1, "before_id": before_id, "after_id": after_id})
+            
+            position = f"listed up to id {after_id}" if after_id is not None else f"resume id {before_id}"
             if self.progress_callback:
-                progress_percent = int(((i + 1) / total_images) * 100)
-                self.progress_callback(f"Downloaded {i+1}/{total_images} images ({progress_percent}%)")
-        
-        if self.progress_callback:
-            self.progress_callback(f"Downloaded {downloaded_count} images to {main_dir}")
+                self.progress_callback(f"Page {page} queued ({len(jobs)} images, {position})")
+            print(f"Page {page} queued ({len(jobs)} images, {position})")
+            
+            page += 1
+    
+    def _record_download(
+        self,
+        image_id: str,
+        meta_tags: Dict[str, Any],
+        meta_dir: Path,
+        ai_training: bool,
+        site_ledger: Optional[SiteLedger],
+        sync: Optional[QuerySync] = None
+    ) -> None:
+        """Save metadata and ledger entry for a finished image"""
+        # Save metadata if ai_training enabled (same as original)
+        if ai_training and meta_tags:
+            meta_file = meta_dir / f"{image_id}.json"
+            try:
+                with open(meta_file, 'w', encoding='utf-8') as handler:
+                    json.dump(meta_tags, handler, indent=6)
+            except Exception as e:
+                print(f"Error saving metadata for {image_id}: {e}")
         
-        print(f"Downloaded {downloaded_count} images to {main_dir}")
+        # Record the download (written to the ledger in batches)
+        self._mark_done(image_id, site_ledger, sync)
 
 
 # Async context manager function for easy use
@@ -251,10 +265,20 @@ async def download_e621_tags(
     output_dir: Path = Path("media"),
     progress_callback: Optional[Callable] = None,
     proxy_list: Optional[List[str]] = None,
-    use_proxies: bool = False
+    use_proxies: bool = False,
+    max_workers: Optional[int] = None,
+    lookahead: Optional[int] = None,
+    session_manager: Optional[SessionManager] = None,
+    ledger: Optional[Ledger] = None,
+    start_id: Optional[int] = None,
+    incremental: bool = False,
+    resume: Optional[Dict[str, Any]] = None,
+    checkpoint_callback: Optional[Callable] = None,
+    event_callback: Optional[Callable] = None,
+    control: Optional[TaskControl] = None
 ) -> bool:
     """Download images by tags from E621/E6AI/E926"""
-    async with E621Downloader(progress_callback, proxy_list, use_proxies) as downloader:
+    async with E621Downloader(progress_callback, proxy_list=proxy_list, use_proxies=use_proxies, max_workers=max_workers, lookahead=lookahead, session_manager=session_manager, ledger=ledger, checkpoint_callback=checkpoint_callback, event_callback=event_callback, control=control) as downloader:
         return await downloader.download_by_tags(
             tags=tags,
             site=site,
@@ -264,11 +288,14 @@ async def download_e621_tags(
             api_key=api_key,
             ai_training=ai_training,
             db_file=db_file,
-            output_dir=output_dir
+            output_dir=output_dir,
+            start_id=start_id,
+            incremental=incremental,
+            resume=resume
         )
 
 
 # NOTE FOR FUTURE: This E621Downloader replicates the exact behavior
 # of the original modules/e6systems.py E6System.fetcher method.
-# Same API calls, same blacklist filtering, same database tracking,
+# Same API calls, same blacklist filtering, same one-time-download tracking,
 # same directory structure, same metadata handling for AI training.
\ No newline at end of file
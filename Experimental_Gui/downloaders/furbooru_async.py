@@ -1,17 +1,23 @@
 """Async Furbooru downloader - replicates original furbooru.py functionality"""
 
-import asyncio
+from functools import partial
 from pathlib import Path
-from typing import Optional, Callable, List, Dict, Any
+from typing import Optional, Callable, List, Dict, Any, AsyncIterator
 from datetime import datetime
-from .base_async import BaseAsyncDownloader
+from core.blacklist import Blacklist, normalize_rating
+from core.control import TaskControl
+from core.http_session import SessionManager
+from core.ledger import Ledger, QuerySync
+from .base_async import BaseAsyncDownloader, DownloadJob, JobPage
 
 
 class FurbooruDownloader(BaseAsyncDownloader):
     """Async downloader for Furbooru - replicates original furbooru.py"""
     
-    def __init__(self, progress_callback: Optional[Callable] = None):
-        super().__init__(progress_callback)
+    default_workers = 4
+    
+    def __init__(self, progress_callback: Optional[Callable] = None, **kwargs):
+        super().__init__(progress_callback, **kwargs)
         self.dt_now = datetime.now().strftime("%d-%m-%Y_%H-%M-%S")
     
     async def download_by_tags(
@@ -21,181 +27,178 @@ class FurbooruDownloader(BaseAsyncDownloader):
         max_pages: Optional[int] = None,
         api_key: Optional[str] = None,
         db_file: Optional[str] = None,
-        output_dir: Path = Path("media")
+        output_dir: Path = Path("media"),
+        incremental: bool = False,
+        resume: Optional[Dict[str, Any]] = None
     ) -> bool:
         """
         Download images by tags from Furbooru.
-        Replicates original FURBOORU.fetcher method exactly.
+        Replicates original FURBOORU.fetcher method exactly, but listing pages
+        are prefetched while the download pool works on earlier ones.
+        With incremental set only posts newer than the last run are fetched,
+        into a directory that stays the same from run to run.
+        resume takes a cursor handed to checkpoint_callback by an earlier run.
         """
         try:
             if self.progress_callback:
                 self.progress_callback(f"Starting Furbooru download for tags: {tags}")
             
-            # Format tags same as original (replace spaces with commas)
-            formatted_tags = tags.replace(" ", ", ")
-            blacklist = blacklist or []
-            page = 1
+            # Directory (same pattern as original, stable per query when syncing)
+            safe_tags = self.sanitize_filename(tags).replace(" ", "_")
+            directory_name = f"furbooru_{safe_tags}" if incremental else f"{self.dt_now}_{safe_tags}"
+            main_dir = Path(resume["dir"]) if resume and resume.get("dir") else output_dir / directory_name
             
-            # Load existing database if specified
-            downloaded_ids = set()
-            if db_file:
-                db_path = Path("db") / "furbooru.db"
-                if db_path.exists():
-                    with open(db_path, "r", encoding="utf-8") as f:
-                        downloaded_ids = {line.strip() for line in f if line.strip()}
+            sync = self._get_ledger().sync("furbooru", tags) if incremental else None
+            pages = self._iter_pages(tags, Blacklist(blacklist), max_pages, api_key, db_file, main_dir, sync, resume)
+            downloaded_count = await self.download_stream(pages)
             
-            while True:
-                if self.progress_callback:
-                    self.progress_callback(f"Fetching page {page}...")
-                
-                # Construct API URL (same as original)
-                api_url = f"https://furbooru.org/api/v1/json/search/images?q={formatted_tags}&page={page}&per_page=50"
-                if api_key:
-                    api_url += f"&key={api_key}"
-                
-                # Prepare headers
-                headers = {
-                    "User-Agent": "nn-downloader/2.0 (by Official-Husko on GitHub)"
-                }
-                
-                # Make API request
-                try:
-                    async with self.session.get(api_url, headers=headers) as response:
-                        if response.status != 200:
-                            print(f"API request failed with status {response.status}")
-                            break
-                        
-                        data = await response.json()
-                except Exception as e:
-                    print(f"Error fetching page {page}: {e}")
-                    break
-                
-                # Check if no images found (same as original)
-                if data.get("total", 0) == 0:
-                    if self.progress_callback:
-                        self.progress_callback("No images found or all downloaded! Try different tags.")
-                    print("No images found or all downloaded! Try different tags.")
-                    break
-                
-                # Check max pages limit (same as original)
-                if max_pages and page >= max_pages:
-                    if self.progress_callback:
-                        self.progress_callback(f"Finished downloading {max_pages} of {max_pages} pages.")
-                    print(f"Finished downloading {max_pages} of {max_pages} pages.")
-                    break
-                
-                # Process images for this page
-                page_approved = []
-                images = data.get("images", [])
-                
-                for item in images:
-                    # Skip hidden images (same as original)
-                    if item.get("hidden_from_users", False):
-                        continue
-                    
-                    # Check blacklist (same as original)
-                    post_tags = item.get("tags", [])
-                    if any(tag in blacklist for tag in post_tags):
-                        continue
-                    
-                    image_id = str(item["id"])
-                    image_address = item.get("representations", {}).get("full")
-                    image_format = item.get("format", "png")
-                    
-                    if not image_address:
-                        continue
-                    
-                    # Skip if already downloaded (same logic as original)
-                    if db_file and image_id in downloaded_ids:
-                        continue
-                    
-                    # Add to approved list
-                    image_data = {
-                        "image_address": image_address,
-                        "image_format": image_format,
-                        "image_id": image_id
-                    }
-                    page_approved.append(image_data)
-                
-                # Download all approved images from this page
-                if page_approved:
-                    await self._download_page_images(page_approved, tags, db_file, output_dir)
-                
+            if self.stop_requested:
+                # Paused before the listing ended; the checkpoint says where to pick up
+                if sync:
+                    sync.interrupted()
                 if self.progress_callback:
-                    self.progress_callback(f"Page {page} completed")
-                print(f"Page {page} completed")
-                
-                page += 1
-                # Small delay like original
-                await asyncio.sleep(1)
+                    self.progress_callback(f"Paused after {downloaded_count} images")
+            
+            if sync:
+                mark = sync.commit()
+                if mark is not None and self.progress_callback:
+                    self.progress_callback(f"Synced up to post {mark}")
             
             if self.progress_callback:
+                self.progress_callback(f"Downloaded {downloaded_count} images to {main_dir}")
                 self.progress_callback(f"Download complete for tags: {tags}")
             
+            print(f"Downloaded {downloaded_count} images to {main_dir}")
             print(f"Download complete for tags: {tags}")
-            return True
-            
+            return not self.listing_failed
+        
         except Exception as e:
             print(f"Error downloading from Furbooru: {e}")
             if self.progress_callback:
                 self.progress_callback(f"Error: {e}")
             return False
     
-    async def _download_page_images(
-        self, 
-        approved_list: List[Dict[str, Any]], 
+    async def _iter_pages(
+        self,
         tags: str,
+        blacklist: Blacklist,
+        max_pages: Optional[int],
+        api_key: Optional[str],
         db_file: Optional[str],
-        output_dir: Path
-    ) -> None:
-        """Download all images from a page (replicates original download loop)"""
+        main_dir: Path,
+        sync: Optional[QuerySync] = None,
+        resume: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[JobPage]:
+        """Fetch listing pages and yield the approved download jobs of each one"""
+        # Format tags same as original (replace spaces with commas)
+        formatted_tags = tags.replace(" ", ", ")
+        page = (resume or {}).get("page", 1)
         
-        # Create directory (same pattern as original)
-        safe_tags = self.sanitize_filename(tags).replace(" ", "_")
-        directory_name = f"{self.dt_now}_{safe_tags}"
-        main_dir = output_dir / directory_name
-        main_dir.mkdir(parents=True, exist_ok=True)
+        # A sync only asks for posts above its mark, oldest first
+        sort_params = ""
+        if sync and sync.since_id is not None:
+            formatted_tags = f"{formatted_tags}, id.gt:{sync.since_id}" if formatted_tags else f"id.gt:{sync.since_id}"
+            sort_params = "&sf=id&sd=asc"
         
-        downloaded_count = 0
-        total_images = len(approved_list)
+        # Ledger of finished downloads if oneTimeDownload is enabled
+        site_ledger = self._get_ledger().site("furbooru") if db_file else None
         
-        if self.progress_callback:
-            self.progress_callback(f"Downloading {total_images} images...")
-        
-        for i, data in enumerate(approved_list):
-            image_address = data.get("image_address")
-            image_format = data.get("image_format", "png")
-            image_id = data.get("image_id")
+        while True:
+            if site_ledger:
+                # Write out what finished while the previous page was downloading
+                site_ledger.flush()
+            
+            if self.progress_callback:
+                self.progress_callback(f"Fetching page {page}...")
+            
+            # Construct API URL (same as original)
+            api_url = f"https://furbooru.org/api/v1/json/search/images?q={formatted_tags}&page={page}&per_page=50{sort_params}"
+            if api_key:
+                api_url += f"&key={api_key}"
+            
+            # Prepare headers
+            headers = {
+                "User-Agent": "nn-downloader/2.0 (by Official-Husko on GitHub)"
+            }
+            
+            # Make API request (transient failures are retried before giving up)
+            data = await self.fetch_json(api_url, headers=headers)
+            if data is None:
+                print(f"Stopped at page {page}: listing request failed")
+                self.listing_failed = True
+                if sync:
+                    sync.interrupted()
+                break
+            
+            # Check if no images found (same as original)
+            if data.get("total", 0) == 0:
+                if self.progress_callback:
+                    self.progress_callback("No images found or all downloaded! Try different tags.")
+                print("No images found or all downloaded! Try different tags.")
+                break
+            
+            # Check max pages limit (same as original)
+            if max_pages and page >= max_pages:
+                if self.progress_callback:
+                    self.progress_callback(f"Finished downloading {max_pages} of {max_pages} pages.")
+                print(f"Finished downloading {max_pages} of {max_pages} pages.")
+                break
+            
+            images = data.get("images", [])
             
-            if not image_address or not image_id:
-                continue
+            # Stop once the listing runs past the last page
+            if not images:
+                break
             
-            # Download image file
-            file_path = main_dir / f"{image_id}.{image_format}"
-            progress_info = f"Furbooru - Image {image_id} ({i+1}/{total_images})"
+            # One indexed lookup for the whole page
+            already_downloaded = site_ledger.known(item["id"] for item in images) if site_ledger else set()
             
-            if await self.download_file(image_address, file_path, progress_info):
-                downloaded_count += 1
+            # Process images for this page
+            jobs = []
+            for item in images:
+                if sync:
+                    sync.saw(item["id"])
                 
-                # Update database file (same as original)
-                if db_file:
-                    db_path = Path("db")
-                    db_path.mkdir(exist_ok=True)
-                    db_file_path = db_path / "furbooru.db"
-                    try:
-                        with open(db_file_path, "a", encoding="utf-8") as db_writer:
-                            db_writer.write(f"{image_id}\n")
-                    except Exception as e:
-                        print(f"Error updating database: {e}")
+                # Skip hidden images (same as original)
+                if item.get("hidden_from_users", False):
+                    continue
+                
+                # Check blacklist (ratings are plain tags on Furbooru)
+                post_tags = frozenset(item.get("tags", []))
+                rating = next((tag for tag in post_tags if normalize_rating(tag)), None)
+                if blacklist.blocks(post_tags, rating, item.get("score")):
+                    continue
+                
+                image_id = str(item["id"])
+                image_address = item.get("representations", {}).get("full")
+                image_format = item.get("format", "png")
+                
+                if not image_address:
+                    continue
+                
+                # Skip if already downloaded (same logic as original)
+                if item["id"] in already_downloaded:
+                    continue
+                
+                if sync:
+                    sync.queued(image_id)
+                jobs.append(DownloadJob(
+                    url=image_address,
+                    file_path=main_dir / f"{image_id}.{image_format}",
+                    progress_info=f"Furbooru - Image {image_id} (page {page})",
+                    on_success=partial(self._mark_done, image_id, site_ledger, sync) if site_ledger or sync else None
+                ))
+            
+            if jobs:
+                main_dir.mkdir(parents=True, exist_ok=True)
+            # Empty pages are passed on too so the resume cursor keeps moving
+            yield JobPage(jobs, {"dir": str(main_dir), "page": page + 1})
             
             if self.progress_callback:
-                progress_percent = int(((i + 1) / total_images) * 100)
-                self.progress_callback(f"Downloaded {i+1}/{total_images} images ({progress_percent}%)")
-        
-        if self.progress_callback:
-            self.progress_callback(f"Downloaded {downloaded_count} images to {main_dir}")
-        
-        print(f"Downloaded {downloaded_count} images to {main_dir}")
+                self.progress_callback(f"Page {page} queued ({len(jobs)} images)")
+            print(f"Page {page} queued ({len(jobs)} images)")
+            
+            page += 1
 
 
 # Async context manager function for easy use
@@ -208,21 +211,32 @@ async def download_furbooru_tags(
     output_dir: Path = Path("media"),
     progress_callback: Optional[Callable] = None,
     proxy_list: Optional[List[str]] = None,
-    use_proxies: bool = False
+    use_proxies: bool = False,
+    max_workers: Optional[int] = None,
+    lookahead: Optional[int] = None,
+    session_manager: Optional[SessionManager] = None,
+    ledger: Optional[Ledger] = None,
+    incremental: bool = False,
+    resume: Optional[Dict[str, Any]] = None,
+    checkpoint_callback: Optional[Callable] = None,
+    event_callback: Optional[Callable] = None,
+    control: Optional[TaskControl] = None
 ) -> bool:
     """Download images by tags from Furbooru"""
-    async with FurbooruDownloader(progress_callback, proxy_list, use_proxies) as downloader:
+    async with FurbooruDownloader(progress_callback, proxy_list=proxy_list, use_proxies=use_proxies, max_workers=max_workers, lookahead=lookahead, session_manager=session_manager, ledger=ledger, checkpoint_callback=checkpoint_callback, event_callback=event_callback, control=control) as downloader:
         return await downloader.download_by_tags(
             tags=tags,
             blacklist=blacklist,
             max_pages=max_pages,
             api_key=api_key,
             db_file=db_file,
-            output_dir=output_dir
+            output_dir=output_dir,
+            incremental=incremental,
+            resume=resume
         )
 
 
 # NOTE FOR FUTURE: This FurbooruDownloader replicates the exact behavior
 # of the original modules/furbooru.py FURBOORU.fetcher method.
-# Same API calls, same blacklist filtering, same database tracking,
+# Same API calls, same blacklist filtering, same one-time-download tracking,
 # same directory structure, same tag formatting.
\ No newline at end of file
@@ -1,15 +1,18 @@
 """Async Luscious downloader - replicates original luscious.py functionality"""
 
-import asyncio
 import json
 from pathlib import Path
 from typing import Optional, Callable, Dict, Any, List
-from .base_async import BaseAsyncDownloader
+from core.control import TaskControl
+from core.http_session import SessionManager
+from .base_async import BaseAsyncDownloader, DownloadJob
 
 
 class LusciousDownloader(BaseAsyncDownloader):
     """Async downloader for Luscious - replicates original luscious.py"""
     
+    default_workers = 4
+    
     async def download_album(self, url: str, output_dir: Path = Path("media")) -> bool:
         """
         Download album from Luscious.
@@ -51,7 +54,7 @@ class LusciousDownloader(BaseAsyncDownloader):
             downloaded_count = 0
             page = 1
             
-            while True:
+            while not self.stop_requested:
                 if self.progress_callback:
                     self.progress_callback(f"Fetching page {page}...")
                 
@@ -112,6 +115,7 @@ class LusciousDownloader(BaseAsyncDownloader):
                         break
                     
                     # Download images from this page
+                    jobs = []
                     for item in picture_items:
                         image_id = item.get("id", "unknown")
                         image_title = item.get("title", f"image_{image_id}")
@@ -131,16 +135,13 @@ class LusciousDownloader(BaseAsyncDownloader):
                         if file_path.exists():
                             continue
                         
-                        # Download image
-                        progress_info = f"{title} - {image_title}"
-                        if await self.download_file(image_url, file_path, progress_info):
-                            downloaded_count += 1
-                        
-                        if self.progress_callback:
-                            self.progress_callback(f"Downloaded {downloaded_count} images from {title}")
-                        
-                        # Small delay to be respectful
-                        await asyncio.sleep(0.5)
+                        jobs.append(DownloadJob(image_url, file_path, f"{title} - {image_title}"))
+                    
+                    results = await self.download_many(jobs)
+                    downloaded_count += sum(results)
+                    
+                    if self.progress_callback:
+                        self.progress_callback(f"Downloaded {downloaded_count} images from {title}")
                     
                     page += 1
                     
@@ -167,10 +168,14 @@ async def download_luscious_album(
     output_dir: Path = Path("media"), 
     progress_callback: Optional[Callable] = None,
     proxy_list: Optional[List[str]] = None,
-    use_proxies: bool = False
+    use_proxies: bool = False,
+    max_workers: Optional[int] = None,
+    session_manager: Optional[SessionManager] = None,
+    event_callback: Optional[Callable] = None,
+    control: Optional[TaskControl] = None
 ) -> bool:
     """Download an album from Luscious"""
-    async with LusciousDownloader(progress_callback, proxy_list, use_proxies) as downloader:
+    async with LusciousDownloader(progress_callback, proxy_list=proxy_list, use_proxies=use_proxies, max_workers=max_workers, session_manager=session_manager, event_callback=event_callback, control=control) as downloader:
         return await downloader.download_album(url, output_dir)
 
 
@@ -1,16 +1,19 @@
 """Async Multporn downloader - replicates original multporn.py functionality exactly"""
 
-import asyncio
 import re
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Optional, Callable, List
-from .base_async import BaseAsyncDownloader
+from core.control import TaskControl
+from core.http_session import SessionManager
+from .base_async import BaseAsyncDownloader, DownloadJob
 
 
 class MultpornDownloader(BaseAsyncDownloader):
     """Async downloader for Multporn - replicates original multporn.py exactly"""
     
+    default_workers = 3
+    
     async def download_comic(self, url: str, output_dir: Path = Path("media")) -> bool:
         """Download comic from Multporn - replicates original Multporn.Fetcher exactly"""
         try:
@@ -82,15 +85,22 @@ class MultpornDownloader(BaseAsyncDownloader):
                 self.progress_callback("Fetching image list...")
             
             # Fetch XML content
-            async with self.session.get(juicebox_url) as response:
-                if response.status == 404:
-                    print("An error occurred! please report this to the dev")
-                    return False
-                elif response.status != 200:
-                    print(f"Failed to fetch juicebox XML: HTTP {response.status}")
-                    return False
-                
-                xml_content = await response.read()
+            async def fetch_juicebox() -> Optional[bytes]:
+                await self._throttle(juicebox_url)
+                async with self.session.get(juicebox_url) as response:
+                    if response.status == 404:
+                        print("An error occurred! please report this to the dev")
+                        return None
+                    elif response.status != 200:
+                        self.retry_policy.check_response(response)
+                        print(f"Failed to fetch juicebox XML: HTTP {response.status}")
+                        return None
+                    
+                    return await response.read()
+            
+            xml_content = await self._with_retries(juicebox_url, fetch_juicebox)
+            if xml_content is None:
+                return False
             
             # Parse XML to get image URLs (same as original structure)
             try:
@@ -119,7 +129,7 @@ class MultpornDownloader(BaseAsyncDownloader):
                 self.progress_callback(f"Downloading {len(images)} images from {title}")
             
             # Download images (same numbering as original: 1, 2, 3...)
-            downloaded = 0
+            jobs = []
             for i, image_url in enumerate(images, 1):
                 # Get file extension (same logic as original)
                 image_format = image_url.rpartition(".")[2] or "jpg"
@@ -129,17 +139,10 @@ class MultpornDownloader(BaseAsyncDownloader):
                 if file_path.exists():
                     continue
                 
-                progress_info = f"{title} - Image {i}/{len(images)}"
-                if await self.download_file(image_url, file_path, progress_info):
-                    downloaded += 1
-                
-                # Update progress
-                if self.progress_callback:
-                    progress = int((i / len(images)) * 100)
-                    self.progress_callback(f"Downloaded {i}/{len(images)} images ({progress}%)")
-                
-                # Small delay like original sleep(1)
-                await asyncio.sleep(1)
+                jobs.append(DownloadJob(image_url, file_path, f"{title} - Image {i}/{len(images)}"))
+            
+            results = await self.download_many(jobs)
+            downloaded = sum(results)
             
             if self.progress_callback:
                 self.progress_callback(f"Completed downloading {title}!")
@@ -161,10 +164,14 @@ async def download_multporn_comic(
     output_dir: Path = Path("media"), 
     progress_callback: Optional[Callable] = None,
     proxy_list: Optional[List[str]] = None,
-    use_proxies: bool = False
+    use_proxies: bool = False,
+    max_workers: Optional[int] = None,
+    session_manager: Optional[SessionManager] = None,
+    event_callback: Optional[Callable] = None,
+    control: Optional[TaskControl] = None
 ) -> bool:
     """Download a comic from Multporn"""
-    async with MultpornDownloader(progress_callback, proxy_list, use_proxies) as downloader:
+    async with MultpornDownloader(progress_callback, proxy_list=proxy_list, use_proxies=use_proxies, max_workers=max_workers, session_manager=session_manager, event_callback=event_callback, control=control) as downloader:
         return await downloader.download_comic(url, output_dir)
 
 
@@ -0,0 +1,58 @@
+"""Registry of supported sites; a site's downloader is only imported when it is used"""
+
+import importlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class Site:
+    """What a site takes as input and what its downloader can do"""
+    name: str
+    label: str  # shown in menus
+    kind: str  # 'tags' or 'url'
+    module: str  # downloader module, imported on first use
+    entry: str  # download function in that module
+    domain: Optional[str] = None  # URLs of a URL site are expected to contain this
+    example: str = ""  # sample input shown in prompts
+    needs_api_user: bool = False
+    needs_api_key: bool = False
+    max_tags: Optional[int] = None
+    incremental: bool = False  # can fetch only posts newer than the last run
+    resumable: bool = False  # hands out listing cursors to resume from
+    
+    def load(self) -> Callable:
+        """Import the downloader module and return its download function"""
+        return getattr(importlib.import_module(self.module), self.entry)
+
+
+def _e6(name: str, label: str) -> Site:
+    return Site(name, label, "tags", "downloaders.e621_async", "download_e621_tags",
+                example="fox rating:safe", needs_api_user=True, needs_api_key=True, max_tags=40,
+                incremental=True, resumable=True)
+
+
+# In menu order
+SITES: Dict[str, Site] = {site.name: site for site in [
+    _e6("e621", "E621"),
+    _e6("e6ai", "E6AI"),
+    _e6("e926", "E926"),
+    Site("rule34", "Rule34", "tags", "downloaders.rule34_async", "download_rule34_tags",
+         example="fox rating:safe", incremental=True, resumable=True),
+    Site("furbooru", "Furbooru", "tags", "downloaders.furbooru_async", "download_furbooru_tags",
+         example="fox, safe", needs_api_key=True, incremental=True, resumable=True),
+    Site("luscious", "Luscious", "url", "downloaders.luscious_async", "download_luscious_album",
+         domain="luscious.net", example="https://www.luscious.net/albums/bifurcation-ongoing_437722"),
+    Site("multporn", "Multporn", "url", "downloaders.multporn_async", "download_multporn_comic",
+         domain="multporn.net", example="https://multporn.net/comics/double_trouble_18"),
+    Site("yiffer", "Yiffer", "url", "downloaders.yiffer_async", "download_yiffer_comic",
+         domain="yiffer.xyz", example="https://yiffer.xyz/Howl & Jasper"),
+]}
+
+TAG_SITES: List[str] = [name for name, site in SITES.items() if site.kind == "tags"]
+URL_SITES: List[str] = [name for name, site in SITES.items() if site.kind == "url"]
+
+
+def get_site(name: str) -> Optional[Site]:
+    """Look a site up by name, case insensitive"""
+    return SITES.get(name.lower())
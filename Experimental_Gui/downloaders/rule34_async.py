@@ -1,16 +1,27 @@
 """Async Rule34 downloader"""
 
-import asyncio
+import json
+from functools import partial
 from pathlib import Path
-from typing import Optional, Callable, List
-from .base_async import BaseAsyncDownloader
+from typing import Optional, Callable, List, Dict, Any, AsyncIterator
+from core.blacklist import Blacklist
+from core.control import TaskControl
+from core.http_session import SessionManager
+from core.ledger import Ledger, QuerySync
+from .base_async import BaseAsyncDownloader, DownloadJob, JobPage
 
 
 class Rule34Downloader(BaseAsyncDownloader):
     """Async downloader for Rule34"""
     
-    async def download_by_tags(self, tags: str, max_pages: Optional[int] = None, output_dir: Path = Path("media")) -> bool:
-        """Download images by tags from Rule34"""
+    default_workers = 4
+    
+    async def download_by_tags(self, tags: str, max_pages: Optional[int] = None, output_dir: Path = Path("media"), db_file: Optional[str] = None, blacklist: Optional[List[str]] = None, incremental: bool = False, resume: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Download images by tags from Rule34, prefetching listing pages ahead of the download pool.
+        With incremental set only posts newer than the last run are fetched.
+        resume takes a cursor handed to checkpoint_callback by an earlier run.
+        """
         try:
             if self.progress_callback:
                 self.progress_callback("Starting Rule34 download...")
@@ -20,80 +31,129 @@ class Rule34Downloader(BaseAsyncDownloader):
             download_dir = output_dir / "rule34" / safe_tags
             download_dir.mkdir(parents=True, exist_ok=True)
             
-            downloaded_count = 0
-            page = 1
+            sync = self._get_ledger().sync("rule34", tags) if incremental else None
+            downloaded_count = await self.download_stream(self._iter_pages(tags, max_pages, download_dir, db_file, Blacklist(blacklist), sync, resume))
             
-            while True:
-                if max_pages and page > max_pages:
-                    break
-                
+            if self.stop_requested:
+                # Paused before the listing ended; the checkpoint says where to pick up
+                if sync:
+                    sync.interrupted()
                 if self.progress_callback:
-                    self.progress_callback(f"Fetching page {page}...")
-                
-                # Construct API URL (same as original)
-                api_url = f"https://api.rule34.xxx/index.php?page=dapi&s=post&q=index&pid={page}&limit=1000&json=1&tags={tags}"
-                
-                # Fetch page data
-                data = await self.fetch_json(api_url)
-                if not data:
-                    break
-                
-                if not isinstance(data, list) or len(data) == 0:
-                    if self.progress_callback:
-                        self.progress_callback("No more images found")
-                    break
-                
-                if self.progress_callback:
-                    self.progress_callback(f"Found {len(data)} images on page {page}")
-                
-                # Download images from this page
-                for i, item in enumerate(data):
-                    if "file_url" not in item or "id" not in item:
-                        continue
-                    
-                    image_url = item["file_url"]
-                    image_id = item["id"]
-                    
-                    # Get file extension from image name like original
-                    if "image" in item:
-                        image_name = item["image"]
-                        file_ext = image_name.split(".")[-1] if "." in image_name else "jpg"
-                    else:
-                        file_ext = image_url.split(".")[-1] if "." in image_url else "jpg"
-                    
-                    file_path = download_dir / f"{image_id}.{file_ext}"
-                    
-                    # Skip if already downloaded
-                    if file_path.exists():
-                        continue
-                    
-                    progress_info = f"Rule34 - Page {page} - Image {i + 1}/{len(data)}"
-                    if await self.download_file(image_url, file_path, progress_info):
-                        downloaded_count += 1
-                    
-                    if self.progress_callback:
-                        self.progress_callback(f"Downloaded {downloaded_count} images so far...")
-                    
-                    # Small delay to be respectful
-                    await asyncio.sleep(0.3)
-                
-                page += 1
-                
-                # Break if we didn't get a full page (likely the last page)
-                if len(data) < 1000:
-                    break
+                    self.progress_callback(f"Paused after {downloaded_count} images")
+            
+            if sync:
+                mark = sync.commit()
+                if mark is not None and self.progress_callback:
+                    self.progress_callback(f"Synced up to post {mark}")
             
             if self.progress_callback:
                 self.progress_callback(f"Download complete! {downloaded_count} images saved to {download_dir}")
             
             print(f"Downloaded {downloaded_count} images to {download_dir}")
-            return downloaded_count > 0
-            
+            # Nothing new is a successful sync, a listing that broke off is not
+            return not self.listing_failed and (downloaded_count > 0 or incremental)
+        
         except Exception as e:
             print(f"Error downloading from Rule34: {e}")
             if self.progress_callback:
                 self.progress_callback(f"Error: {e}")
             return False
+    
+    async def _iter_pages(self, tags: str, max_pages: Optional[int], download_dir: Path, db_file: Optional[str], blacklist: Blacklist, sync: Optional[QuerySync] = None, resume: Optional[Dict[str, Any]] = None) -> AsyncIterator[JobPage]:
+        """Fetch listing pages and yield the download jobs of each one"""
+        page = (resume or {}).get("page", 1)
+        
+        # A sync only asks for posts above its mark, oldest first
+        if sync and sync.since_id is not None:
+            tags = f"{tags} id:>{sync.since_id} sort:id:asc".strip()
+        
+        # Ledger of finished downloads if oneTimeDownload is enabled
+        site_ledger = self._get_ledger().site("rule34") if db_file else None
+        
+        while True:
+            if site_ledger:
+                # Write out what finished while the previous page was downloading
+                site_ledger.flush()
+            
+            if max_pages and page > max_pages:
+                break
+            
+            if self.progress_callback:
+                self.progress_callback(f"Fetching page {page}...")
+            
+            # Construct API URL (pid is zero based)
+            api_url = f"https://api.rule34.xxx/index.php?page=dapi&s=post&q=index&pid={page - 1}&limit=1000&json=1&tags={tags}"
+            
+            # Fetch page data as text: past the last page Rule34 answers with an
+            # empty body or [], which is the end of the listing, not a failure
+            body = await self.fetch_page(api_url)
+            data = None
+            if body is not None:
+                try:
+                    data = json.loads(body) if body.strip() else []
+                except ValueError:
+                    # An HTML error or ban page: posts past it were never listed
+                    pass
+            if not isinstance(data, list):
+                print(f"Stopped at page {page}: listing request failed")
+                self.listing_failed = True
+                if sync:
+                    sync.interrupted()
+                break
+            
+            if len(data) == 0:
+                if self.progress_callback:
+                    self.progress_callback("No more images found")
+                break
+            
+            if self.progress_callback:
+                self.progress_callback(f"Found {len(data)} images on page {page}")
+            
+            # One indexed lookup for the whole page
+            already_downloaded = site_ledger.known(item["id"] for item in data if "id" in item) if site_ledger else set()
+            
+            jobs = []
+            for i, item in enumerate(data):
+                if "file_url" not in item or "id" not in item:
+                    continue
+                
+                if sync:
+                    sync.saw(item["id"])
+                
+                # Check blacklist (tags come as one space separated string)
+                if blacklist and blacklist.blocks(item.get("tags", "").split(), item.get("rating"), item.get("score")):
+                    continue
+                
+                image_url = item["file_url"]
+                image_id = item["id"]
+                
+                # Get file extension from image name like original
+                if "image" in item:
+                    image_name = item["image"]
+                    file_ext = image_name.split(".")[-1] if "." in image_name else "jpg"
+                else:
+                    file_ext = image_url.split(".")[-1] if "." in image_url else "jpg"
+                
+                file_path = download_dir / f"{image_id}.{file_ext}"
+                
+                # Skip if already downloaded
+                if file_path.exists() or image_id in already_downloaded:
+                    continue
+                
+                progress_info = f"Rule34 - Page {page} - Image {i + 1}/{len(data)}"
+                if sync:
+                    sync.queued(image_id)
+                on_success = partial(self._mark_done, image_id, site_ledger, sync) if site_ledger or sync else None
+                jobs.append(DownloadJob(image_url, file_path, progress_info, on_success))
+            
+            # Empty pages are passed on too so the resume cursor keeps moving
+            yield JobPage(jobs, {"page": page + 1})
+            
+            page += 1
+            
+            # Break if we didn't get a full page (likely the last page)
+            if len(data) < 1000:
+                break
 
 
 # Async context manager function for easy use
@@ -105,8 +165,17 @@ async def download_rule34_tags(
     output_dir: Path = Path("media"), 
     progress_callback: Optional[Callable] = None,
     proxy_list: Optional[List[str]] = None,
-    use_proxies: bool = False
+    use_proxies: bool = False,
+    max_workers: Optional[int] = None,
+    lookahead: Optional[int] = None,
+    session_manager: Optional[SessionManager] = None,
+    ledger: Optional[Ledger] = None,
+    incremental: bool = False,
+    resume: Optional[Dict[str, Any]] = None,
+    checkpoint_callback: Optional[Callable] = None,
+    event_callback: Optional[Callable] = None,
+    control: Optional[TaskControl] = None
 ) -> bool:
     """Download images by tags from Rule34"""
-    async with Rule34Downloader(progress_callback, proxy_list, use_proxies) as downloader:
-        return await downloader.download_by_tags(tags, max_pages, output_dir)
\ No newline at end of file
+    async with Rule34Downloader(progress_callback, proxy_list=proxy_list, use_proxies=use_proxies, max_workers=max_workers, lookahead=lookahead, session_manager=session_manager, ledger=ledger, checkpoint_callback=checkpoint_callback, event_callback=event_callback, control=control) as downloader:
+        return await downloader.download_by_tags(tags, max_pages, output_dir, db_file, blacklist, incremental, resume)
\ No newline at end of file
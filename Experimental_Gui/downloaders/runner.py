@@ -0,0 +1,103 @@
+"""Shared entry point that runs one download job on the right downloader"""
+
+from pathlib import Path
+from typing import Optional, Callable, Dict, Any, List
+
+from core.control import TaskControl
+from core.http_session import SessionManager
+from core.ledger import Ledger
+from utils.config_manager_async import AsyncConfigManager
+from .registry import SITES
+
+
+async def run_download(
+    site: str,
+    config: Dict[str, Any],
+    tags: Optional[str] = None,
+    url: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    incremental: bool = False,
+    output_dir: Path = Path("media"),
+    progress_callback: Optional[Callable] = None,
+    session_manager: Optional[SessionManager] = None,
+    ledger: Optional[Ledger] = None,
+    resume: Optional[Dict[str, Any]] = None,
+    checkpoint_callback: Optional[Callable] = None,
+    event_callback: Optional[Callable] = None,
+    control: Optional[TaskControl] = None,
+    proxy_list: Optional[List[str]] = None
+) -> bool:
+    """
+    Run a tag or URL download with the settings from config.json.
+    Used by the GUI queue and the subscription daemon alike, so both share
+    credentials, blacklist, per-site pool sizes and the connection pool.
+    Tag downloads pass their listing cursor to checkpoint_callback as pages
+    finish; hand the last one back as resume to continue an interrupted crawl.
+    event_callback receives typed ProgressEvents (files, bytes, rate, ETA).
+    Pausing control makes the download stop after the files in flight.
+    proxy_list ("http://host:port" URLs) is used when proxies are enabled in config.
+    """
+    site_info = SITES.get(site)
+    if site_info is None:
+        print(f"Site not supported: {site}")
+        return False
+    
+    # Only the selected site's downloader is imported
+    download = site_info.load()
+    config_manager = AsyncConfigManager()
+    max_workers = config_manager.get_concurrent_downloads(config, site)
+    use_proxies = bool(proxy_list) and config_manager.is_proxies_enabled(config)
+    
+    if site_info.kind == "tags":
+        credentials = config_manager.get_api_credentials(config, site)
+        blacklist = config_manager.get_blacklisted_tags(config)
+        db_file = config_manager.is_one_time_download_enabled(config)
+        lookahead = config_manager.get_prefetch_pages(config, site)
+        common = dict(
+            tags=tags or "",
+            blacklist=blacklist,
+            max_pages=max_pages,
+            db_file=db_file,
+            output_dir=output_dir,
+            progress_callback=progress_callback,
+            proxy_list=proxy_list,
+            use_proxies=use_proxies,
+            max_workers=max_workers,
+            lookahead=lookahead,
+            session_manager=session_manager,
+            ledger=ledger,
+            incremental=incremental,
+            resume=resume,
+            checkpoint_callback=checkpoint_callback,
+            event_callback=event_callback,
+            control=control
+        )
+        
+        if site_info.needs_api_user:
+            # e621 family: one downloader for several hosts
+            return await download(
+                site=site,
+                api_user=credentials.get("api_user"),
+                api_key=credentials.get("api_key"),
+                ai_training=config_manager.is_ai_training_mode(config),
+                **common
+            )
+        elif site_info.needs_api_key:
+            return await download(api_key=credentials.get("api_key"), **common)
+        else:
+            return await download(**common)
+    
+    if not url:
+        print(f"No URL given for {site}")
+        return False
+    return await download(
+        url=url,
+        output_dir=output_dir,
+        progress_callback=progress_callback,
+        proxy_list=proxy_list,
+        use_proxies=use_proxies,
+        max_workers=max_workers,
+        session_manager=session_manager,
+        event_callback=event_callback,
+        control=control
+    )
@@ -1,15 +1,18 @@
 """Async Yiffer downloader - replicates original yiffer.py functionality"""
 
-import asyncio
 import urllib.parse
 from pathlib import Path
 from typing import Optional, Callable, List
-from .base_async import BaseAsyncDownloader
+from core.control import TaskControl
+from core.http_session import SessionManager
+from .base_async import BaseAsyncDownloader, DownloadJob
 
 
 class YifferDownloader(BaseAsyncDownloader):
     """Async downloader for Yiffer - replicates original yiffer.py"""
     
+    default_workers = 3
+    
     async def download_comic(self, url: str, output_dir: Path = Path("media")) -> bool:
         """Download comic from Yiffer - replicates original Yiffer.Fetcher exactly"""
         try:
@@ -44,9 +47,8 @@ class YifferDownloader(BaseAsyncDownloader):
             if self.progress_callback:
                 self.progress_callback(f"Downloading {pages} pages from {title}")
             
-            downloaded_count = 0
-            
             # Download all images (same logic as original)
+            jobs = []
             for page_num in range(1, pages + 1):
                 # Format page number same as original
                 if page_num <= 9:
@@ -64,16 +66,10 @@ class YifferDownloader(BaseAsyncDownloader):
                 if file_path.exists():
                     continue
                 
-                progress_info = f"{title} - Page {page_num}/{pages}"
-                if await self.download_file(image_url, file_path, progress_info):
-                    downloaded_count += 1
-                
-                if self.progress_callback:
-                    progress_percent = int((page_num / pages) * 100)
-                    self.progress_callback(f"Downloaded {page_num}/{pages} pages ({progress_percent}%)")
-                
-                # Small delay (matches original sleep(1))
-                await asyncio.sleep(0.5)
+                jobs.append(DownloadJob(image_url, file_path, f"{title} - Page {page_num}/{pages}"))
+            
+            results = await self.download_many(jobs, label="pages")
+            downloaded_count = sum(results)
             
             if self.progress_callback:
                 self.progress_callback(f"Download complete! {downloaded_count} pages saved to {comic_dir}")
@@ -94,10 +90,14 @@ async def download_yiffer_comic(
     output_dir: Path = Path("media"), 
     progress_callback: Optional[Callable] = None,
     proxy_list: Optional[List[str]] = None,
-    use_proxies: bool = False
+    use_proxies: bool = False,
+    max_workers: Optional[int] = None,
+    session_manager: Optional[SessionManager] = None,
+    event_callback: Optional[Callable] = None,
+    control: Optional[TaskControl] = None
 ) -> bool:
     """Download a comic from Yiffer"""
-    async with YifferDownloader(progress_callback, proxy_list, use_proxies) as downloader:
+    async with YifferDownloader(progress_callback, proxy_list=proxy_list, use_proxies=use_proxies, max_workers=max_workers, session_manager=session_manager, event_callback=event_callback, control=control) as downloader:
         return await downloader.download_comic(url, output_dir)
 
 
@@ -0,0 +1,211 @@
+"""Download engine hosted in a child process, driven by the GUI over a pipe and a queue"""
+
+import asyncio
+import multiprocessing
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Commands (GUI -> engine) go over a pipe so the engine sees EOF if the GUI dies;
+# events (engine -> GUI) go over a queue whose feeder thread never blocks the engine.
+#
+# Commands:  ("start", task_dict, cursor)  ("pause", task_id)  ("cancel", task_id)
+#            ("shutdown",)
+# Events:    ("ready",)  ("error", message)
+#            ("progress", task_id, message)  ("event", task_id, ProgressEvent)
+#            ("checkpoint", task_id, cursor)  ("done", task_id, success, error)
+
+# Upper bound on events read per GUI refresh
+MAX_EVENTS_PER_POLL = 5000
+
+
+def _engine_main(commands, events) -> None:
+    """Child process entry point"""
+    try:
+        asyncio.run(_EngineHost(commands, events).run())
+    except KeyboardInterrupt:
+        pass
+
+
+class _EngineHost:
+    """Owns config, the connection pool and the ledger inside the child process"""
+    
+    def __init__(self, commands, events):
+        self.commands = commands
+        self.events = events
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.controls: Dict[str, Any] = {}
+        self.config: Dict[str, Any] = {}
+        self.session_manager = None
+        self.ledger = None
+        self._stopped: Optional[asyncio.Event] = None
+    
+    async def run(self) -> None:
+        from core.http_session import SessionManager
+        from core.ledger import Ledger
+        from utils.config_manager_async import AsyncConfigManager
+        
+        self._stopped = asyncio.Event()
+        try:
+            self.config = await AsyncConfigManager().load_config()
+            self.session_manager = SessionManager.from_config(self.config)
+            self.ledger = Ledger()
+        except Exception as e:
+            self.events.put(("error", f"Engine failed to start: {e}"))
+            return
+        
+        loop = asyncio.get_running_loop()
+        threading.Thread(target=self._read_commands, args=(loop,), daemon=True).start()
+        self.events.put(("ready",))
+        
+        try:
+            await self._stopped.wait()
+        finally:
+            for task in self.tasks.values():
+                task.cancel()
+            await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+            await self.session_manager.close()
+            self.ledger.close()
+    
+    def _read_commands(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Blocking pipe reader; EOF means the GUI is gone"""
+        while True:
+            try:
+                command = self.commands.recv()
+            except (EOFError, OSError):
+                command = ("shutdown",)
+            loop.call_soon_threadsafe(self._handle, command)
+            if command[0] == "shutdown":
+                return
+    
+    def _handle(self, command: Tuple) -> None:
+        from core.control import TaskControl
+        
+        if command[0] == "start":
+            task_data, cursor = command[1], command[2]
+            task_id = task_data["task_id"]
+            self.controls[task_id] = TaskControl()
+            self.tasks[task_id] = asyncio.create_task(self._run_task(task_data, cursor))
+        elif command[0] == "pause":
+            if command[1] in self.controls:
+                self.controls[command[1]].pause()
+        elif command[0] == "cancel":
+            if command[1] in self.tasks:
+                self.tasks[command[1]].cancel()
+        elif command[0] == "shutdown":
+            self._stopped.set()
+    
+    async def _run_task(self, task: Dict[str, Any], cursor: Optional[Dict[str, Any]]) -> None:
+        from downloaders.runner import run_download
+        
+        task_id = task["task_id"]
+        put = self.events.put
+        try:
+            result = await run_download(
+                task["site"],
+                self.config,
+                tags=task.get("tags"),
+                url=task.get("url"),
+                max_pages=task.get("max_pages"),
+                incremental=task.get("incremental", False),
+                progress_callback=lambda message: put(("progress", task_id, message)),
+                session_manager=self.session_manager,
+                ledger=self.ledger,
+                resume=cursor,
+                checkpoint_callback=lambda new_cursor: put(("checkpoint", task_id, new_cursor)),
+                event_callback=lambda event: put(("event", task_id, event)),
+                control=self.controls[task_id]
+            )
+            put(("done", task_id, bool(result), None))
+        except asyncio.CancelledError:
+            put(("done", task_id, False, None))
+            raise
+        except Exception as e:
+            put(("done", task_id, False, str(e)))
+        finally:
+            self.tasks.pop(task_id, None)
+            self.controls.pop(task_id, None)
+
+
+class EngineProcess:
+    """
+    GUI side handle of the child process engine.
+    The child loads config.json, opens its own connection pool and ledger
+    and runs tasks it is sent; the GUI reads events back with poll() on its
+    refresh timer. Neither side can stall the other: a busy or hung GUI only
+    lets events pile up in the queue, and a dead engine is noticed with alive.
+    """
+    
+    def __init__(self):
+        # spawn everywhere: forking a process that runs Tk and threads is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._commands = None
+        self._events = None
+        self._process = None
+    
+    def start(self) -> None:
+        parent_end, child_end = self._context.Pipe()
+        self._events = self._context.Queue()
+        self._process = self._context.Process(target=_engine_main, args=(child_end, self._events), name="nn-downloader-engine", daemon=True)
+        self._process.start()
+        child_end.close()
+        self._commands = parent_end
+    
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+    
+    @property
+    def exitcode(self) -> Optional[int]:
+        """Exit code of the engine process, None while it runs or before it started"""
+        return self._process.exitcode if self._process is not None else None
+    
+    def submit(self, task_data: Dict[str, Any], cursor: Optional[Dict[str, Any]] = None) -> bool:
+        """Send a task to the engine; False if the engine is not running"""
+        return self._send(("start", task_data, cursor))
+    
+    def pause(self, task_id: str) -> bool:
+        """Let a task finish its files in flight and stop"""
+        return self._send(("pause", task_id))
+    
+    def cancel(self, task_id: str) -> bool:
+        """Abort a task's transfers now; partial files are kept"""
+        return self._send(("cancel", task_id))
+    
+    def _send(self, command: Tuple) -> bool:
+        if not self.alive:
+            return False
+        try:
+            self._commands.send(command)
+            return True
+        except (OSError, ValueError) as e:
+            print(f"Could not reach download engine: {e}")
+            return False
+    
+    def poll(self) -> List[Tuple]:
+        """Events received since the last poll, without blocking"""
+        received = []
+        if self._events is None:
+            return received
+        for _ in range(MAX_EVENTS_PER_POLL):
+            try:
+                received.append(self._events.get_nowait())
+            except queue.Empty:
+                break
+            except (OSError, ValueError, EOFError):
+                break
+        return received
+    
+    def stop(self, timeout: float = 5) -> None:
+        """Ask the engine to finish up, killing it if it does not exit in time"""
+        if self._process is None:
+            return
+        self._send(("shutdown",))
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(1)
+        if self._commands is not None:
+            self._commands.close()
+        self._process = None
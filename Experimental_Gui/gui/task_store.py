@@ -0,0 +1,104 @@
+"""Ordered store for queued download tasks"""
+
+from collections import deque
+from itertools import count
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+class TaskStore:
+    """
+    Queued tasks kept in one deque per priority plus dicts keyed by task_id
+    and by the task's unique key. Adding, duplicate checks and removal are
+    O(1); removed entries are left in their deque and skipped when reached,
+    and the deques are compacted once dead entries outnumber live ones.
+    Each entry carries the sequence number it was added with, so an id that
+    is removed and added again only counts at its new position.
+    Tasks need task_id, priority and get_unique_key().
+    """
+    
+    def __init__(self):
+        self._tasks: Dict[str, object] = {}
+        self._keys: Dict[str, str] = {}
+        self._seqs: Dict[str, int] = {}
+        self._order: Dict[int, Deque[Tuple[int, str]]] = {}
+        self._counter = count()
+        self._dead = 0
+    
+    def __len__(self) -> int:
+        return len(self._tasks)
+    
+    def __bool__(self) -> bool:
+        return bool(self._tasks)
+    
+    def __iter__(self) -> Iterator:
+        """Live tasks in run order: highest priority first, oldest first within a priority"""
+        for priority in sorted(self._order, reverse=True):
+            for entry in self._order[priority]:
+                if self._live(entry):
+                    yield self._tasks[entry[1]]
+    
+    def get(self, task_id: str):
+        return self._tasks.get(task_id)
+    
+    def has_key(self, unique_key: str) -> bool:
+        return unique_key in self._keys
+    
+    def add(self, task) -> bool:
+        """Append a task; False if an equal task is already queued"""
+        key = task.get_unique_key()
+        if key in self._keys:
+            return False
+        seq = next(self._counter)
+        self._tasks[task.task_id] = task
+        self._keys[key] = task.task_id
+        self._seqs[task.task_id] = seq
+        self._order.setdefault(task.priority, deque()).append((seq, task.task_id))
+        return True
+    
+    def remove(self, task_id: str):
+        """Drop a task by id and return it, None if it is not queued"""
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return None
+        self._keys.pop(task.get_unique_key(), None)
+        self._seqs.pop(task_id, None)
+        self._dead += 1
+        if self._dead > len(self._tasks):
+            self._compact()
+        return task
+    
+    def pop_next(self, can_start: Callable[[object], bool]) -> Optional[object]:
+        """Remove and return the first task in run order that can_start accepts"""
+        for priority in sorted(self._order, reverse=True):
+            entries = self._order[priority]
+            # Clear out removed entries at the front first
+            while entries and not self._live(entries[0]):
+                entries.popleft()
+                self._dead -= 1
+            for entry in entries:
+                if self._live(entry) and can_start(self._tasks[entry[1]]):
+                    return self.remove(entry[1])
+        return None
+    
+    def clear(self) -> List:
+        """Empty the store and return what was queued"""
+        tasks = list(self)
+        self._tasks.clear()
+        self._keys.clear()
+        self._seqs.clear()
+        self._order.clear()
+        self._dead = 0
+        return tasks
+    
+    def _compact(self) -> None:
+        for priority in list(self._order):
+            live = deque(entry for entry in self._order[priority] if self._live(entry))
+            if live:
+                self._order[priority] = live
+            else:
+                del self._order[priority]
+        self._dead = 0
+    
+    def _live(self, entry: Tuple[int, str]) -> bool:
+        """Whether a deque entry is the current position of a queued task"""
+        return self._seqs.get(entry[1]) == entry[0]
@@ -5,14 +5,36 @@ from tkinter import ttk, messagebox, scrolledtext
 import asyncio
 import threading
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import uuid
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
+
+from downloaders.registry import SITES, TAG_SITES, URL_SITES
+from gui.task_store import TaskStore
+import re
 import queue
 
 
+# Queue priority choices shown in the GUI, higher runs first
+PRIORITIES = {"High": 1, "Normal": 0, "Low": -1}
+
+# How often queued log, status and progress updates are drawn
+UI_REFRESH_MS = 100
+# Upper bound on events handled in one refresh so a flood can't stall Tk
+MAX_EVENTS_PER_REFRESH = 5000
+DEFAULT_LOG_LINES = 2000
+
+# Restarts of a crashed engine process before giving up; the wait doubles after each
+ENGINE_MAX_RESTARTS = 5
+ENGINE_RESTART_DELAY_MS = 500
+ENGINE_MAX_RESTART_DELAY_MS = 30000
+
+# Queue row label of a running task by its status
+ACTIVE_LABELS = {'downloading': "🟢 DOWNLOADING", 'pausing': "🟡 PAUSING", 'cancelling': "🔴 CANCELLING"}
+
+
 @dataclass
 class DownloadTask:
     """Represents a download task in the queue"""
@@ -22,13 +44,22 @@ class DownloadTask:
     url: Optional[str] = None
     tags: Optional[str] = None
     max_pages: Optional[int] = None
-    status: str = 'pending'  # pending, downloading, completed, failed
+    incremental: bool = False  # only posts newer than the last run of this query
+    priority: int = 0  # see PRIORITIES
+    status: str = 'pending'  # pending, downloading, pausing, paused, cancelling, cancelled, completed, failed
+    progress: str = ''  # latest progress message while downloading
+    stats: Optional[Any] = None  # latest ProgressEvent while downloading
+    cursor: Optional[Dict[str, Any]] = None  # where an interrupted listing resumes
     
     def __str__(self):
         if self.task_type == 'url':
-            return f"{self.site}: {self.url}"
+            text = f"{self.site}: {self.url}"
         else:
-            return f"{self.site}: {self.tags} ({self.max_pages or 'unlimited'} pages)"
+            mode = ", new only" if self.incremental else ""
+            text = f"{self.site}: {self.tags} ({self.max_pages or 'unlimited'} pages{mode})"
+        if self.priority:
+            text += f" [{'high' if self.priority > 0 else 'low'} priority]"
+        return text
     
     def get_unique_key(self) -> str:
         """Get a unique key for duplicate detection"""
@@ -39,7 +70,34 @@ class DownloadTask:
         else:
             # For tags, include site, tags, and max_pages
             tags_normalized = self.tags.lower().strip() if self.tags else ""
-            return f"{self.site}|tags|{tags_normalized}|{self.max_pages or 'unlimited'}"
+            return f"{self.site}|tags|{tags_normalized}|{self.max_pages or 'unlimited'}|{'new' if self.incremental else 'all'}"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Fields needed to rebuild the task from the queue journal"""
+        return {
+            "task_id": self.task_id,
+            "site": self.site,
+            "task_type": self.task_type,
+            "url": self.url,
+            "tags": self.tags,
+            "max_pages": self.max_pages,
+            "incremental": self.incremental,
+            "priority": self.priority
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], cursor: Optional[Dict[str, Any]] = None) -> "DownloadTask":
+        return cls(
+            task_id=data["task_id"],
+            site=data["site"],
+            task_type=data["task_type"],
+            url=data.get("url"),
+            tags=data.get("tags"),
+            max_pages=data.get("max_pages"),
+            incremental=data.get("incremental", False),
+            priority=data.get("priority", 0),
+            cursor=cursor
+        )
     
     def __eq__(self, other):
         """Check equality based on unique key"""
@@ -57,12 +115,14 @@ try:
     import aiohttp
     import aiofiles
     # If basic deps are available, try to import our async components
-    from downloaders import (
-        download_multporn_comic, download_luscious_album, download_yiffer_comic,
-        download_rule34_tags, download_e621_tags, download_furbooru_tags
-    )
+    from downloaders.runner import run_download
     from utils.config_manager_async import AsyncConfigManager
     from utils.directory_manager_async import AsyncDirectoryManager
+    from core.http_session import SessionManager
+    from core.ledger import Ledger
+    from core.journal import TaskJournal
+    from core.control import TaskControl
+    from gui.engine_process import EngineProcess
     HAS_ASYNC_DEPS = True
     print("✅ Async dependencies loaded successfully")
 except ImportError as e:
@@ -105,14 +165,34 @@ class TkinterApp:
             "user_credentials": {}
         }
         self.directory_manager = None
+        # Shared HTTP connection pool, owned by the async loop thread
+        self.session_manager = None
+        # Download ledger shared by every tag download
+        self.ledger = None
+        # On-disk copy of the queue, reloaded on the next start
+        self.journal = None
+        # Child process running the downloads when gui.engine_process is set
+        self.engine = None
+        self._closing = False
+        # Crashes since the engine last came up, its last reported error, and the restart state
+        self._engine_failures = 0
+        self._engine_error: Optional[str] = None
+        self._engine_restarting = False
+        self._engine_failed = False
         
         # Active sessions
         self.sessions: Dict[str, Any] = {}
         
         # Download queue system
-        self.download_queue = queue.Queue()
-        self.is_downloading = False
-        self.current_download_info = None
+        self.download_queue = TaskStore()
+        # Running tasks by task_id, in the order they started
+        self.active_tasks: Dict[str, DownloadTask] = {}
+        # Paused tasks by task_id, kept out of the queue until resumed
+        self.paused_tasks: Dict[str, DownloadTask] = {}
+        # (future, TaskControl) of each task running on the in-process loop
+        self._handles: Dict[str, Tuple[Any, Any]] = {}
+        # Task shown in each listbox row, in row order
+        self._row_tasks: List[DownloadTask] = []
         
         # Event loop for async operations
         self.loop = None
@@ -123,6 +203,8 @@ class TkinterApp:
         self.tags_var = tk.StringVar()
         self.url_var = tk.StringVar()
         self.max_pages_var = tk.StringVar()
+        self.incremental_var = tk.BooleanVar(value=False)
+        self.priority_var = tk.StringVar(value="Normal")
         self.api_site_var = tk.StringVar(value="e621")
         self.api_user_var = tk.StringVar()
         self.api_key_var = tk.StringVar()
@@ -135,8 +217,13 @@ class TkinterApp:
         self.progress_var = tk.DoubleVar()
         self.status_text = tk.StringVar(value="Ready")
         
+        # Log, status, progress and result updates from any thread, handled in batches
+        self.ui_events: queue.Queue = queue.Queue()
+        self.log_max_lines = DEFAULT_LOG_LINES
+        
         # Setup GUI
         self.setup_gui()
+        self.root.after(UI_REFRESH_MS, self._drain_ui_events)
         
         # Initialize async components
         self._start_async_loop()
@@ -147,7 +234,7 @@ class TkinterApp:
             self.add_log("⚠️  Running in demo mode - install dependencies for full functionality")
             self.add_log("   pip install aiohttp aiofiles")
             return
-            
+        
         def run_loop():
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
@@ -158,12 +245,20 @@ class TkinterApp:
                     self.config_manager = AsyncConfigManager()
                     self.config = await self.config_manager.load_config()
                     self.directory_manager = AsyncDirectoryManager()
+                    self.journal = TaskJournal()
+                    self.log_max_lines = self.config_manager.get_log_max_lines(self.config)
+                    if self.config_manager.is_engine_process_enabled(self.config):
+                        # Pool and ledger live in the engine process instead
+                        self._post_call(self._start_engine)
+                    else:
+                        self.session_manager = SessionManager.from_config(self.config)
+                        self.ledger = Ledger()
                     
-                    # Update status on main thread
-                    self.root.after(0, lambda: self.status_text.set("Ready - All components loaded"))
-                    self.root.after(0, lambda: self.add_log("✅ Async components loaded"))
+                    self.set_status("Ready - All components loaded")
+                    self.add_log("✅ Async components loaded")
+                    self._post_call(self._restore_queue)
                 except Exception as e:
-                    self.root.after(0, lambda: self.add_log(f"⚠️  Config error: {e}"))
+                    self.add_log(f"⚠️  Config error: {e}")
             
             self.loop.run_until_complete(init_components())
             self.loop.run_forever()
@@ -252,7 +347,7 @@ class TkinterApp:
         # Improved description
         explanation = tk.Label(header_frame, 
                               text="Professional media downloader for art communities\n" +
-                                   "🏷️ Tag-based: e621, e6ai, e926, rule34, furbooru  |  🔗 URL-based: luscious, multporn, yiffer",
+                                   f"🏷️ Tag-based: {', '.join(TAG_SITES)}  |  🔗 URL-based: {', '.join(URL_SITES)}",
                               font=('Segoe UI', 10), 
                               bg=self.colors['bg_primary'], 
                               fg=self.colors['text_secondary'], 
@@ -272,7 +367,7 @@ class TkinterApp:
         site_label = ttk.Label(download_frame, text="🌐 Select Site:", font=('Segoe UI', 10, 'bold'))
         site_label.grid(row=0, column=0, sticky=tk.W, padx=(0, 15), pady=(5, 5))
         site_combo = ttk.Combobox(download_frame, textvariable=self.site_var, 
-                                 values=["e621", "e6ai", "e926", "rule34", "furbooru", "luscious", "multporn", "yiffer"],
+                                 values=list(SITES),
                                  state="readonly", style="Modern.TCombobox", font=('Segoe UI', 10))
         site_combo.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=(5, 5))
         site_combo.bind('<<ComboboxSelected>>', self.on_site_change)
@@ -282,9 +377,16 @@ class TkinterApp:
         self.input_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(15, 15))
         self.input_frame.columnconfigure(1, weight=1)
         
+        # Queue priority
+        ttk.Label(download_frame, text="⚡ Priority:", font=('Segoe UI', 10, 'bold')).grid(row=2, column=0, sticky=tk.W, padx=(0, 15), pady=(5, 5))
+        priority_combo = ttk.Combobox(download_frame, textvariable=self.priority_var,
+                                     values=list(PRIORITIES), state="readonly",
+                                     style="Modern.TCombobox", font=('Segoe UI', 10), width=10)
+        priority_combo.grid(row=2, column=1, sticky=tk.W, pady=(5, 5))
+        
         # Download buttons with modern styling
         button_frame = ttk.Frame(download_frame)
-        button_frame.grid(row=2, column=0, columnspan=2, pady=(10, 5))
+        button_frame.grid(row=3, column=0, columnspan=2, pady=(10, 5))
         button_frame.columnconfigure(0, weight=1)
         button_frame.columnconfigure(1, weight=1)
         
@@ -321,13 +423,14 @@ class TkinterApp:
         
         # API Site selection
         ttk.Label(cred_frame, text="Site:", font=('Segoe UI', 10, 'bold')).grid(row=0, column=0, sticky=tk.W, padx=(0, 15), pady=(5, 5))
+        api_sites = [name for name, info in SITES.items() if info.needs_api_key]
         api_site_combo = ttk.Combobox(cred_frame, textvariable=self.api_site_var,
-                                     values=["e621", "e6ai", "e926", "furbooru"],
+                                     values=api_sites,
                                      state="readonly", style="Modern.TCombobox", font=('Segoe UI', 10))
         api_site_combo.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=(5, 5))
         
         # API help text with better styling
-        api_help = tk.Label(cred_frame, text="💡 Only required for e621/e6ai/e926/furbooru sites", 
+        api_help = tk.Label(cred_frame, text=f"💡 Only required for {'/'.join(api_sites)} sites", 
                            font=('Segoe UI', 9), fg=self.colors['text_muted'], bg=self.colors['bg_primary'])
         api_help.grid(row=1, column=1, sticky=tk.W, pady=(0, 10))
         
@@ -380,7 +483,19 @@ class TkinterApp:
         
         remove_selected_btn = ttk.Button(queue_btn_frame, text="✖️ Remove Selected", 
                                         command=self.remove_selected_from_queue)
-        remove_selected_btn.grid(row=0, column=1)
+        remove_selected_btn.grid(row=0, column=1, padx=(0, 10))
+        
+        pause_btn = ttk.Button(queue_btn_frame, text="⏸️ Pause", 
+                              command=self.pause_selected)
+        pause_btn.grid(row=0, column=2, padx=(0, 10))
+        
+        resume_btn = ttk.Button(queue_btn_frame, text="▶️ Resume", 
+                               command=self.resume_selected)
+        resume_btn.grid(row=0, column=3, padx=(0, 10))
+        
+        cancel_btn = ttk.Button(queue_btn_frame, text="⛔ Cancel", 
+                               command=self.cancel_selected)
+        cancel_btn.grid(row=0, column=4)
         
         # Log section with modern styling
         log_frame = ttk.LabelFrame(main_frame, text="📝 Activity Log", padding="15")
@@ -427,24 +542,17 @@ class TkinterApp:
         
         site = self.site_var.get()
         
-        if site in ["luscious", "multporn", "yiffer"]:
+        if SITES[site].kind == "url":
             # URL-based sites
             ttk.Label(self.input_frame, text="🔗 URL:", font=('Segoe UI', 10, 'bold')).grid(row=0, column=0, sticky=tk.W, padx=(0, 15), pady=(5, 5))
             url_entry = ttk.Entry(self.input_frame, textvariable=self.url_var, style="Modern.TEntry", font=('Segoe UI', 10))
             url_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=(5, 5), ipady=3)
             
             # URL help text
-            if site == "luscious":
-                example = "https://www.luscious.net/albums/album-name_123456"
-            elif site == "multporn":
-                example = "https://multporn.net/comics/comic-name"
-            else:  # yiffer
-                example = "https://yiffer.xyz/Comic Name"
-            
-            help_text = tk.Label(self.input_frame, text=f"💡 Example: {example}", 
+            help_text = tk.Label(self.input_frame, text=f"💡 Example: {SITES[site].example}", 
                                font=('Segoe UI', 9), fg=self.colors['text_muted'], bg=self.colors['bg_primary'])
             help_text.grid(row=1, column=1, sticky=tk.W, pady=(0, 10))
-            
+        
         else:
             # Tag-based sites
             ttk.Label(self.input_frame, text="🏷️ Search Tags:", font=('Segoe UI', 10, 'bold')).grid(row=0, column=0, sticky=tk.W, padx=(0, 15), pady=(5, 5))
@@ -463,39 +571,126 @@ class TkinterApp:
             
             # Pages help text
             if site in ["e621", "e6ai", "e926"]:
-                pages_help_text = "⚠️ Leave empty for max (API limit: 750 pages)"
+                pages_help_text = "⚠️ Leave empty for max (750 page limit only applies to order: searches)"
             else:
                 pages_help_text = "⚠️ Leave empty for unlimited (be careful!)"
             
             pages_help = tk.Label(self.input_frame, text=pages_help_text, 
                                 font=('Segoe UI', 9), fg=self.colors['warning'], bg=self.colors['bg_primary'])
             pages_help.grid(row=3, column=1, sticky=tk.W, pady=(0, 5))
+            
+            # Incremental sync for saved queries
+            sync_check = ttk.Checkbutton(self.input_frame, text="🔁 Only new posts since last run (stable folder per query)", variable=self.incremental_var)
+            sync_check.grid(row=4, column=1, sticky=tk.W, pady=(5, 5))
     
     def add_log(self, message: str):
-        """Add a message to the log"""
+        """Add a message to the log (safe from any thread, drawn on the next refresh)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
+        self.ui_events.put(("log", f"[{timestamp}] {message}\n"))
+    
+    def set_status(self, message: str):
+        """Set the status line (safe from any thread, drawn on the next refresh)"""
+        self.ui_events.put(("status", message))
+    
+    def _post_progress(self, task: "DownloadTask", message: str):
+        """Report a task's progress (safe from any thread, only the latest per task is drawn)"""
+        self.ui_events.put(("progress", task, message))
+    
+    def _post_event(self, task: "DownloadTask", event):
+        """Report a task's ProgressEvent (safe from any thread, only the latest per task is drawn)"""
+        self.ui_events.put(("event", task, event))
+    
+    def _post_call(self, callback: Callable[[], None]):
+        """Run callback on the Tk thread at the next refresh (safe from any thread, in order)"""
+        self.ui_events.put(("call", callback))
+    
+    def _drain_ui_events(self):
+        """Draw everything queued since the last refresh in one go, then schedule the next"""
+        if self.engine:
+            self._poll_engine()
+        lines = []
+        status = None
+        progress: Dict[str, Any] = {}
+        stats: Dict[str, Any] = {}
+        calls = []
+        for _ in range(MAX_EVENTS_PER_REFRESH):
+            try:
+                event = self.ui_events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "log":
+                lines.append(event[1])
+            elif event[0] == "status":
+                status = event[1]
+            elif event[0] == "event":
+                stats[event[1].task_id] = event[1:]
+            elif event[0] == "call":
+                calls.append(event[1])
+            else:
+                progress[event[1].task_id] = event[1:]
+        
+        try:
+            if lines:
+                self._append_log_lines(lines)
+            for task, event in stats.values():
+                task.stats = event
+            for task, message in progress.values():
+                self._update_task_progress(task, message)
+            if stats:
+                for task, _ in stats.values():
+                    if task.task_id not in progress:
+                        self._update_task_progress(task, task.progress)
+                self._update_overall_progress()
+            if status is not None:
+                self.status_text.set(status)
+            # Results and dialogs from the loop thread, after the progress they follow
+            for callback in calls:
+                callback()
+        finally:
+            self.root.after(UI_REFRESH_MS, self._drain_ui_events)
+    
+    def _append_log_lines(self, lines: List[str]):
+        """Insert log lines with one call and drop the oldest beyond log_max_lines"""
+        lines = lines[-self.log_max_lines:]
+        self.log_text.insert(tk.END, "".join(lines))
+        line_count = int(self.log_text.index("end-1c").split(".")[0]) - 1
+        excess = line_count - self.log_max_lines
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
         self.log_text.see(tk.END)
-        self.root.update_idletasks()
     
-    def add_to_queue(self):
-        """Add current input to download queue"""
-        task = self._create_download_task()
-        if task:
+    def add_to_queue(self, tasks: Optional[List[DownloadTask]] = None):
+        """Add current input (or the given tasks) to download queue"""
+        if tasks is None:
+            tasks = self._create_download_tasks()
+        if not tasks:
+            return
+        
+        added = []
+        duplicates = []
+        for task in tasks:
             # Check for duplicates
-            if self._is_duplicate_task(task):
+            if self._is_duplicate_task(task) or not self.download_queue.add(task):
+                duplicates.append(task)
+            else:
+                added.append(task)
+        if self.journal and added:
+            self.journal.add([task.to_dict() for task in added])
+        
+        if len(tasks) == 1:
+            if duplicates:
                 messagebox.showwarning("Duplicate Download", 
-                    f"This download is already in the queue or currently downloading:\n\n{task}")
-                self.add_log(f"⚠️ Duplicate detected, not adding: {task}")
+                    f"This download is already in the queue or currently downloading:\n\n{tasks[0]}")
+                self.add_log(f"⚠️ Duplicate detected, not adding: {tasks[0]}")
                 return
-            
-            self.download_queue.put(task)
-            self.add_log(f"➕ Added to queue: {task}")
-            self.update_queue_display()
-            
-            # Start processing queue if not already downloading
-            if not self.is_downloading:
-                self._process_next_in_queue()
+            self.add_log(f"➕ Added to queue: {tasks[0]}")
+        else:
+            self.add_log(f"➕ Added {len(added)} downloads to queue" +
+                         (f" ({len(duplicates)} duplicates skipped)" if duplicates else ""))
+        
+        # Start what fits in the free slots, then redraw once
+        self._process_next_in_queue()
+        self.update_queue_display()
     
     def start_download(self):
         """Start immediate download (skip queue)"""
@@ -507,13 +702,17 @@ class TkinterApp:
                 "Then restart the application.")
             return
         
-        if self.is_downloading:
-            # If already downloading, add to queue instead
+        if not self._can_start(self.site_var.get()):
+            # No free slot for this site, add to queue instead
             self.add_to_queue()
             return
         
-        task = self._create_download_task()
-        if task:
+        tasks = self._create_download_tasks()
+        if len(tasks) > 1:
+            # Several URLs pasted at once go through the queue
+            self.add_to_queue(tasks)
+        elif tasks:
+            task = tasks[0]
             # Check for duplicates even for immediate downloads
             if self._is_duplicate_task(task):
                 messagebox.showwarning("Duplicate Download", 
@@ -521,51 +720,55 @@ class TkinterApp:
                 self.add_log(f"⚠️ Duplicate detected, not starting: {task}")
                 return
             
+            if self.journal:
+                self.journal.add([task.to_dict()])
             self._start_download_task(task)
     
-    def _create_download_task(self) -> Optional[DownloadTask]:
-        """Create a download task from current UI inputs"""
+    def _create_download_tasks(self) -> List[DownloadTask]:
+        """Create download tasks from current UI inputs, one per pasted URL"""
         if not HAS_ASYNC_DEPS:
-            return None
+            return []
         
         site = self.site_var.get()
         
         if not site:
             messagebox.showerror("Error", "Please select a site")
-            return None
+            return []
         
-        if site in ["luscious", "multporn", "yiffer"]:
-            # URL-based download
-            url = self.url_var.get()
-            if not url.strip():
+        if SITES[site].kind == "url":
+            # URL-based download; several URLs may be pasted at once
+            urls = re.split(r"\s+(?=https?://)", self.url_var.get().strip())
+            if not urls[0]:
                 messagebox.showerror("Error", "Please enter a URL")
-                return None
+                return []
             
             # Basic URL validation
-            if not (url.startswith("http://") or url.startswith("https://")):
-                messagebox.showerror("Error", "Please enter a valid URL (must start with http:// or https://)")
-                return None
+            invalid = [url for url in urls if not (url.startswith("http://") or url.startswith("https://"))]
+            if invalid:
+                messagebox.showerror("Error", f"Please enter a valid URL (must start with http:// or https://)\n\n{invalid[0]}")
+                return []
             
             # Check if URL matches the site
-            site_urls = {
-                "luscious": "luscious.net",
-                "multporn": "multporn.net", 
-                "yiffer": "yiffer.xyz"
-            }
-            
-            if site_urls[site] not in url.lower():
+            domain = SITES[site].domain
+            foreign = [url for url in urls if domain not in url.lower()]
+            if foreign:
                 result = messagebox.askyesno("Warning", 
-                    f"URL doesn't seem to be from {site} ({site_urls[site]}). Continue anyway?")
+                    f"{len(foreign)} URL(s) don't seem to be from {site} ({domain}), e.g.\n{foreign[0]}\n\nContinue anyway?")
                 if not result:
-                    return None
-            
-            return DownloadTask(
-                task_id=str(uuid.uuid4()),
-                site=site,
-                task_type='url',
-                url=url
-            )
+                    return []
             
+            priority = PRIORITIES.get(self.priority_var.get(), 0)
+            return [
+                DownloadTask(
+                    task_id=str(uuid.uuid4()),
+                    site=site,
+                    task_type='url',
+                    url=url,
+                    priority=priority
+                )
+                for url in urls
+            ]
+        
         else:
             # Tag-based download
             tags = self.tags_var.get()
@@ -575,31 +778,49 @@ class TkinterApp:
                 result = messagebox.askyesno("Warning", 
                     "No tags entered. This will download ALL content from the site. Continue?")
                 if not result:
-                    return None
+                    return []
             
             # Convert max_pages
             try:
                 max_pages_int = int(max_pages) if max_pages.strip() else None
             except ValueError:
                 messagebox.showerror("Error", "Max pages must be a number")
-                return None
+                return []
             
-            # Check tag count for e621 family sites
-            if site in ["e621", "e6ai", "e926"] and tags.strip():
+            # Check tag count for sites with a tag limit
+            max_tags = SITES[site].max_tags
+            if max_tags and tags.strip():
                 tag_count = len(tags.split())
-                if tag_count > 40:
+                if tag_count > max_tags:
                     messagebox.showerror("Error", 
-                        f"{site.upper()} allows maximum 40 tags. You entered {tag_count} tags.")
-                    return None
+                        f"{site.upper()} allows maximum {max_tags} tags. You entered {tag_count} tags.")
+                    return []
             
-            return DownloadTask(
+            return [DownloadTask(
                 task_id=str(uuid.uuid4()),
                 site=site,
                 task_type='tags',
                 tags=tags,
-                max_pages=max_pages_int
-            )
-        
+                max_pages=max_pages_int,
+                incremental=self.incremental_var.get(),
+                priority=PRIORITIES.get(self.priority_var.get(), 0)
+            )]
+    
+    def _task_limits(self):
+        """(max active tasks, max active tasks per site) from config.json"""
+        if self.config_manager is None:
+            return 3, 1
+        return (self.config_manager.get_max_active_tasks(self.config),
+                self.config_manager.get_max_tasks_per_site(self.config))
+    
+    def _can_start(self, site: str) -> bool:
+        """Check whether a task for this site fits in the free slots"""
+        max_active, max_per_site = self._task_limits()
+        if len(self.active_tasks) >= max_active:
+            return False
+        same_site = sum(1 for task in self.active_tasks.values() if task.site == site)
+        return same_site < max_per_site
+    
     def _start_download_task(self, task: DownloadTask):
         """Start downloading a specific task"""
         # Check if we have the required components
@@ -608,302 +829,450 @@ class TkinterApp:
             messagebox.showerror("Error", "Application is still starting up. Please wait a moment and try again.")
             return
         
-        self.is_downloading = True
-        self.current_download_info = task
+        if not self.active_tasks:
+            self.progress_var.set(0)
+        self.active_tasks[task.task_id] = task
         task.status = 'downloading'
+        if self.journal:
+            self.journal.set_status(task.task_id, 'downloading')
+        task.progress = 'starting'
         self.update_queue_display()
         
         self.add_log(f"🚀 Starting download: {task}")
         
         # Start real download
-        if self.loop and self.loop.is_running():
-            if task.task_type == 'url':
-                asyncio.run_coroutine_threadsafe(
-                    self._start_url_download(task),
-                    self.loop
-                )
-            else:
-                asyncio.run_coroutine_threadsafe(
-                    self._start_tag_download(task),
-                    self.loop
-                )
+        if self.engine:
+            # Engine process: the task runs there, results come back through _poll_engine
+            self._announce_task(task)
+            if not self.engine.submit(task.to_dict(), task.cursor):
+                self.add_log("Download engine not reachable, the task will be retried when it restarts")
+        elif self.loop and self.loop.is_running():
+            control = TaskControl()
+            # The loop thread fills in the asyncio task when it starts it
+            self._handles[task.task_id] = (None, control)
+            self.loop.call_soon_threadsafe(self._spawn_task, task, control)
         else:
             self.add_log("Error: Async loop not available")
             messagebox.showerror("Error", "Download system not ready. Please restart the application.")
             self._download_completed(task, False)
     
     def _process_next_in_queue(self):
-        """Process the next item in the download queue"""
-        if self.is_downloading or self.download_queue.empty():
+        """Fill free slots with the highest priority queued tasks whose site has room"""
+        if HAS_ASYNC_DEPS and self.config_manager is None:
+            # Still starting up; queued tasks wait for the next completion or add
             return
-        
-        try:
-            next_task = self.download_queue.get_nowait()
+        if self.engine and not self.engine.alive:
+            # Engine process is (re)starting; its ready event fills the slots
+            return
+        while self.download_queue:
+            next_task = self.download_queue.pop_next(lambda task: self._can_start(task.site))
+            if next_task is None:
+                return
             self._start_download_task(next_task)
-        except queue.Empty:
-            pass
     
     def _download_completed(self, task: DownloadTask, success: bool):
         """Handle download completion"""
-        self.is_downloading = False
-        self.current_download_info = None
+        self.active_tasks.pop(task.task_id, None)
         task.status = 'completed' if success else 'failed'
+        if self.journal:
+            self.journal.remove(task.task_id)
         
         if success:
             self.add_log(f"✅ Completed: {task}")
+            if not self.active_tasks:
+                self.progress_var.set(100)
         else:
             self.add_log(f"❌ Failed: {task}")
         
         self.update_queue_display()
         
-        # Process next item in queue
+        # Start whatever fits in the freed slot
         self._process_next_in_queue()
     
+    def _update_task_progress(self, task: DownloadTask, message: str):
+        """Show the latest progress of one active task in its queue row"""
+        task.progress = message
+        self.status_text.set(f"[{task.site}] {message}")
+        if task.task_id not in self.active_tasks:
+            return
+        row = list(self.active_tasks).index(task.task_id)
+        self.queue_listbox.delete(row)
+        self.queue_listbox.insert(row, self._active_row_text(task))
+    
+    @staticmethod
+    def _active_row_text(task: DownloadTask) -> str:
+        detail = task.stats.describe() if task.stats else task.progress
+        return f"{ACTIVE_LABELS.get(task.status, ACTIVE_LABELS['downloading'])}: {task} - {detail}"
+    
+    def _update_overall_progress(self):
+        """Progress bar over the files of every active task with a known total"""
+        done = total = 0
+        for task in self.active_tasks.values():
+            if task.stats and task.stats.files_total:
+                done += task.stats.files_done + task.stats.files_failed
+                total += task.stats.files_total
+        if total:
+            self.progress_var.set(100 * done / total)
+    
+    def _save_checkpoint(self, task: DownloadTask, cursor: Dict[str, Any]):
+        """Remember a running task's listing position (called on the loop thread)"""
+        task.cursor = cursor
+        if self.journal:
+            self.journal.set_cursor(task.task_id, cursor)
+    
+    def _restore_queue(self):
+        """Queue again whatever was queued or running when the app last closed"""
+        if not self.journal:
+            return
+        restored = 0
+        for entry in self.journal.load():
+            try:
+                task = DownloadTask.from_dict(entry["data"], entry["cursor"])
+            except (KeyError, TypeError) as e:
+                self.add_log(f"⚠️ Skipping unreadable saved download: {e}")
+                self.journal.remove(entry["task_id"])
+                continue
+            if entry["status"] == 'paused':
+                # Stays paused until the user resumes it
+                task.status = 'paused'
+                self.paused_tasks[task.task_id] = task
+                restored += 1
+            elif self.download_queue.add(task):
+                restored += 1
+            else:
+                # Same download saved twice, keep the first
+                self.journal.remove(task.task_id)
+        
+        if restored:
+            self.add_log(f"♻️ Restored {restored} downloads from the last session")
+            self._process_next_in_queue()
+            self.update_queue_display()
+    
     def update_queue_display(self):
         """Update the queue listbox display"""
         self.queue_listbox.delete(0, tk.END)
         
-        # Show current download
-        if self.current_download_info:
-            self.queue_listbox.insert(tk.END, f"🟢 DOWNLOADING: {self.current_download_info}")
-        
-        # Show queued items
-        temp_items = []
-        while not self.download_queue.empty():
-            try:
-                item = self.download_queue.get_nowait()
-                temp_items.append(item)
-                self.queue_listbox.insert(tk.END, f"⏳ QUEUED: {item}")
-            except queue.Empty:
-                break
-        
-        # Put items back in queue
-        for item in temp_items:
-            self.download_queue.put(item)
+        # Active downloads first, then paused ones, then queued items in run order
+        rows = [self._active_row_text(task) for task in self.active_tasks.values()]
+        self._row_tasks = list(self.active_tasks.values())
+        for task in self.paused_tasks.values():
+            self._row_tasks.append(task)
+            rows.append(f"⏸️ PAUSED: {task}")
+        for task in self.download_queue:
+            self._row_tasks.append(task)
+            rows.append(f"⏳ QUEUED: {task}")
+        if rows:
+            self.queue_listbox.insert(tk.END, *rows)
     
     def clear_queue(self):
         """Clear all items from the queue"""
-        while not self.download_queue.empty():
-            try:
-                self.download_queue.get_nowait()
-            except queue.Empty:
-                break
+        self.download_queue.clear()
+        if self.journal:
+            self.journal.remove_pending()
         self.update_queue_display()
         self.add_log("🗑️ Queue cleared")
     
+    def _selected_task(self) -> Optional[DownloadTask]:
+        """Task of the selected queue row, if any"""
+        selection = self.queue_listbox.curselection()
+        if not selection or selection[0] >= len(self._row_tasks):
+            return None
+        return self._row_tasks[selection[0]]
+    
     def remove_selected_from_queue(self):
         """Remove selected item from queue"""
-        selection = self.queue_listbox.curselection()
-        if not selection:
+        task = self._selected_task()
+        if task is None:
+            return
+        
+        # Running downloads are stopped with Cancel instead
+        if task.task_id in self.active_tasks:
+            messagebox.showwarning("Cannot Remove", "Cannot remove currently downloading item. Use Cancel to stop it.")
             return
         
-        selected_index = selection[0]
+        if task.task_id in self.paused_tasks:
+            removed_item = self.paused_tasks.pop(task.task_id)
+        else:
+            removed_item = self.download_queue.remove(task.task_id)
+        if removed_item and self.journal:
+            self.journal.remove(removed_item.task_id)
+        if removed_item:
+            self.add_log(f"✖️ Removed from queue: {removed_item}")
+        self.update_queue_display()
+    
+    def pause_selected(self):
+        """Let the selected download finish the files it has in flight, then stop"""
+        task = self._selected_task()
+        if task is None or task.task_id not in self.active_tasks or task.status != 'downloading':
+            messagebox.showinfo("Pause", "Select a running download to pause.")
+            return
         
-        # If it's the current download, we can't remove it
-        if self.current_download_info and selected_index == 0:
-            messagebox.showwarning("Cannot Remove", "Cannot remove currently downloading item.")
+        if self.engine:
+            sent = self.engine.pause(task.task_id)
+        else:
+            handle = self._handles.get(task.task_id)
+            sent = handle is not None
+            if handle:
+                handle[1].pause()
+        if not sent:
+            self.add_log(f"Could not pause: {task}")
             return
         
-        # Adjust index if current download is showing
-        queue_index = selected_index
-        if self.current_download_info:
-            queue_index -= 1
+        task.status = 'pausing'
+        self.add_log(f"⏸️ Pausing after the current files: {task}")
+        self.update_queue_display()
+    
+    def resume_selected(self):
+        """Queue a paused download again; it continues from its last checkpoint"""
+        task = self._selected_task()
+        if task is None or task.task_id not in self.paused_tasks:
+            messagebox.showinfo("Resume", "Select a paused download to resume.")
+            return
         
-        if queue_index >= 0:
-            # Remove item from queue
-            temp_items = []
-            removed_item = None
-            item_count = 0
-            
-            while not self.download_queue.empty():
-                try:
-                    item = self.download_queue.get_nowait()
-                    if item_count == queue_index:
-                        removed_item = item
-                    else:
-                        temp_items.append(item)
-                    item_count += 1
-                except queue.Empty:
-                    break
-            
-            # Put remaining items back
-            for item in temp_items:
-                self.download_queue.put(item)
-            
-            if removed_item:
-                self.add_log(f"✖️ Removed from queue: {removed_item}")
+        del self.paused_tasks[task.task_id]
+        task.status = 'pending'
+        if self.journal:
+            self.journal.set_status(task.task_id, 'pending')
+        self.download_queue.add(task)
+        self.add_log(f"▶️ Resumed: {task}")
+        self._process_next_in_queue()
+        self.update_queue_display()
     
-    def _is_duplicate_task(self, new_task: DownloadTask) -> bool:
-        """Check if task is already in queue or currently downloading"""
-        # Check current download
-        if self.current_download_info and new_task == self.current_download_info:
-            return True
+    def cancel_selected(self):
+        """Stop the selected download right away, keeping partly downloaded files"""
+        task = self._selected_task()
+        if task is None:
+            return
         
-        # Check queue
-        temp_items = []
-        is_duplicate = False
+        if task.task_id in self.paused_tasks:
+            del self.paused_tasks[task.task_id]
+            task.status = 'cancelled'
+            if self.journal:
+                self.journal.remove(task.task_id)
+            self.add_log(f"⛔ Cancelled: {task}")
+            self.update_queue_display()
+            return
         
-        while not self.download_queue.empty():
-            try:
-                item = self.download_queue.get_nowait()
-                temp_items.append(item)
-                if new_task == item:
-                    is_duplicate = True
-            except queue.Empty:
-                break
+        if task.task_id not in self.active_tasks:
+            messagebox.showinfo("Cancel", "Select a running or paused download to cancel. Queued downloads can be removed.")
+            return
+        if task.status == 'cancelling':
+            return
+        if not messagebox.askyesno("Cancel Download", f"Stop {task} now?\n\nPartly downloaded files are kept and continued if you download it again."):
+            return
         
-        # Put items back in queue
-        for item in temp_items:
-            self.download_queue.put(item)
+        task.status = 'cancelling'
+        self.update_queue_display()
+        if self.engine:
+            # The engine answers with a done event
+            self.engine.cancel(task.task_id)
+        else:
+            # Settled by the task's done callback once it has let go of its files and ledger rows
+            self.loop.call_soon_threadsafe(self._cancel_on_loop, task.task_id)
+    
+    def _task_stopped(self, task: DownloadTask, cancelled: bool):
+        """Free the slot of a download the user paused or cancelled"""
+        self.active_tasks.pop(task.task_id, None)
+        task.stats = None
+        if cancelled:
+            task.status = 'cancelled'
+            if self.journal:
+                self.journal.remove(task.task_id)
+            self.add_log(f"⛔ Cancelled: {task} (partly downloaded files are kept)")
+            self.set_status(f"[{task.site}] Download cancelled")
+        else:
+            task.status = 'paused'
+            self.paused_tasks[task.task_id] = task
+            if self.journal:
+                self.journal.set_status(task.task_id, 'paused')
+            self.add_log(f"⏸️ Paused: {task}")
+            self.set_status(f"[{task.site}] Download paused")
         
-        return is_duplicate
-            
         self.update_queue_display()
+        self._process_next_in_queue()
+    
+    def _is_duplicate_task(self, new_task: DownloadTask) -> bool:
+        """Check if task is already in queue or currently downloading"""
+        key = new_task.get_unique_key()
+        if self.download_queue.has_key(key):
+            return True
+        running = list(self.active_tasks.values()) + list(self.paused_tasks.values())
+        return any(key == task.get_unique_key() for task in running)
     
-    async def _start_tag_download(self, task: DownloadTask):
-        """Start tag-based download process using new async downloaders"""
+    def _announce_task(self, task: DownloadTask):
+        """Log what a task is about to do (safe from any thread)"""
         site = task.site
-        tags = task.tags
-        max_pages = task.max_pages
-        try:
-            self.root.after(0, lambda: self.status_text.set("Initializing download..."))
-            self.root.after(0, lambda: self.progress_var.set(0))
-            
-            # Initialize session
-            self.sessions[task.task_id] = {
-                'site': site,
-                'tags': tags,
-                'status': 'initializing',
-                'progress': 0,
-                'active_downloads': []
-            }
-            
-            self.root.after(0, lambda: self.add_log(f"Starting {site} download for tags: '{tags}'"))
-            self.root.after(0, lambda: self.status_text.set("Starting download..."))
-            
-            # Get credentials if needed
-            api_user = None
-            api_key = None
-            if site in ["e621", "e6ai", "e926", "furbooru"]:
-                credentials = self.config.get("user_credentials", {}).get(site, {})
-                api_user = credentials.get("apiUser", "")
-                api_key = credentials.get("apiKey", "")
-                
-                if not api_key:
-                    self.root.after(0, lambda: self.add_log(f"Warning: No API credentials for {site}. Download may be limited."))
-            
-            # Get blacklist
-            blacklist = self.config.get("blacklisted_tags", [])
-            
-            # Enable oneTimeDownload if configured
-            db_file = self.config.get("oneTimeDownload", True)
-            
-            # Progress callback
-            def progress_callback(message: str):
-                self.root.after(0, lambda: self.add_log(message))
-                self.root.after(0, lambda: self.status_text.set(message))
-            
-            # Call appropriate async downloader
-            result = False
-            if site in ["e621", "e6ai", "e926"]:
-                result = await download_e621_tags(
-                    tags=tags,
-                    site=site,
-                    blacklist=blacklist,
-                    max_pages=max_pages,
-                    api_user=api_user,
-                    api_key=api_key,
-                    db_file=db_file,
-                    progress_callback=progress_callback
-                )
-            elif site == "rule34":
-                result = await download_rule34_tags(
-                    tags=tags,
-                    blacklist=blacklist,
-                    max_pages=max_pages,
-                    db_file=db_file,
-                    progress_callback=progress_callback
-                )
-            elif site == "furbooru":
-                result = await download_furbooru_tags(
-                    tags=tags,
-                    blacklist=blacklist,
-                    max_pages=max_pages,
-                    api_key=api_key,
-                    db_file=db_file,
-                    progress_callback=progress_callback
-                )
-            
-            if result:
-                self.root.after(0, lambda: self.status_text.set("Download completed!"))
-                self.root.after(0, lambda: self.progress_var.set(100))
-                self.root.after(0, lambda: messagebox.showinfo("Complete", f"Download from {site} completed!"))
-            else:
-                self.root.after(0, lambda: self.status_text.set("Download failed"))
-                self.root.after(0, lambda: messagebox.showwarning("Warning", f"Download from {site} failed or no content found"))
-            
-            # Mark download as completed
-            self.root.after(0, lambda: self._download_completed(task, result))
-            
-        except Exception as e:
-            error_msg = str(e)
-            self.root.after(0, lambda: self.add_log(f"Download error: {error_msg}"))
-            self.root.after(0, lambda: self.status_text.set(f"Error: {error_msg}"))
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Download failed: {error_msg}"))
-            self.root.after(0, lambda: self._download_completed(task, False))
-    
-    async def _start_url_download(self, task: DownloadTask):
-        """Start URL-based download process using new async downloaders"""
+        self.set_status(f"[{site}] Starting download...")
+        if task.task_type == 'url':
+            self.add_log(f"Starting {site} download from URL: {task.url}")
+            return
+        
+        self.add_log(f"Starting {site} download for tags: '{task.tags}'")
+        if task.cursor:
+            self.add_log(f"Resuming interrupted download at page {task.cursor.get('page')}")
+        
+        # Warn about missing credentials
+        if SITES[site].needs_api_key:
+            api_key = self.config.get("user_credentials", {}).get(site, {}).get("apiKey", "")
+            if not api_key:
+                self.add_log(f"Warning: No API credentials for {site}. Download may be limited.")
+    
+    async def _run_task(self, task: DownloadTask, control: "TaskControl"):
+        """Run a task on the in-process loop with the shared pool and ledger"""
+        self._announce_task(task)
+        
+        # Progress callback
+        def progress_callback(message: str):
+            self.add_log(message)
+            self._post_progress(task, message)
+        
+        return await run_download(
+            task.site,
+            self.config,
+            tags=task.tags,
+            url=task.url,
+            max_pages=task.max_pages,
+            incremental=task.incremental,
+            progress_callback=progress_callback,
+            session_manager=self.session_manager,
+            ledger=self.ledger,
+            resume=task.cursor,
+            checkpoint_callback=lambda cursor: self._save_checkpoint(task, cursor),
+            event_callback=lambda event: self._post_event(task, event),
+            control=control
+        )
+    
+    def _spawn_task(self, task: DownloadTask, control: "TaskControl"):
+        """Start a task on the in-process loop (loop thread)"""
+        handle = self.loop.create_task(self._run_task(task, control))
+        handle.add_done_callback(lambda done: self._on_task_done(task, done))
+        self._handles[task.task_id] = (handle, control)
+    
+    def _cancel_on_loop(self, task_id: str):
+        """Cancel a task's coroutine (loop thread); runs after its _spawn_task"""
+        handle = self._handles.get(task_id)
+        if handle and handle[0] is not None:
+            handle[0].cancel()
+    
+    def _on_task_done(self, task: DownloadTask, done: asyncio.Task):
+        """Report a task once its coroutine has fully finished (loop thread)"""
+        if done.cancelled():
+            result, error_msg = False, None
+        elif done.exception() is not None:
+            result, error_msg = False, str(done.exception())
+        else:
+            result, error_msg = done.result(), None
+        self._post_call(lambda: self._report_result(task, result, error_msg))
+    
+    def _report_result(self, task: DownloadTask, result: bool, error_msg: Optional[str] = None):
+        """Tell the user how a task ended and free its slot"""
+        if task.task_id not in self.active_tasks:
+            # Already settled, e.g. cancelled before its result came in
+            return
+        self._handles.pop(task.task_id, None)
+        if task.status in ('pausing', 'cancelling'):
+            if error_msg:
+                self.add_log(f"Download error: {error_msg}")
+            self._task_stopped(task, cancelled=task.status == 'cancelling')
+            return
+        
         site = task.site
-        url = task.url
-        try:
-            self.root.after(0, lambda: self.status_text.set("Initializing download..."))
-            self.root.after(0, lambda: self.progress_var.set(0))
-            
-            self.root.after(0, lambda: self.add_log(f"Starting {site} download from URL: {url}"))
-            
-            # Progress callback
-            def progress_callback(message: str):
-                self.root.after(0, lambda: self.add_log(message))
-                self.root.after(0, lambda: self.status_text.set(message))
-            
-            # Call appropriate async downloader
-            result = False
-            if site == "luscious":
-                result = await download_luscious_album(
-                    url=url,
-                    progress_callback=progress_callback
-                )
-            elif site == "multporn":
-                result = await download_multporn_comic(
-                    url=url,
-                    progress_callback=progress_callback
-                )
-            elif site == "yiffer":
-                result = await download_yiffer_comic(
-                    url=url,
-                    progress_callback=progress_callback
-                )
-            
-            if result:
-                self.root.after(0, lambda: self.status_text.set("Download completed!"))
-                self.root.after(0, lambda: self.progress_var.set(100))
+        if error_msg:
+            self.add_log(f"Download error: {error_msg}")
+            self.set_status(f"[{site}] Error: {error_msg}")
+            messagebox.showerror("Error", f"Download failed: {error_msg}")
+        elif result:
+            self.set_status(f"[{site}] Download completed!")
+            if task.task_type == 'url':
                 media_dir = Path.cwd() / "media"
-                self.root.after(0, lambda: self.add_log(f"Files downloaded to: {media_dir}"))
-                self.root.after(0, lambda: messagebox.showinfo("Complete", f"Download from {site} completed!\n\nFiles saved to: {media_dir}"))
+                self.add_log(f"Files downloaded to: {media_dir}")
+                messagebox.showinfo("Complete", f"Download from {site} completed!\n\nFiles saved to: {media_dir}")
             else:
-                self.root.after(0, lambda: self.status_text.set("Download failed"))
-                self.root.after(0, lambda: messagebox.showwarning("Warning", f"Download from {site} failed or no content found"))
-            
-            # Mark download as completed
-            self.root.after(0, lambda: self._download_completed(task, result))
+                messagebox.showinfo("Complete", f"Download from {site} completed!")
+        else:
+            self.set_status(f"[{site}] Download failed")
+            messagebox.showwarning("Warning", f"Download from {site} failed or no content found")
+        
+        # Mark download as completed
+        self._download_completed(task, bool(result) and not error_msg)
+    
+    def _start_engine(self):
+        """Launch the child process engine (config gui.engine_process)"""
+        self.engine = EngineProcess()
+        self.engine.start()
+        self.add_log("Starting download engine in a separate process...")
+    
+    def _poll_engine(self):
+        """Hand engine events to the same handlers the in-process loop uses"""
+        for event in self.engine.poll():
+            kind = event[0]
+            if kind == "ready":
+                self._engine_failures = 0
+                self._engine_error = None
+                self.add_log("✅ Download engine ready")
+                self._process_next_in_queue()
+                continue
+            if kind == "error":
+                self._engine_error = event[1]
+                self.add_log(f"❌ {event[1]}")
+                continue
             
-        except Exception as e:
-            error_msg = str(e)
-            self.root.after(0, lambda: self.add_log(f"Download error: {error_msg}"))
-            self.root.after(0, lambda: self.status_text.set(f"Error: {error_msg}"))
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Download failed: {error_msg}"))
-            self.root.after(0, lambda: self._download_completed(task, False))
+            task = self.active_tasks.get(event[1])
+            if task is None:
+                continue
+            if kind == "progress":
+                self.add_log(event[2])
+                self._post_progress(task, event[2])
+            elif kind == "event":
+                self._post_event(task, event[2])
+            elif kind == "checkpoint":
+                self._save_checkpoint(task, event[2])
+            elif kind == "done":
+                self._report_result(task, event[2], event[3])
+        
+        if not self.engine.alive and not (self._closing or self._engine_restarting or self._engine_failed):
+            self._engine_stopped()
+    
+    def _engine_stopped(self):
+        """Requeue a dead engine's tasks and restart it with backoff, up to ENGINE_MAX_RESTARTS times in a row"""
+        reason = self._engine_error or f"exit code {self.engine.exitcode}"
+        requeued = self._requeue_engine_tasks()
+        self._engine_failures += 1
+        
+        if self._engine_failures > ENGINE_MAX_RESTARTS:
+            self._engine_failed = True
+            self.add_log(f"❌ Download engine failed {ENGINE_MAX_RESTARTS} restarts in a row ({reason}), giving up. Queued downloads wait for the next start.")
+            self.set_status(f"Download engine failed: {reason}")
+            messagebox.showerror("Download Engine", f"The download engine keeps stopping ({reason}).\n\nQueued downloads are kept and resume the next time the app starts.")
+            return
+        
+        delay = min(ENGINE_RESTART_DELAY_MS * 2 ** (self._engine_failures - 1), ENGINE_MAX_RESTART_DELAY_MS)
+        self.add_log(f"⚠️ Download engine stopped unexpectedly ({reason}), restarting in {delay / 1000:g}s ({requeued} downloads requeued)")
+        self._engine_restarting = True
+        self.root.after(delay, self._restart_engine)
+    
+    def _restart_engine(self):
+        """Replace the dead engine with a new one"""
+        self._engine_restarting = False
+        if self._closing:
+            return
+        self.engine.stop(timeout=0)
+        self._engine_error = None
+        self._start_engine()
+    
+    def _requeue_engine_tasks(self) -> int:
+        """Put the tasks a dead engine was running back in the queue; returns how many"""
+        interrupted = list(self.active_tasks.values())
+        self.active_tasks.clear()
+        for task in interrupted:
+            if task.status in ('pausing', 'cancelling'):
+                self._task_stopped(task, cancelled=task.status == 'cancelling')
+                continue
+            task.status = 'pending'
+            task.stats = None
+            self.download_queue.add(task)
+        self.update_queue_display()
+        return len(interrupted)
     
     def save_credentials(self):
         """Save API credentials"""
@@ -928,7 +1297,7 @@ class TkinterApp:
                 )
             else:
                 messagebox.showerror("Error", "Application not ready")
-            
+        
         except Exception as e:
             self.add_log(f"Error saving credentials: {e}")
             messagebox.showerror("Error", f"Failed to save credentials: {e}")
@@ -942,15 +1311,15 @@ class TkinterApp:
             self.config = await self.config_manager.load_config()
             
             # Clear fields on main thread
-            self.root.after(0, lambda: self.api_user_var.set(""))
-            self.root.after(0, lambda: self.api_key_var.set(""))
-            
-            self.root.after(0, lambda: self.add_log(f"Credentials saved for {site}"))
-            self.root.after(0, lambda: messagebox.showinfo("Success", f"Credentials saved for {site}"))
+            self._post_call(lambda: self.api_user_var.set(""))
+            self._post_call(lambda: self.api_key_var.set(""))
             
+            self.add_log(f"Credentials saved for {site}")
+            self._post_call(lambda: messagebox.showinfo("Success", f"Credentials saved for {site}"))
+        
         except Exception as e:
-            self.root.after(0, lambda: self.add_log(f"Error saving credentials: {e}"))
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to save credentials: {e}"))
+            self.add_log(f"Error saving credentials: {e}")
+            self._post_call(lambda error=e: messagebox.showerror("Error", f"Failed to save credentials: {error}"))
     
     
     def run(self):
@@ -960,8 +1329,27 @@ class TkinterApp:
         
         # Handle window close
         def on_closing():
+            self._closing = True
+            if self.engine:
+                # Running tasks stay in the journal and resume on the next start
+                self.engine.stop()
             if self.loop:
+                if self.session_manager and self.loop.is_running():
+                    # Close pooled connections on the loop that owns them
+                    try:
+                        asyncio.run_coroutine_threadsafe(self.session_manager.close(), self.loop).result(timeout=5)
+                    except Exception as e:
+                        print(f"Error closing connections: {e}")
                 self.loop.call_soon_threadsafe(self.loop.stop)
+            if self.loop_thread:
+                # The loop thread is a daemon; wait for it so nothing touches the ledger after close
+                self.loop_thread.join(timeout=5)
+            if self.ledger:
+                # Flush recorded downloads before the process exits
+                self.ledger.close()
+            if self.journal:
+                # Unfinished tasks stay in the journal for the next start
+                self.journal.close()
             self.root.destroy()
         
         self.root.protocol("WM_DELETE_WINDOW", on_closing)
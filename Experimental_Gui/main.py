@@ -1,13 +1,150 @@
 """NN-Downloader v2.0 - Simple Main Entry Point"""
 
 import sys
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import time
 from pathlib import Path
 
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+
+async def run_daemon(subscriptions_path: Path) -> int:
+    """Refresh saved queries on a schedule until interrupted"""
+    from core.http_session import SessionManager
+    from core.ledger import Ledger
+    from core.scheduler import SubscriptionScheduler, load_subscriptions
+    from downloaders.runner import run_download
+    from utils.config_manager_async import AsyncConfigManager
+
+    try:
+        subscriptions = load_subscriptions(subscriptions_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read subscriptions from {subscriptions_path}: {e}")
+        return 1
+
+    config = await AsyncConfigManager().load_config()
+    scheduler_settings = config.get("scheduler", {})
+
+    # One connection pool, rate limiter and ledger for every refresh
+    async with SessionManager.from_config(config) as session_manager:
+        with Ledger() as ledger:
+            async def run_job(subscription) -> bool:
+                return await run_download(
+                    subscription.site,
+                    config,
+                    tags=subscription.tags,
+                    url=subscription.url,
+                    max_pages=subscription.max_pages,
+                    incremental=True,
+                    session_manager=session_manager,
+                    ledger=ledger
+                )
+
+            scheduler = SubscriptionScheduler(
+                subscriptions,
+                run_job,
+                max_concurrent=scheduler_settings.get("max_concurrent_jobs", 4),
+                jitter=scheduler_settings.get("jitter", 0.1)
+            )
+            await scheduler.run()
+    return 0
+
+
+async def run_batch_jobs(args) -> int:
+    """Download the jobs given on the command line or in a manifest once, then print a JSON summary"""
+    from core.batch import BatchJob, load_manifest, run_batch, summarize
+    from core.http_session import SessionManager
+    from core.ledger import Ledger
+    from downloaders.runner import run_download
+    from utils.config_manager_async import AsyncConfigManager
+
+    if args.manifest:
+        try:
+            jobs = load_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not read manifest {args.manifest}: {e}", file=sys.stderr)
+            return 1
+    else:
+        jobs = [BatchJob(site=args.site.lower(), tags=args.tags, url=args.url, max_pages=args.max_pages, incremental=args.incremental)]
+
+    config_manager = AsyncConfigManager()
+    config = await config_manager.load_config()
+    max_jobs = args.jobs or config_manager.get_max_active_tasks(config)
+    max_per_site = args.jobs_per_site or config_manager.get_max_tasks_per_site(config)
+    started = time.monotonic()
+
+    # Downloader output goes to stderr so stdout carries only the summary
+    with contextlib.redirect_stdout(sys.stderr):
+        async with SessionManager.from_config(config) as session_manager:
+            with Ledger() as ledger:
+                async def run_job(job, event_callback) -> bool:
+                    return await run_download(
+                        job.site,
+                        config,
+                        tags=job.tags,
+                        url=job.url,
+                        max_pages=job.max_pages,
+                        incremental=job.incremental,
+                        output_dir=Path(job.output_dir) if job.output_dir else args.output,
+                        progress_callback=None if args.quiet else print,
+                        session_manager=session_manager,
+                        ledger=ledger,
+                        event_callback=event_callback
+                    )
+
+                results = await run_batch(jobs, run_job, max_concurrent=max_jobs, max_per_site=max_per_site, progress_callback=print)
+
+    summary = json.dumps(summarize(results, time.monotonic() - started), indent=2)
+    if args.summary:
+        args.summary.write_text(summary, encoding="utf-8")
+    print(summary)
+    return 0 if all(result.success for result in results) else 1
+
+
 def main():
-    """Main entry point - just launch the GUI"""
+    """Main entry point - launch the GUI, the subscription daemon with --daemon, or a batch with --site/--manifest"""
+    parser = argparse.ArgumentParser(description="NN-Downloader v2.0")
+    parser.add_argument("--daemon", action="store_true", help="refresh saved queries on a schedule instead of opening the GUI")
+    parser.add_argument("--subscriptions", type=Path, default=Path("subscriptions.json"), help="subscriptions file used by --daemon")
+
+    batch = parser.add_argument_group("headless downloads", "download once without the GUI and print a JSON summary")
+    batch.add_argument("--site", help="site of a single job, e.g. e621 or yiffer")
+    batch.add_argument("--tags", help="tags of a single tag job")
+    batch.add_argument("--url", help="URL of a single URL job")
+    batch.add_argument("--max-pages", type=int, help="page limit of a single tag job")
+    batch.add_argument("--incremental", action="store_true", help="only fetch posts newer than the last run of the query")
+    batch.add_argument("--manifest", type=Path, help="JSON file with many jobs: {\"jobs\": [{\"site\": ..., \"tags\": ...}, ...]}")
+    batch.add_argument("--output", type=Path, default=Path("media"), help="download directory (default: media)")
+    batch.add_argument("--jobs", type=int, help="jobs running at once (default: task_queue.max_active_tasks)")
+    batch.add_argument("--jobs-per-site", type=int, help="jobs per site running at once (default: task_queue.max_tasks_per_site)")
+    batch.add_argument("--summary", type=Path, help="also write the JSON summary to this file")
+    batch.add_argument("--quiet", action="store_true", help="only log job starts and ends")
+    args = parser.parse_args()
+
+    if args.site and args.manifest:
+        parser.error("use either --site or --manifest")
+    if args.site and not (args.tags is not None or args.url):
+        parser.error("--site needs --tags or --url")
+    if args.site or args.manifest:
+        try:
+            return asyncio.run(run_batch_jobs(args))
+        except KeyboardInterrupt:
+            print("Batch interrupted", file=sys.stderr)
+            return 130
+
+    if args.daemon:
+        print("🚀 Starting NN-Downloader v2.0 subscription daemon...")
+        try:
+            return asyncio.run(run_daemon(args.subscriptions))
+        except KeyboardInterrupt:
+            print("Daemon stopped")
+            return 0
+
     try:
         # Try to import and run the GUI
         from gui.tkinter_app import run_tkinter_app
@@ -25,4 +162,6 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Needed for the engine process (gui.engine_process) in frozen builds
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,41 @@
+from core.blacklist import Blacklist
+
+
+def test_rule_needs_every_tag():
+    blacklist = Blacklist(["gore", "feral male"])
+    assert blacklist.blocks(["gore", "fox"])
+    assert blacklist.blocks(["male", "feral", "fox"])
+    assert not blacklist.blocks(["feral", "female"])
+
+
+def test_excluded_tag_lifts_the_rule():
+    blacklist = Blacklist(["feral -solo"])
+    assert blacklist.blocks(["feral", "duo"])
+    assert not blacklist.blocks(["feral", "solo"])
+
+
+def test_any_of_tags_need_only_one_match():
+    blacklist = Blacklist(["~gore ~vore"])
+    assert blacklist.blocks(["vore", "fox"])
+    assert not blacklist.blocks(["fox"])
+
+
+def test_rating_and_score_metatags():
+    blacklist = Blacklist(["rating:explicit feral", "-rating:s solo", "score:<0"])
+    assert blacklist.blocks(["feral"], rating="e")
+    assert not blacklist.blocks(["feral"], rating="q")
+    assert blacklist.blocks(["solo"], rating="q")
+    assert not blacklist.blocks(["solo"], rating="s")
+    assert blacklist.blocks(["fox"], rating="s", score=-3)
+    assert not blacklist.blocks(["fox"], rating="s", score=0)
+
+
+def test_rules_are_case_insensitive_and_skip_blank_lines():
+    blacklist = Blacklist(["", "  ", "Gore"])
+    assert blacklist.blocks(["gore"])
+
+
+def test_empty_blacklist_blocks_nothing():
+    blacklist = Blacklist([])
+    assert not blacklist
+    assert not blacklist.blocks(["gore"], rating="e", score=-10)
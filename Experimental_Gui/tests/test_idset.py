@@ -0,0 +1,39 @@
+from core.idset import CompactIdSet
+
+
+def test_add_and_contains():
+    ids = CompactIdSet([5, 1, 3])
+    ids.add(10)
+    ids.add(2)
+    ids.add("7")
+    ids.add(3)
+    
+    assert len(ids) == 6
+    assert all(item_id in ids for item_id in (1, 2, 3, 5, 7, 10))
+    assert "10" in ids
+    assert 4 not in ids and 11 not in ids
+    assert list(ids) == [1, 2, 3, 5, 7, 10]
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / "e621.idx"
+    ids = CompactIdSet([30, 10, 20])
+    ids.add(15)
+    ids.save(path)
+    
+    loaded = CompactIdSet.load(path, expected_count=4, expected_max=30)
+    assert loaded is not None
+    assert list(loaded) == [10, 15, 20, 30]
+    assert 15 in loaded and 16 not in loaded
+
+
+def test_stale_or_damaged_snapshot_is_rejected(tmp_path):
+    path = tmp_path / "e621.idx"
+    CompactIdSet([1, 2, 3]).save(path)
+    
+    assert CompactIdSet.load(path, expected_count=4) is None
+    assert CompactIdSet.load(path, expected_count=3, expected_max=4) is None
+    assert CompactIdSet.load(tmp_path / "missing.idx") is None
+    
+    path.write_bytes(path.read_bytes()[:-1])
+    assert CompactIdSet.load(path) is None
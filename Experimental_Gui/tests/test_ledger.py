@@ -0,0 +1,94 @@
+import sqlite3
+
+from core.ledger import Ledger
+
+
+def open_ledger(tmp_path):
+    return Ledger(tmp_path / "ledger.sqlite3")
+
+
+def test_records_and_reloads_downloads(tmp_path):
+    with open_ledger(tmp_path) as ledger:
+        ledger.add("e621", 1)
+        ledger.add("e621", "2")
+        assert ledger.contains("e621", 2)
+        assert ledger.known("e621", [1, 2, 3]) == {1, 2}
+    
+    with open_ledger(tmp_path) as ledger:
+        assert ledger.count("e621") == 2
+        assert ledger.contains("e621", 1)
+        assert not ledger.contains("rule34", 1)
+
+
+def test_snapshot_with_same_count_but_other_ids_is_rebuilt(tmp_path):
+    with open_ledger(tmp_path) as ledger:
+        for item_id in (1, 2, 3):
+            ledger.add("e621", item_id)
+        # Loads the id set so close() writes the .idx snapshot
+        assert ledger.contains("e621", 3)
+    assert (tmp_path / "e621.idx").exists()
+    
+    # Another process swaps an id without changing the row count
+    with sqlite3.connect(str(tmp_path / "ledger.sqlite3")) as conn:
+        conn.execute("DELETE FROM downloads WHERE site = 'e621' AND item_id = 3")
+        conn.execute("INSERT INTO downloads (site, item_id) VALUES ('e621', 4)")
+    
+    with open_ledger(tmp_path) as ledger:
+        assert ledger.contains("e621", 4)
+        assert not ledger.contains("e621", 3)
+
+
+def test_sync_commits_highest_listed_post(tmp_path):
+    with open_ledger(tmp_path) as ledger:
+        sync = ledger.sync("e621", "fox cat")
+        assert sync.since_id is None
+        for item_id in (30, 20, 10):
+            sync.saw(item_id)
+        assert sync.commit() == 30
+        
+        # Tag order and case don't make it another query
+        assert ledger.get_high_water("e621", "Cat fox") == 30
+        assert ledger.sync("e621", "cat fox").since_id == 30
+
+
+def test_unfinished_download_holds_the_mark_below_it(tmp_path):
+    with open_ledger(tmp_path) as ledger:
+        ledger.set_high_water("e621", "fox", 10)
+        sync = ledger.sync("e621", "fox")
+        for item_id in (11, 12, 13):
+            sync.saw(item_id)
+            sync.queued(item_id)
+        sync.finished(11)
+        sync.finished(13)
+        
+        assert sync.commit() == 11
+        assert ledger.get_high_water("e621", "fox") == 11
+
+
+def test_interrupted_first_run_stores_no_mark(tmp_path):
+    with open_ledger(tmp_path) as ledger:
+        sync = ledger.sync("e621", "fox")
+        sync.saw(50)
+        sync.interrupted()
+        
+        assert sync.commit() is None
+        assert ledger.get_high_water("e621", "fox") is None
+
+
+def test_interrupted_follow_up_run_keeps_what_it_listed(tmp_path):
+    with open_ledger(tmp_path) as ledger:
+        ledger.set_high_water("e621", "fox", 10)
+        sync = ledger.sync("e621", "fox")
+        # Follow-up runs list oldest first, so a cut-off listing has no gap
+        sync.saw(11)
+        sync.saw(12)
+        sync.interrupted()
+        
+        assert sync.commit() == 12
+
+
+def test_mark_never_moves_backwards(tmp_path):
+    with open_ledger(tmp_path) as ledger:
+        ledger.set_high_water("e621", "fox", 20)
+        ledger.set_high_water("e621", "fox", 5)
+        assert ledger.get_high_water("e621", "fox") == 20
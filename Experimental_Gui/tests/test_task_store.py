@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+
+from gui.task_store import TaskStore
+
+
+@dataclass
+class FakeTask:
+    task_id: str
+    priority: int = 0
+    
+    def get_unique_key(self) -> str:
+        return f"key-{self.task_id}"
+
+
+def fill(*ids):
+    store = TaskStore()
+    for task_id in ids:
+        store.add(FakeTask(task_id))
+    return store
+
+
+def test_runs_by_priority_then_age():
+    store = fill("A", "B")
+    store.add(FakeTask("C", priority=1))
+    assert [task.task_id for task in store] == ["C", "A", "B"]
+
+
+def test_remove_then_add_moves_task_to_the_back():
+    store = fill("A", "B", "C", "D", "E")
+    task = store.remove("A")
+    store.add(task)
+    
+    assert [task.task_id for task in store] == ["B", "C", "D", "E", "A"]
+    assert len(store) == 5
+    
+    served = []
+    while store:
+        served.append(store.pop_next(lambda task: True).task_id)
+    assert served == ["B", "C", "D", "E", "A"]
+
+
+def test_readded_task_survives_compaction():
+    store = fill("A", "B")
+    store.add(store.remove("A"))
+    store.remove("B")
+    
+    assert [task.task_id for task in store] == ["A"]
+    assert store.pop_next(lambda task: True).task_id == "A"
+    assert store.pop_next(lambda task: True) is None
+
+
+def test_pop_next_skips_tasks_that_cannot_start():
+    store = fill("A", "B")
+    assert store.pop_next(lambda task: task.task_id != "A").task_id == "B"
+    assert [task.task_id for task in store] == ["A"]
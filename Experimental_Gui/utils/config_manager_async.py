@@ -13,7 +13,7 @@ class AsyncConfigManager:
     def __init__(self, config_path: Path = Path("config.json")):
         self.config_path = config_path
         self.default_version = 1.6
-        
+    
     async def create_default_config(self) -> Dict[str, Any]:
         """Create default config matching original configManager.py format"""
         default_config = {
@@ -47,13 +47,47 @@ class AsyncConfigManager:
             "blacklisted_formats": [
                 "example1",
                 "example2"
-            ]
+            ],
+            "site_settings": {
+                "e621": {"concurrent_downloads": 6, "prefetch_pages": 2, "requests_per_second": 2, "files_per_second": 15},
+                "e6ai": {"concurrent_downloads": 6, "prefetch_pages": 2, "requests_per_second": 2, "files_per_second": 15},
+                "e926": {"concurrent_downloads": 6, "prefetch_pages": 2, "requests_per_second": 2, "files_per_second": 15},
+                "furbooru": {"concurrent_downloads": 4, "prefetch_pages": 2, "requests_per_second": 2, "files_per_second": 10},
+                "rule34": {"concurrent_downloads": 4, "prefetch_pages": 1, "requests_per_second": 3, "files_per_second": 10},
+                "luscious": {"concurrent_downloads": 4, "requests_per_second": 2, "files_per_second": 4},
+                "multporn": {"concurrent_downloads": 3, "requests_per_second": 2, "files_per_second": 2},
+                "yiffer": {"concurrent_downloads": 3, "requests_per_second": 2, "files_per_second": 4}
+            },
+            "connection_pool": {
+                "limit": 100,
+                "limit_per_host": 8,
+                "keepalive_timeout": 60,
+                "dns_cache_ttl": 300
+            },
+            "retry": {
+                "max_attempts": 5,
+                "base_delay": 1,
+                "max_delay": 60,
+                "max_retry_after": 300
+            },
+            "scheduler": {
+                "max_concurrent_jobs": 4,
+                "jitter": 0.1
+            },
+            "task_queue": {
+                "max_active_tasks": 3,
+                "max_tasks_per_site": 1
+            },
+            "gui": {
+                "log_max_lines": 2000,
+                "engine_process": False
+            }
         }
         
         # Write config file
         async with aiofiles.open(self.config_path, "w") as f:
             await f.write(json.dumps(default_config, indent=6))
-            
+        
         return default_config
     
     async def load_config(self) -> Dict[str, Any]:
@@ -127,6 +161,36 @@ class AsyncConfigManager:
     def is_ai_training_mode(self, config: Dict[str, Any]) -> bool:
         """Check if AI training mode is enabled"""
         return config.get("ai_training", False)
+    
+    def get_site_settings(self, config: Dict[str, Any], site: str) -> Dict[str, Any]:
+        """Get per-site download settings"""
+        return config.get("site_settings", {}).get(site, {})
+    
+    def get_concurrent_downloads(self, config: Dict[str, Any], site: str) -> Optional[int]:
+        """Get how many files to download at once for a site (None uses the downloader default)"""
+        value = self.get_site_settings(config, site).get("concurrent_downloads")
+        return int(value) if value else None
+    
+    def get_prefetch_pages(self, config: Dict[str, Any], site: str) -> Optional[int]:
+        """Get how many listing pages to fetch ahead of downloads (None uses the downloader default)"""
+        value = self.get_site_settings(config, site).get("prefetch_pages")
+        return int(value) if value else None
+    
+    def get_max_active_tasks(self, config: Dict[str, Any]) -> int:
+        """Get how many queued tasks may download at the same time"""
+        return max(1, int(config.get("task_queue", {}).get("max_active_tasks", 3)))
+    
+    def get_max_tasks_per_site(self, config: Dict[str, Any]) -> int:
+        """Get how many active tasks may share one site (and so one host and rate limit)"""
+        return max(1, int(config.get("task_queue", {}).get("max_tasks_per_site", 1)))
+    
+    def get_log_max_lines(self, config: Dict[str, Any]) -> int:
+        """Get how many lines the GUI activity log keeps before dropping the oldest"""
+        return max(100, int(config.get("gui", {}).get("log_max_lines", 2000)))
+    
+    def is_engine_process_enabled(self, config: Dict[str, Any]) -> bool:
+        """Check if the GUI should run downloads in a separate engine process"""
+        return bool(config.get("gui", {}).get("engine_process", False))
 
 
 # NOTE FOR FUTURE: This AsyncConfigManager replicates the exact functionality 
@@ -1,242 +1,283 @@
-from modules import *
-import json
-import os
-from termcolor import colored
-from time import sleep
-import sys
-import inquirer
-
-version = "1.6.4"
-
-if os.name == 'nt':
-    from ctypes import windll
-    windll.kernel32.SetConsoleTitleW(f"NN-Downloader | v{version}")
-
-proxy_list = []
-header = {"User-Agent":f"nn-downloader/{version} (by Official Husko on GitHub)"}
-needed_folders = ["db", "media"]
-database_list = ["e621", "e6ai", "e926", "furbooru", "rule34"]
-unsafe_chars = ["/", "\\", ":", "*", "?", "\"", "<", ">", "|", "\0", "$", "#", "@", "&", "%", "!", "`", "^", "(", ")", "{", "}", "[", "]", "=", "+", "~", ",", ";", "~"]
-
-if sys.gettrace() is not None:
-    DEBUG = True
-else:
-    DEBUG = False
-
-if os.path.exists("outdated"):
-    version_for_logo = colored(f"v{version}", "cyan", attrs=["blink"])
-else:
-    version_for_logo = colored(f"v{version}", "cyan")
-
-logo = f"""{colored(f'''
-d8b   db d8b   db        d8888b.  .d88b.  db   d8b   db d8b   db db       .d88b.   .d8b.  d8888b. d88888b d8888b. 
-888o  88 888o  88        88  `8D .8P  Y8. 88   I8I   88 888o  88 88      .8P  Y8. d8' `8b 88  `8D 88'     88  `8D 
-88V8o 88 88V8o 88        88   88 88    88 88   I8I   88 88V8o 88 88      88    88 88ooo88 88   88 88ooooo 88oobY' 
-88 V8o88 88 V8o88 C8888D 88   88 88    88 Y8   I8I   88 88 V8o88 88      88    88 88~~~88 88   88 88~~~~~ 88`8b   
-88  V888 88  V888        88  .8D `8b  d8' `8b d8'8b d8' 88  V888 88booo. `8b  d8' 88   88 88  .8D 88.     88 `88. 
-VP   V8P VP   V8P        Y8888D'  `Y88P'   `8b8' `8d8'  VP   V8P Y88888P  `Y88P'  YP   YP Y8888D' Y88888P 88   YD 
-                                                                                        {version_for_logo} | by {colored("Official-Husko", "yellow")}''', "red")}
-"""
-
-class Main():
-    def main_startup():
-        def clear_screen():
-            if os.name == 'nt':
-                os.system("cls")
-            else:
-                os.system("clear")
-        print(colored("Checking for read and write permissions.", "green"))
-
-        # Check if the process has read and write permissions
-        if os.access(os.getcwd(), os.R_OK | os.W_OK):
-            pass
-        else:
-            print(colored("The program is missing read & write permissions! Change the directory or try run as administrator.", "red"))
-            sleep(300)
-            sys.exit(0)
-        
-        print(logo)
-        print("")
-
-        # Check if needed folders exists else create them
-        for folder in needed_folders:
-            if not os.path.exists(folder):
-                os.mkdir(folder)
-
-        
-        if os.path.exists("config.json"):
-            config = Config_Manager.reader()
-            oneTimeDownload = config["oneTimeDownload"]
-            use_proxies = config["proxies"]
-            checkForUpdates = config["checkForUpdates"]
-            ai_training = config["ai_training"]
-        else:
-            config = Config_Manager.creator()
-            print(colored("New Config file generated. Please configure it for your use case and add API keys for needed services.", "green"))
-            sleep(7)
-            sys.exit(0)
-
-        if checkForUpdates == True:
-            clear_screen()
-            print(logo)
-            print("")
-            print(colored("Checking for Updates...", "yellow"), end='\r')
-            AutoUpdate.Checker()
-            clear_screen()
-            print(logo)
-            print("")
-
-        if use_proxies == True:
-            print(colored("Fetching Fresh Proxies...", "yellow"), end='\r')
-            ProxyScraper.Scraper(proxy_list=proxy_list)
-            print(colored(f"Fetched {len(proxy_list)} Proxies.        ", "green"))
-            print("")
-
-        if oneTimeDownload == True:
-            for database in database_list:
-                with open(f"db/{database}.db", "a") as db_creator:
-                    db_creator.close()
-
-        print(colored("What site do you want to download from?", "green"))
-        questions = [
-            inquirer.List('selection',
-                          choices=['E621', 'E6AI', 'E926', 'Furbooru', 'Luscious', 'Multporn', 'Rule34', 'Yiffer']),
-        ]
-        answers = inquirer.prompt(questions)
-        print("")
-
-        site = answers.get("selection").lower()
-
-        if site in ["e621", "e6ai", "e926", "furbooru", "rule34"]:
-
-            print(colored("Please enter the tags you want to use.", "green"))
-            user_tags = input(">> ").lower()
-
-            # Check to make sure there are not more than 40 tags
-            user_tags_split = user_tags.split()
-            tags_count = len(user_tags_split)
-
-            if site in ["e621", "e6ai", "e926"]:
-                while user_tags == "" or tags_count > 40:
-                    if user_tags == "":
-                        print(colored("Please enter the tags you want.", "red"))
-                    else:
-                        print(colored(f"Sorry, {site.upper()} does not allow more than 40 tags.", "red"))
-                        print(colored(f"You entered {tags_count} tags.", "red"))
-                    
-                    sleep(3)
-                    user_tags = input(">> ").lower()
-
-                    user_tags_split = user_tags.split()
-                    tags_count = len(user_tags_split)
-            else:
-                while user_tags == "":    
-                    print(colored("Please enter the tags you want.", "red"))
-                    sleep(3)
-                    user_tags = input(">> ").lower()
-
-
-            print("")
-
-            print(colored("How many pages would you like to get?", "green"), colored(" (leave empty for max)", "yellow"))
-            max_sites = input(">> ").lower()
-            print("")
-
-        if site in ["e621", "e6ai", "e926"]:
-            api_user = config.get("user_credentials",{}).get(site, {}).get("apiUser", "")
-            api_key = config.get("user_credentials", {}).get(site, {}).get("apiKey", "")
-            if oneTimeDownload == True:
-                with open(f"db/{site}.db", "r") as db_reader:
-                    database = db_reader.read().splitlines()
-            else:
-                database = False
-            if api_key == "" or api_user == "":
-                print(colored("Please add your API Key into the config.json", "red"))
-                sleep(10)
-                sys.exit(0)
-            else:
-                output = E6System.fetcher(user_tags=user_tags, user_blacklist=config["blacklisted_tags"], proxy_list=proxy_list, max_sites=max_sites, user_proxies=config["proxies"], api_user=api_user, api_key=api_key, header=header, db=database, site=site, ai_training=ai_training)
-    
-        elif site == "rule34":
-            if oneTimeDownload == True:
-                with open("db/rule34.db", "r") as db_reader:
-                    database = db_reader.read().splitlines()
-            else:
-                database = False
-            output = RULE34.fetcher(user_tags=user_tags, user_blacklist=config["blacklisted_tags"], proxy_list=proxy_list, max_sites=max_sites, user_proxies=config["proxies"], header=header, db=database)
-        
-        elif site == "furbooru":
-            api_key = config.get("user_credentials", {}).get(site, {}).get("apiKey", "")
-            if oneTimeDownload == True:
-                with open("db/furbooru.db", "r") as db_reader:
-                    database = db_reader.read().splitlines()
-            else:
-                database = False
-            if api_key == "":
-                print(colored("Please add your API Key into the config.json", "red"))
-                sleep(5)
-            else:
-                output = FURBOORU.fetcher(user_tags=user_tags, user_blacklist=config["blacklisted_tags"], proxy_list=proxy_list, max_sites=max_sites, user_proxies=config["proxies"], api_key=api_key, header=header, db=database)
-        
-        elif site == "multporn":
-            print(colored("Please enter the link. (e.g. https://multporn.net/comics/double_trouble_18)", "green"))
-            URL = input(">> ")
-            while URL == "":    
-                print(colored("Please enter a valid link.", "red"))
-                sleep(1.5)
-                URL = input(">> ")
-            output = Multporn.Fetcher(proxy_list=proxy_list, user_proxies=config["proxies"], header=header, URL=URL)
-        
-        elif site == "yiffer":
-            print(colored("Please enter the link. (e.g. https://yiffer.xyz/Howl & Jasper)", "green"))
-            URL = input(">> ")
-            while URL == "":    
-                print(colored("Please enter a valid link.", "red"))
-                sleep(1.5)
-                URL = input(">> ")
-            output = Yiffer.Fetcher(proxy_list=proxy_list, user_proxies=config["proxies"], header=header, URL=URL)
-        
-        elif site == "luscious":
-            print(colored("Please enter the link. (e.g. https://www.luscious.net/albums/bifurcation-ongoing_437722)", "green"))
-            URL = input(">> ")
-            while URL == "":    
-                print(colored("Please enter a valid link.", "red"))
-                sleep(1.5)
-                URL = input(">> ")
-            output = Luscious.Fetcher(proxy_list=proxy_list, user_proxies=config["proxies"], header=header, URL=URL)
-
-        else:
-            print(colored("Site not supported. Open a ticket to request support for that site!", "red"))
-            raise Exception(f"This shouldn't be possible! User tried to download from {site}.")
-            Main.main_startup()
-
-        status = output.get("status", "why no status man?")
-        uinput = output.get("uinput", "URL overdosed :(")
-        exception_str = output.get("exception", "Fuck me there was no exception.")
-        extra = output.get("extra", "")
-        
-        if status == "ok":
-            pass
-        
-        elif status == "error":
-            print(f"{error} An error occured while downloading from {colored(site, 'yellow')}! Please report this. Exception: {colored(exception_str, 'red')}")
-            error_str = f"An error occured while downloading from {site}! Please report this. Exception: {exception_str}"
-            Logger.log_event(error_str, extra, uinput)
-            sleep(7)
-        
-        else:
-            print(f"{major_error} An unknown error occured while downloading from {colored(site, 'yellow')}! Please report this. Exception: {colored(exception_str, 'red')}")
-            error_str = f"An unknown error occured while downloading from {site}! Please report this. Exception: {exception_str}"
-            Logger.log_event(error_str, extra, uinput)
-            sleep(7)
-
-        # Jump back to start
-        Main.main_startup()
-
-if __name__ == '__main__':
-    try:
-        Main.main_startup()
-    except KeyboardInterrupt:
-        print("User Cancelled")
-        sleep(3)
-        sys.exit(0)
+import os
+import sys
+
+# The ledger and blacklist live in the v2 core package; appended so this main.py keeps shadowing Experimental_Gui/main.py
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "Experimental_Gui"))
+
+from modules import ProxyScraper, Config_Manager, AutoUpdate, Logger
+from modules.pretty_print import error, major_error
+from modules.constants import version
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait
+from termcolor import colored
+from time import sleep
+import inquirer
+from core.ledger import Ledger
+from downloaders.registry import SITES
+
+if os.name == 'nt':
+    from ctypes import windll
+    windll.kernel32.SetConsoleTitleW(f"NN-Downloader | v{version}")
+
+proxy_list = []
+ledger = None
+# One event loop and connection pool for the whole run, so keep-alive connections,
+# TLS sessions and DNS results carry over from one download to the next
+loop = None
+session_manager = None
+# The update check and proxy scrape run here while the menu is up
+background = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+update_check = None
+update_checked = False
+proxy_fetch = None
+# Seconds the first menu waits for a (usually cached) update check before showing anyway
+UPDATE_WAIT = 1
+needed_folders = ["db", "media"]
+
+if sys.gettrace() is not None:
+    DEBUG = True
+else:
+    DEBUG = False
+
+if os.path.exists("outdated"):
+    version_for_logo = colored(f"v{version}", "cyan", attrs=["blink"])
+else:
+    version_for_logo = colored(f"v{version}", "cyan")
+
+logo = f"""{colored(f'''
+d8b   db d8b   db        d8888b.  .d88b.  db   d8b   db d8b   db db       .d88b.   .d8b.  d8888b. d88888b d8888b. 
+888o  88 888o  88        88  `8D .8P  Y8. 88   I8I   88 888o  88 88      .8P  Y8. d8' `8b 88  `8D 88'     88  `8D 
+88V8o 88 88V8o 88        88   88 88    88 88   I8I   88 88V8o 88 88      88    88 88ooo88 88   88 88ooooo 88oobY' 
+88 V8o88 88 V8o88 C8888D 88   88 88    88 Y8   I8I   88 88 V8o88 88      88    88 88~~~88 88   88 88~~~~~ 88`8b   
+88  V888 88  V888        88  .8D `8b  d8' `8b d8'8b d8' 88  V888 88booo. `8b  d8' 88   88 88  .8D 88.     88 `88. 
+VP   V8P VP   V8P        Y8888D'  `Y88P'   `8b8' `8d8'  VP   V8P Y88888P  `Y88P'  YP   YP Y8888D' Y88888P 88   YD 
+                                                                                        {version_for_logo} | by {colored("Official-Husko", "yellow")}''', "red")}
+"""
+
+async def run_async_download(site, config, tags=None, url=None, max_sites=None):
+    """Runs one download on the async engine (Experimental_Gui/downloaders) with an alive_bar following it."""
+    from downloaders.runner import run_download
+    from alive_progress import alive_bar
+
+    max_pages = int(max_sites) if max_sites and str(max_sites).isdigit() else None
+    # The scraper returns {"http": "host:port"} dicts, the async engine takes proxy URLs
+    proxies = [f"http://{proxy['http']}" for proxy in proxy_list]
+
+    with alive_bar(manual=True, calibrate=1, dual_line=True, title='Downloading') as bar:
+        def on_progress(message):
+            bar.text = f'-> {message}'
+
+        def on_event(event):
+            if event.fraction is not None:
+                bar(event.fraction)
+
+        return await run_download(
+            site,
+            config,
+            tags=tags,
+            url=url,
+            max_pages=max_pages,
+            progress_callback=on_progress,
+            session_manager=session_manager,
+            ledger=ledger,
+            event_callback=on_event,
+            proxy_list=proxies
+        )
+
+
+def wait_for_proxies():
+    """Swaps in the proxies of the background scrape, waiting for it if it isn't done yet."""
+    if proxy_fetch is None:
+        return
+    if not proxy_fetch.done():
+        print(colored("Fetching Fresh Proxies...", "yellow"), end='\r')
+    try:
+        proxy_list[:] = proxy_fetch.result()
+    except Exception as e:
+        # A failed scrape only costs the proxies, the download goes ahead without them
+        error_str = f"An error occured while fetching proxies! Downloading without proxies. Exception: {e}"
+        print(f"{error} {error_str}")
+        Logger.log_event(error_str)
+        proxy_list.clear()
+        return
+    print(colored(f"Fetched {len(proxy_list)} Proxies.        ", "green"))
+    print("")
+
+
+def download(site, config, tags=None, url=None, max_sites=None):
+    """Downloads from a site and returns the status dict the menu reports on."""
+    global loop, session_manager
+    wait_for_proxies()
+    try:
+        if loop is None:
+            loop = asyncio.new_event_loop()
+        if session_manager is None:
+            from core.http_session import SessionManager
+            session_manager = SessionManager.from_config(config)
+        result = loop.run_until_complete(run_async_download(site, config, tags=tags, url=url, max_sites=max_sites))
+    except Exception as e:
+        return {"status": "error", "uinput": tags or url, "exception": str(e)}
+
+    if not result:
+        print(colored("Nothing was downloaded. Check the messages above or try different tags.", "yellow"))
+        sleep(5)
+    return {"status": "ok"}
+
+
+class Main():
+    def main_startup():
+        def clear_screen():
+            if os.name == 'nt':
+                os.system("cls")
+            else:
+                os.system("clear")
+        print(colored("Checking for read and write permissions.", "green"))
+
+        # Check if the process has read and write permissions
+        if os.access(os.getcwd(), os.R_OK | os.W_OK):
+            pass
+        else:
+            print(colored("The program is missing read & write permissions! Change the directory or try run as administrator.", "red"))
+            sleep(300)
+            sys.exit(0)
+        
+        print(logo)
+        print("")
+
+        # Check if needed folders exists else create them
+        for folder in needed_folders:
+            if not os.path.exists(folder):
+                os.mkdir(folder)
+
+        
+        if os.path.exists("config.json"):
+            config = Config_Manager.reader()
+            oneTimeDownload = config["oneTimeDownload"]
+            use_proxies = config["proxies"]
+            checkForUpdates = config["checkForUpdates"]
+            ai_training = config["ai_training"]
+        else:
+            config = Config_Manager.creator()
+            print(colored("New Config file generated. Please configure it for your use case and add API keys for needed services.", "green"))
+            sleep(7)
+            sys.exit(0)
+
+        # Both are cached on disk, so later rounds and restarts within the TTL don't go online
+        global update_check, update_checked, proxy_fetch
+        if checkForUpdates == True and update_check is None:
+            update_check = background.submit(AutoUpdate.latest_release)
+            wait([update_check], timeout=UPDATE_WAIT)
+
+        if use_proxies == True and (proxy_fetch is None or proxy_fetch.done()):
+            proxy_fetch = background.submit(ProxyScraper.Scraper, [])
+
+        # Offered once per run, as soon as the check is back
+        if update_check is not None and update_check.done() and not update_checked:
+            update_checked = True
+            clear_screen()
+            print(logo)
+            print("")
+            AutoUpdate.Checker(update_check)
+            clear_screen()
+            print(logo)
+            print("")
+
+        # Open the download ledger once (imports old db/*.db files on first run)
+        global ledger
+        if oneTimeDownload == True and ledger is None:
+            ledger = Ledger()
+
+        print(colored("What site do you want to download from?", "green"))
+        labels = {site_info.label: site_info for site_info in SITES.values()}
+        questions = [
+            inquirer.List('selection',
+                          choices=sorted(labels)),
+        ]
+        answers = inquirer.prompt(questions)
+        print("")
+
+        site_info = labels[answers.get("selection")]
+        site = site_info.name
+
+        # Check the credentials before asking for anything else
+        credentials = config.get("user_credentials", {}).get(site, {})
+        if (site_info.needs_api_user and credentials.get("apiUser", "") == "") or (site_info.needs_api_key and credentials.get("apiKey", "") == ""):
+            print(colored("Please add your API Key into the config.json", "red"))
+            sleep(5)
+            return
+
+        if site_info.kind == "tags":
+
+            print(colored("Please enter the tags you want to use.", "green"))
+            user_tags = input(">> ").lower()
+
+            # Check to make sure there are not more tags than the site allows
+            tags_count = len(user_tags.split())
+
+            while user_tags == "" or (site_info.max_tags and tags_count > site_info.max_tags):
+                if user_tags == "":
+                    print(colored("Please enter the tags you want.", "red"))
+                else:
+                    print(colored(f"Sorry, {site.upper()} does not allow more than {site_info.max_tags} tags.", "red"))
+                    print(colored(f"You entered {tags_count} tags.", "red"))
+                
+                sleep(3)
+                user_tags = input(">> ").lower()
+                tags_count = len(user_tags.split())
+
+            print("")
+
+            print(colored("How many pages would you like to get?", "green"), colored(" (leave empty for max)", "yellow"))
+            max_sites = input(">> ").lower()
+            print("")
+
+            output = download(site, config, tags=user_tags, max_sites=max_sites)
+
+        else:
+            print(colored(f"Please enter the link. (e.g. {site_info.example})", "green"))
+            URL = input(">> ")
+            while URL == "":    
+                print(colored("Please enter a valid link.", "red"))
+                sleep(1.5)
+                URL = input(">> ")
+            output = download(site, config, url=URL)
+
+        status = output.get("status", "why no status man?")
+        uinput = output.get("uinput", "URL overdosed :(")
+        exception_str = output.get("exception", "Fuck me there was no exception.")
+        extra = output.get("extra", "")
+        
+        if status == "ok":
+            pass
+        
+        elif status == "error":
+            print(f"{error} An error occured while downloading from {colored(site, 'yellow')}! Please report this. Exception: {colored(exception_str, 'red')}")
+            error_str = f"An error occured while downloading from {site}! Please report this. Exception: {exception_str}"
+            Logger.log_event(error_str, extra, uinput)
+            sleep(7)
+        
+        else:
+            print(f"{major_error} An unknown error occured while downloading from {colored(site, 'yellow')}! Please report this. Exception: {colored(exception_str, 'red')}")
+            error_str = f"An unknown error occured while downloading from {site}! Please report this. Exception: {exception_str}"
+            Logger.log_event(error_str, extra, uinput)
+            sleep(7)
+
+        # Keep the id snapshots current so the next start loads them instantly
+        if ledger:
+            ledger.save_snapshots()
+
+if __name__ == '__main__':
+    try:
+        # Back to the start after every download; a loop, so long sessions don't grow the stack
+        while True:
+            Main.main_startup()
+    except KeyboardInterrupt:
+        if loop:
+            if session_manager:
+                loop.run_until_complete(session_manager.close())
+            loop.close()
+        if ledger:
+            ledger.close()
+        print("User Cancelled")
+        sleep(3)
+        sys.exit(0)
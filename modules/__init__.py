@@ -3,12 +3,3 @@ from .configManager import Config_Manager
 from .auto_update import AutoUpdate
 from .logger import Logger
 from .pretty_print import *
-
-
-# Here are all modules for the sites that are supported
-from .e6systems import E6System
-from .rule34 import RULE34
-from .furbooru import FURBOORU
-from .multporn import Multporn
-from .yiffer import Yiffer
-from .luscious import Luscious
\ No newline at end of file
@@ -8,14 +8,20 @@ import os
 from time import sleep
 from alive_progress import alive_bar
 
-from main import version
+from .constants import version
+from .disk_cache import DiskCache
 from .logger import Logger
 from .pretty_print import error, ok
 
+# Seconds the latest release info is reused before GitHub is asked again
+UPDATE_TTL = 6 * 60 * 60
+
 class AutoUpdate:
     
-    def Checker():
-        try:
+    def latest_release():
+        """The latest GitHub release, from the disk cache if it was fetched less than UPDATE_TTL ago."""
+        release = DiskCache.load("latest_release", UPDATE_TTL)
+        if release is None:
             url = "https://api.github.com/repos/Official-Husko/NN-Downloader/releases/latest?from=about"
             
             headers = {
@@ -24,7 +30,23 @@ class AutoUpdate:
                 "X-GitHub-Api-Version": "2022-11-28"
             }
             
-            req = requests.get(url, headers=headers).json()
+            req = requests.get(url, headers=headers, timeout=10).json()
+            # Only what Checker uses; a KeyError here (e.g. rate limited) keeps it out of the cache
+            release = {
+                "tag_name": req["tag_name"],
+                "name": req.get("name"),
+                "body": req.get("body"),
+                "published_at": req.get("published_at"),
+                "assets": [{"browser_download_url": req["assets"][0]["browser_download_url"]}]
+            }
+            DiskCache.save("latest_release", release)
+        return release
+    
+    def Checker(pending=None):
+        """Offers the update if there is one. pending is a future of latest_release() started earlier."""
+        req = None
+        try:
+            req = pending.result() if pending is not None else AutoUpdate.latest_release()
             repo_version = req.get("tag_name")
             download_link = req["assets"][0]["browser_download_url"]
             
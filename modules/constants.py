@@ -0,0 +1,2 @@
+# Shared by main.py and the modules, so neither has to import the other
+version = "1.6.4"
@@ -0,0 +1,40 @@
+import json
+import os
+import threading
+import time
+
+# Results of slow startup requests, kept between runs
+CACHE_FILE = os.path.join("db", "cache.json")
+
+_cache_lock = threading.Lock()
+
+class DiskCache():
+    @staticmethod
+    def load(name, ttl):
+        """The value saved under name, or None if there is none or it is older than ttl seconds."""
+        with _cache_lock:
+            entry = DiskCache._read().get(name)
+        if not entry or time.time() - entry.get("time", 0) > ttl:
+            return None
+        return entry.get("value")
+
+    @staticmethod
+    def save(name, value):
+        """Saves value under name. Written to a temp file first so a crash can't leave half a cache."""
+        with _cache_lock:
+            cache = DiskCache._read()
+            cache[name] = {"time": time.time(), "value": value}
+            os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+            temp_file = f"{CACHE_FILE}.tmp"
+            with open(temp_file, "w") as cf:
+                json.dump(cache, cf)
+            os.replace(temp_file, CACHE_FILE)
+
+    @staticmethod
+    def _read():
+        try:
+            with open(CACHE_FILE, "r") as cf:
+                cache = json.load(cf)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
@@ -1,6 +1,6 @@
 import os
 from datetime import datetime
-from main import version
+from .constants import version
 
 class Logger:
     
@@ -1,4 +1,7 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from .disk_cache import DiskCache
 
 proxy_source_list = [
     "https://raw.githubusercontent.com/TheSpeedX/SOCKS-List/master/http.txt",
@@ -9,17 +12,34 @@ proxy_source_list = [
     "https://raw.githubusercontent.com/roma8ok/proxy-list/main/proxy-list-http.txt"
 ]
 
+# Seconds a scraped proxy list is reused before the sources are fetched again
+PROXY_TTL = 30 * 60
+
+def fetch_source(source):
+    try:
+        response = requests.get(source,headers={"User-Agent":"nn-downloader/1.0 (by Official Husko on GitHub)"},timeout=10)
+        response.raise_for_status()
+        return response.text.split()
+    except requests.RequestException:
+        # One dead source shouldn't cost the proxies of the others
+        return []
+
 # scrape proxies from a given destination
 class ProxyScraper():
     def Scraper(proxy_list):
-        for source in proxy_source_list:
-            response = requests.get(source,headers={"User-Agent":"nn-downloader/1.0 (by Official Husko on GitHub)"},timeout=10)
-            proxy_raw = response.text
-            split_proxies = proxy_raw.split()
-            for proxy in split_proxies:
-                if proxy in proxy_list:
-                    break
-                else:
-                    proxyy = {"http": proxy}
-                    proxy_list.append(proxyy)
-        return proxy_list
\ No newline at end of file
+        proxies = DiskCache.load("proxies", PROXY_TTL)
+        if proxies is None:
+            # All sources at once, so the slowest one sets the wait instead of their sum
+            with ThreadPoolExecutor(max_workers=len(proxy_source_list)) as pool:
+                # Sources overlap a lot, so only the first of each proxy is kept
+                proxies = list(dict.fromkeys(proxy for source_proxies in pool.map(fetch_source, proxy_source_list) for proxy in source_proxies))
+            # Only cache a usable list, so a failed scrape is retried next time
+            if proxies:
+                DiskCache.save("proxies", proxies)
+
+        known = {proxy["http"] for proxy in proxy_list}
+        for proxy in proxies:
+            if proxy not in known:
+                known.add(proxy)
+                proxy_list.append({"http": proxy})
+        return proxy_list